@@ -0,0 +1,75 @@
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List
+
+import orjson
+from fastapi import HTTPException
+
+from app.adapter.request_to_gpt import get_gpt_client
+from app.util.logger import logger
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from openai.types import Batch
+
+# 배치 API 주소. 비워 두면 실시간 호출과 같은 클라이언트(OPENAI_BASE_URL)를 쓰고,
+# 로컬 대역(benchmarks.mock_openai_server 등)을 가리키면 배치만 그쪽으로 보낸다.
+OPENAI_BATCH_BASE_URL = os.getenv("OPENAI_BATCH_BASE_URL", "")
+OPENAI_BATCH_COMPLETION_WINDOW = os.getenv("OPENAI_BATCH_COMPLETION_WINDOW", "24h")
+# Batch API 입력 파일 크기 상한(200MB)
+OPENAI_BATCH_MAX_INPUT_BYTES = int(
+    os.getenv("OPENAI_BATCH_MAX_INPUT_BYTES", str(200 * 1024 * 1024))
+)
+BATCH_ENDPOINT = "/v1/responses"
+
+
+@lru_cache(maxsize=1)
+def get_batch_client() -> "AsyncOpenAI":
+    """배치 작업용 OpenAI 비동기 클라이언트를 캐싱하여(싱글톤처럼) 제공한다."""
+    if not OPENAI_BATCH_BASE_URL:
+        return get_gpt_client()
+
+    from openai import AsyncOpenAI
+
+    # 로컬 대역은 키를 확인하지 않으므로 키가 없어도 띄울 수 있게 한다.
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY") or "local",
+        base_url=OPENAI_BATCH_BASE_URL,
+        max_retries=2,
+    )
+
+
+async def submit_batch(lines: List[dict], metadata: Dict[str, str]) -> "Batch":
+    """요청 줄들을 JSONL 파일로 올리고 Responses API 배치를 만든다."""
+    content = b"".join(orjson.dumps(line) + b"\n" for line in lines)
+    if len(content) > OPENAI_BATCH_MAX_INPUT_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"배치 입력이 너무 큽니다 ({len(content)} bytes)",
+        )
+
+    client = get_batch_client()
+    input_file = await client.files.create(
+        file=("batch.jsonl", content, "application/jsonl"), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=OPENAI_BATCH_COMPLETION_WINDOW,
+        metadata=metadata,
+    )
+    logger.info(
+        f"배치 제출: {batch.id} (requests={len(lines)}, bytes={len(content)}, "
+        f"input_file={input_file.id})"
+    )
+    return batch
+
+
+async def retrieve_batch(batch_id: str) -> "Batch":
+    return await get_batch_client().batches.retrieve(batch_id)
+
+
+async def read_batch_file(file_id: str) -> List[dict]:
+    """배치 출력/오류 파일(JSONL)을 줄 단위 객체 목록으로 읽는다."""
+    content = await get_batch_client().files.content(file_id)
+    return [orjson.loads(line) for line in content.content.splitlines() if line.strip()]
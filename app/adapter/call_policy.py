@@ -0,0 +1,310 @@
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Optional,
+    TypeVar,
+)
+
+from app.adapter.request_to_gpt import create_response_text, stream_response_text
+from app.util.logger import logger
+
+T = TypeVar("T")
+
+GPT_RETRY_MAX_ATTEMPTS = int(os.getenv("GPT_RETRY_MAX_ATTEMPTS", "3"))
+GPT_RETRY_BASE_DELAY_SECONDS = float(os.getenv("GPT_RETRY_BASE_DELAY_SECONDS", "0.5"))
+GPT_RETRY_MAX_DELAY_SECONDS = float(os.getenv("GPT_RETRY_MAX_DELAY_SECONDS", "8"))
+# 호출이 최근 지연 시간의 이 분위수를 넘기면 같은 요청을 하나 더 보낸다. 0이면 헤징하지 않는다.
+GPT_HEDGE_PERCENTILE = float(os.getenv("GPT_HEDGE_PERCENTILE", "0.95"))
+GPT_HEDGE_MIN_SAMPLES = int(os.getenv("GPT_HEDGE_MIN_SAMPLES", "20"))
+GPT_LATENCY_WINDOW = int(os.getenv("GPT_LATENCY_WINDOW", "200"))
+
+_RETRYABLE_STATUS = {408, 409, 429}
+
+
+class InvalidResponseError(Exception):
+    """응답은 왔지만 비어 있거나 유효하지 않은 경우. 재시도 대상이다."""
+
+
+class LatencyTracker:
+    """
+    키(모델)별 최근 호출 지연 시간을 고정 크기 창으로 보관한다.
+    끝나지 못한 시도(실패, 취소된 헤지 패자)는 헤지 기준 이상으로 잘라 넣은 값(censored)으로 들어간다.
+    """
+
+    def __init__(self, window: int = GPT_LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, key: str, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(
+        self, key: str, q: float, min_samples: int = GPT_HEDGE_MIN_SAMPLES
+    ) -> Optional[float]:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CallPolicy(Generic[T]):
+    """
+    업스트림 호출 1건에 대한 정책 계층.
+    - 재시도 가능한 오류는 지터를 준 지수 백오프로 재시도한다.
+    - 호출이 최근 지연 분위수를 넘기면 헤지 요청을 보내 먼저 온 유효한 결과를 쓰고 나머지는 취소한다.
+    - 재시도와 헤지를 포함한 전체 시간은 budget을 넘지 않는다.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = GPT_RETRY_MAX_ATTEMPTS,
+        base_delay: float = GPT_RETRY_BASE_DELAY_SECONDS,
+        max_delay: float = GPT_RETRY_MAX_DELAY_SECONDS,
+        hedge_percentile: float = GPT_HEDGE_PERCENTILE,
+        tracker: Optional[LatencyTracker] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_percentile = hedge_percentile
+        self.tracker = tracker or LatencyTracker()
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "failures": 0,
+        }
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[float], Awaitable[T]],
+        budget: float,
+        is_valid: Callable[[T], bool] = bool,
+    ) -> T:
+        """call(timeout)을 정책에 따라 실행한다. budget 안에 유효한 결과가 없으면 마지막 오류를 올린다."""
+        self.stats["calls"] += 1
+        deadline = time.monotonic() + budget
+        last_error: Optional[BaseException] = None
+        for attempt in range(self.max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if attempt > 0:
+                self.stats["retries"] += 1
+            try:
+                result = await self._hedged(key, call, remaining, is_valid)
+                if is_valid(result):
+                    return result
+                # 비어 있거나 유효하지 않은 응답은 재시도 대상으로 본다.
+                last_error = InvalidResponseError("유효하지 않은 업스트림 응답")
+            except Exception as e:
+                if not is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                last_error = e
+
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+            if attempt + 1 < self.max_attempts:
+                logger.warning(
+                    f"GPT 호출 재시도 예정 ({attempt + 1}/{self.max_attempts}, "
+                    f"{delay:.2f}초 후): {last_error!r}"
+                )
+                await asyncio.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+
+        self.stats["failures"] += 1
+        raise last_error or TimeoutError("GPT 호출 예산 초과")
+
+    async def _hedged(
+        self,
+        key: str,
+        call: Callable[[float], Awaitable[T]],
+        budget: float,
+        is_valid: Callable[[T], bool],
+    ) -> T:
+        deadline = time.monotonic() + budget
+        hedge_after = None
+        if self.hedge_percentile > 0:
+            hedge_after = self.tracker.percentile(key, self.hedge_percentile)
+        # 헤지 요청의 지연도 원 요청 시작부터 잰다(호출자가 실제로 기다린 시간).
+        started = time.perf_counter()
+        primary = asyncio.create_task(
+            self._timed(key, call, budget, started, hedge_after)
+        )
+        tasks = {primary}
+        try:
+            if hedge_after is None or hedge_after >= budget:
+                return await primary
+
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            hedge = None
+            if not done:
+                self.stats["hedges"] += 1
+                hedge = asyncio.create_task(
+                    self._timed(
+                        key,
+                        call,
+                        max(deadline - time.monotonic(), 0.001),
+                        started,
+                        hedge_after,
+                    )
+                )
+                tasks.add(hedge)
+
+            result = await _first_valid(set(tasks), is_valid)
+            if hedge is not None and hedge.done() and not hedge.cancelled():
+                if hedge.exception() is None and hedge.result() is result:
+                    self.stats["hedge_wins"] += 1
+            return result
+        finally:
+            # 먼저 끝난 쪽을 쓰고 남은 요청(패자)은 취소한다.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _timed(
+        self,
+        key: str,
+        call: Callable[[float], Awaitable[T]],
+        timeout: float,
+        started: float,
+        threshold: Optional[float],
+    ) -> T:
+        try:
+            result = await call(timeout)
+        except BaseException:
+            # 성공만 기록하면 느린 호출(취소된 패자, 시간 초과)이 빠져 분위수가 낮게 치우친다.
+            # 실제 지연은 적어도 경과 시간과 헤지 기준 이상이므로 그 값으로 잘라 기록한다.
+            # 기준이 아직 없으면(표본 부족) 빠른 실패가 분위수를 끌어내리지 않게 기록하지 않는다.
+            if threshold is not None:
+                self.tracker.observe(key, max(time.perf_counter() - started, threshold))
+            raise
+        self.tracker.observe(key, time.perf_counter() - started)
+        return result
+
+
+async def _first_valid(pending: set, is_valid: Callable[[T], bool]) -> T:
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is not None:
+                error = task.exception()
+                continue
+            if is_valid(task.result()):
+                return task.result()
+            error = error or InvalidResponseError("유효하지 않은 업스트림 응답")
+    raise error
+
+
+def ttft_key(key: str) -> str:
+    """스트리밍 첫 조각까지의 시간을 담는 지연 통계 키"""
+    return f"{key}:ttft"
+
+
+def is_retryable(error: BaseException) -> bool:
+    from openai import (
+        APIConnectionError,
+        APIStatusError,
+        APITimeoutError,
+        InternalServerError,
+        RateLimitError,
+    )
+
+    if isinstance(
+        error,
+        (
+            APITimeoutError,
+            APIConnectionError,
+            RateLimitError,
+            InternalServerError,
+            InvalidResponseError,
+        ),
+    ):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+gpt_call_policy: CallPolicy[str] = CallPolicy()
+
+
+async def request_to_gpt_with_policy(gpt_request: dict, budget: float) -> str:
+    """모델별 지연 통계를 바탕으로 재시도/헤징 정책을 적용해 Responses API를 호출한다."""
+    return await gpt_call_policy.run(
+        gpt_request["model"],
+        lambda timeout: create_response_text(gpt_request, timeout),
+        budget,
+        is_valid=lambda text: bool(text and text.strip()),
+    )
+
+
+async def stream_gpt_with_policy(
+    gpt_request: dict, budget: float
+) -> AsyncIterator[str]:
+    """
+    스트리밍 호출에 정책을 적용한다.
+    첫 조각을 받기 전의 재시도 가능한 오류만 재시도하고(이미 내보낸 조각은 되돌릴 수 없으므로),
+    헤징은 하지 않는다. 전체 스트림은 budget 안에 끝나야 한다.
+    """
+    policy = gpt_call_policy
+    key = gpt_request["model"]
+    policy.stats["calls"] += 1
+    deadline = time.monotonic() + budget
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            policy.stats["failures"] += 1
+            raise TimeoutError("GPT 호출 예산 초과")
+        start = time.perf_counter()
+        received = False
+        try:
+            async with asyncio.timeout(remaining):
+                async for delta in stream_response_text(gpt_request, remaining):
+                    if not received:
+                        received = True
+                        # 첫 조각까지의 시간(TTFT)은 전체 지연과 분포가 다르므로 따로 기록한다.
+                        policy.tracker.observe(
+                            ttft_key(key), time.perf_counter() - start
+                        )
+                    yield delta
+            if received:
+                policy.tracker.observe(key, time.perf_counter() - start)
+                return
+            error: BaseException = InvalidResponseError("유효하지 않은 업스트림 응답")
+        except Exception as e:
+            if received or not is_retryable(e):
+                policy.stats["failures"] += 1
+                raise
+            error = e
+
+        attempt += 1
+        if attempt >= policy.max_attempts:
+            policy.stats["failures"] += 1
+            raise error
+        policy.stats["retries"] += 1
+        delay = random.uniform(
+            0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1))
+        )
+        logger.warning(
+            f"GPT 스트리밍 재시도 예정 ({attempt}/{policy.max_attempts}, "
+            f"{delay:.2f}초 후): {error!r}"
+        )
+        await asyncio.sleep(max(0.0, min(delay, deadline - time.monotonic())))
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from app.adapter.request_to_gpt import get_gpt_client
+from app.util.logger import logger
+from app.util.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# PDF 전달 방식: inline(base64 file_data) | file_id(Files API 업로드 후 참조)
+PDF_INPUT_TRANSPORT = os.getenv("PDF_INPUT_TRANSPORT", "inline")
+OPENAI_FILE_TTL_SECONDS = float(os.getenv("OPENAI_FILE_TTL_SECONDS", "3600"))
+# TTL까지 이 시간보다 적게 남은 file_id는 새 요청에 내주지 않는다.
+# 받은 요청이 스케줄러 대기와 GPT 호출(재시도/헤지 포함)을 마칠 때까지 걸리는 최대 시간보다 길어야 한다.
+OPENAI_FILE_REUSE_MARGIN_SECONDS = float(
+    os.getenv("OPENAI_FILE_REUSE_MARGIN_SECONDS", "300")
+)
+# TTL이 지나고도 이 시간만큼 기다렸다가 삭제한다. 재시도/마감 시간을 넉넉히 넘기도록 잡는다.
+OPENAI_FILE_DELETE_GRACE_SECONDS = float(
+    os.getenv("OPENAI_FILE_DELETE_GRACE_SECONDS", "600")
+)
+OPENAI_FILE_CLEANUP_INTERVAL_SECONDS = float(
+    os.getenv("OPENAI_FILE_CLEANUP_INTERVAL_SECONDS", "300")
+)
+
+
+@dataclass
+class _UploadedFile:
+    file_id: str
+    uploaded_at: float
+
+
+class UploadedFileRegistry:
+    """
+    같은 내용(문서 해시 + 페이지 조합)은 Files API로 한 번만 업로드하고 file_id를 재사용한다.
+    TTL이 가까워진(reuse_margin_seconds 이내) 파일은 새 요청에 내주지 않고 다시 업로드하며,
+    이미 내준 file_id를 쓰는 호출이 끝날 수 있게 TTL + delete_grace_seconds가 지난 뒤에 원격에서 삭제한다.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = OPENAI_FILE_TTL_SECONDS,
+        cleanup_interval_seconds: float = OPENAI_FILE_CLEANUP_INTERVAL_SECONDS,
+        client_factory: Callable[[], "AsyncOpenAI"] = get_gpt_client,
+        reuse_margin_seconds: float = OPENAI_FILE_REUSE_MARGIN_SECONDS,
+        delete_grace_seconds: float = OPENAI_FILE_DELETE_GRACE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self.client_factory = client_factory
+        self.reuse_margin_seconds = reuse_margin_seconds
+        self.delete_grace_seconds = delete_grace_seconds
+        self.clock = clock
+        self._files: Dict[str, _UploadedFile] = {}
+        # 다시 업로드되어 교체된 파일. 삭제 시각이 되면 함께 지운다.
+        self._retired: List[_UploadedFile] = []
+        self._uploading: SingleFlight[str] = SingleFlight()
+        self._last_cleanup = clock()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"uploads": 0, "reuses": 0, "deletes": 0}
+
+    async def get_or_upload(self, key: str, filename: str, content: bytes) -> str:
+        self._schedule_cleanup()
+
+        uploaded = self._files.get(key)
+        if uploaded is not None and self._reusable(uploaded):
+            self.stats["reuses"] += 1
+            return uploaded.file_id
+
+        # 동시에 들어온 같은 내용의 업로드는 하나로 합친다.
+        return await self._uploading.do(
+            key, lambda: self._upload(key, filename, content)
+        )
+
+    async def _upload(self, key: str, filename: str, content: bytes) -> str:
+        client = self.client_factory()
+        file_object = await client.files.create(
+            file=(filename, content, "application/pdf"), purpose="user_data"
+        )
+        self.stats["uploads"] += 1
+        replaced = self._files.get(key)
+        if replaced is not None:
+            self._retired.append(replaced)
+        self._files[key] = _UploadedFile(file_object.id, self.clock())
+        logger.info(f"Files API 업로드: {file_object.id} ({len(content)} bytes)")
+        return file_object.id
+
+    async def cleanup_expired(self) -> int:
+        """삭제 유예 시간까지 지난 파일을 원격에서 삭제하고 삭제한 개수를 돌려준다."""
+        self._last_cleanup = self.clock()
+        expired = [uploaded for uploaded in self._retired if self._deletable(uploaded)]
+        self._retired = [
+            uploaded for uploaded in self._retired if not self._deletable(uploaded)
+        ]
+        for key, uploaded in list(self._files.items()):
+            if self._deletable(uploaded):
+                del self._files[key]
+                expired.append(uploaded)
+
+        client = self.client_factory()
+        deleted = 0
+        for uploaded in expired:
+            try:
+                await client.files.delete(uploaded.file_id)
+                deleted += 1
+            except Exception as e:
+                logger.warning(f"Files API 삭제 실패: {uploaded.file_id} ({e})")
+        self.stats["deletes"] += deleted
+        return deleted
+
+    def _reusable(self, uploaded: _UploadedFile) -> bool:
+        age = self.clock() - uploaded.uploaded_at
+        return age < self.ttl_seconds - self.reuse_margin_seconds
+
+    def _deletable(self, uploaded: _UploadedFile) -> bool:
+        age = self.clock() - uploaded.uploaded_at
+        return age >= self.ttl_seconds + self.delete_grace_seconds
+
+    def _schedule_cleanup(self) -> None:
+        if self._cleanup_task is not None and not self._cleanup_task.done():
+            return
+        if self.clock() - self._last_cleanup < self.cleanup_interval_seconds:
+            return
+        self._cleanup_task = asyncio.create_task(self.cleanup_expired())
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+uploaded_file_registry = UploadedFileRegistry()
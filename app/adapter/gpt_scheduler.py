@@ -0,0 +1,146 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+from app.util.logger import logger
+
+# 동시에 진행할 수 있는 업스트림 GPT 호출 수 (프로세스 전체)
+GPT_SCHEDULER_CONCURRENCY = int(os.getenv("GPT_SCHEDULER_CONCURRENCY", "32"))
+# 대기열 최대 길이. 가득 차면 새 호출은 거절하지 않고 자리가 날 때까지 기다린다.
+GPT_SCHEDULER_MAX_QUEUE = int(os.getenv("GPT_SCHEDULER_MAX_QUEUE", "256"))
+GPT_SCHEDULER_SLOW_WAIT_SECONDS = float(
+    os.getenv("GPT_SCHEDULER_SLOW_WAIT_SECONDS", "1")
+)
+
+_PRIORITY_LANE = 0
+_NORMAL_LANE = 1
+
+
+class GptCallScheduler:
+    """
+    업스트림 GPT 호출을 전역 동시성 한도 안에서 배분한다.
+    - 흐름(요청)별 공정 큐잉: 각 호출에 가상 종료 시각을 매겨 작은 순서로 실행한다.
+      한 요청이 청크를 많이 넣어도 다른 요청의 호출이 사이사이 끼어든다.
+    - priority 호출(요청의 첫 청크)은 일반 호출보다 먼저 실행한다.
+    - 대기열이 가득 차면 호출자가 자리가 날 때까지 기다리게 해 부하를 앞단으로 되돌린다.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = GPT_SCHEDULER_CONCURRENCY,
+        max_queue: int = GPT_SCHEDULER_MAX_QUEUE,
+    ):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.running = 0
+        self.depth = 0
+        self._queue: List[Tuple[int, float, int, asyncio.Future]] = []
+        self._space_waiters: List[asyncio.Future] = []
+        self._virtual_time = 0.0
+        self._flow_finish: Dict[str, float] = {}
+        self._sequence = itertools.count()
+        self.stats: Dict[str, float] = {
+            "granted": 0,
+            "queued": 0,
+            "blocked": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    @asynccontextmanager
+    async def slot(self, flow: str, priority: bool = False) -> AsyncIterator[None]:
+        """호출 하나가 실행될 차례를 기다렸다가, 블록을 벗어나면 자리를 반납한다."""
+        started = time.monotonic()
+        await self._acquire(flow, priority)
+        waited = time.monotonic() - started
+        self.stats["granted"] += 1
+        self.stats["wait_seconds_total"] += waited
+        self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], waited)
+        if waited >= GPT_SCHEDULER_SLOW_WAIT_SECONDS:
+            logger.info(
+                f"GPT 호출 대기 {waited:.2f}초 (flow={flow}, priority={priority}, "
+                f"depth={self.depth}, running={self.running})"
+            )
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, flow: str, priority: bool) -> None:
+        while self.depth >= self.max_queue:
+            self.stats["blocked"] += 1
+            space = asyncio.get_running_loop().create_future()
+            self._space_waiters.append(space)
+            try:
+                await space
+            except asyncio.CancelledError:
+                if space in self._space_waiters:
+                    self._space_waiters.remove(space)
+                elif space.done() and not space.cancelled():
+                    # 깨어난 직후 취소되었으면 다른 대기자를 대신 깨운다.
+                    self._wake_space_waiter()
+                raise
+
+        if self.running < self.concurrency and self.depth == 0:
+            self.running += 1
+            return
+
+        # 가상 종료 시각 = max(현재 가상 시각, 같은 흐름의 직전 종료 시각) + 1
+        finish = max(self._virtual_time, self._flow_finish.get(flow, 0.0)) + 1
+        self._flow_finish[flow] = finish
+        granted = asyncio.get_running_loop().create_future()
+        lane = _PRIORITY_LANE if priority else _NORMAL_LANE
+        heapq.heappush(self._queue, (lane, finish, next(self._sequence), granted))
+        self.depth += 1
+        self.stats["queued"] += 1
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                # 자리를 받은 직후 취소되었으면 받은 자리를 다음 대기자에게 넘긴다.
+                self._release()
+            else:
+                granted.cancel()
+                self.depth -= 1
+                self._wake_space_waiter()
+            raise
+
+    def _release(self) -> None:
+        while self._queue:
+            _, finish, _, granted = heapq.heappop(self._queue)
+            if granted.done():
+                # 기다리다 취소된 호출
+                continue
+            self.depth -= 1
+            self._virtual_time = max(self._virtual_time, finish)
+            # 실행 중인 수는 그대로 두고 자리를 대기자에게 넘긴다.
+            granted.set_result(None)
+            self._wake_space_waiter()
+            self._forget_finished_flows()
+            return
+        self.running -= 1
+
+    def _wake_space_waiter(self) -> None:
+        while self._space_waiters:
+            space = self._space_waiters.pop(0)
+            if not space.done():
+                space.set_result(None)
+                return
+
+    def _forget_finished_flows(self) -> None:
+        if len(self._flow_finish) <= 1000:
+            return
+        # 가상 시각보다 앞선 종료 시각은 다음 계산에서 어차피 무시된다.
+        self._flow_finish = {
+            flow: finish
+            for flow, finish in self._flow_finish.items()
+            if finish > self._virtual_time
+        }
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+gpt_scheduler = GptCallScheduler()
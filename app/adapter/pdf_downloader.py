@@ -0,0 +1,144 @@
+import asyncio
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException
+
+from app.util.logger import logger
+from app.util.timing import log_elapsed
+
+# 다운로드 1건에 허용되는 전체 시간(초)과 최대 크기(byte)
+PDF_DOWNLOAD_TIMEOUT = float(os.getenv("PDF_DOWNLOAD_TIMEOUT", "30"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(100 * 1024 * 1024)))
+PDF_DOWNLOAD_MAX_CONNECTIONS = int(os.getenv("PDF_DOWNLOAD_MAX_CONNECTIONS", "50"))
+# 이 크기를 넘는 문서는 메모리 버퍼 대신 임시 파일로 받는다(spool_dir가 주어진 경우). 0이면 끈다.
+PDF_SPOOL_MIN_BYTES = int(os.getenv("PDF_SPOOL_MIN_BYTES", "0"))
+
+
+@dataclass(frozen=True)
+class DownloadedPdf:
+    # If-None-Match 조건부 요청에서 304를 받으면 content와 spool_path가 모두 None이다.
+    content: Optional[bytes]
+    etag: Optional[str]
+    # 임시 파일로 받은 경우 content 대신 경로가 채워지고, 파일 정리는 받는 쪽 책임이다.
+    spool_path: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.content is None and self.spool_path is None
+
+    @property
+    def size(self) -> int:
+        if self.spool_path is not None:
+            return os.path.getsize(self.spool_path)
+        return len(self.content or b"")
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """keep-alive 커넥션 풀을 공유하는 httpx 비동기 클라이언트를 캐싱하여 제공한다."""
+    limits = httpx.Limits(
+        max_connections=PDF_DOWNLOAD_MAX_CONNECTIONS,
+        max_keepalive_connections=PDF_DOWNLOAD_MAX_CONNECTIONS,
+        keepalive_expiry=60.0,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(PDF_DOWNLOAD_TIMEOUT, connect=10.0),
+        follow_redirects=True,
+    )
+
+
+async def download_pdf_if_modified(
+    uploaded_url: str,
+    etag: Optional[str] = None,
+    spool_dir: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> DownloadedPdf:
+    """
+    etag가 주어지면 조건부 요청을 보내고, 변경되지 않았으면 본문 없이 돌려준다.
+    spool_dir가 주어지면 PDF_SPOOL_MIN_BYTES를 넘는 본문은 그 디렉터리의 임시 파일로 받는다.
+    timeout을 주면(요청 마감 시간에서 나눈 몫) PDF_DOWNLOAD_TIMEOUT 대신 쓴다.
+    """
+    with log_elapsed(logger, "download_pdf"):
+        try:
+            async with asyncio.timeout(
+                PDF_DOWNLOAD_TIMEOUT if timeout is None else timeout
+            ):
+                downloaded = await _stream_body(uploaded_url, etag, spool_dir)
+        except TimeoutError:
+            logger.error(f"PDF 다운로드 시간 초과: {uploaded_url}")
+            raise HTTPException(status_code=504, detail="PDF 다운로드 시간 초과")
+
+    if downloaded.not_modified:
+        logger.info("download_pdf 변경 없음 (304)")
+    else:
+        spooled = " (임시 파일)" if downloaded.spool_path else ""
+        logger.info(f"download_pdf 크기: {downloaded.size} bytes{spooled}")
+    return downloaded
+
+
+async def _stream_body(
+    uploaded_url: str, etag: Optional[str], spool_dir: Optional[str]
+) -> DownloadedPdf:
+    client = get_http_client()
+    headers = {"If-None-Match": etag} if etag else None
+    async with client.stream("GET", uploaded_url, headers=headers) as response:
+        if response.status_code == 304:
+            return DownloadedPdf(content=None, etag=etag)
+        response.raise_for_status()
+
+        # Content-Length가 있으면 본문을 받기 전에 먼저 거른다.
+        content_length = _parse_content_length(response.headers.get("content-length"))
+        if content_length is not None and content_length > PDF_MAX_BYTES:
+            raise _too_large()
+
+        buffer = bytearray()
+        size = 0
+        spool = None
+        try:
+            async for part in response.aiter_bytes():
+                size += len(part)
+                if size > PDF_MAX_BYTES:
+                    raise _too_large()
+                if spool is not None:
+                    spool.write(part)
+                    continue
+                buffer.extend(part)
+                if spool_dir and 0 < PDF_SPOOL_MIN_BYTES <= len(buffer):
+                    # 큰 문서는 여기서부터 파일로 흘려보내 전체를 파이썬 바이트로 들고 있지 않는다.
+                    spool = tempfile.NamedTemporaryFile(
+                        dir=spool_dir, suffix=".download", delete=False
+                    )
+                    spool.write(buffer)
+                    buffer = bytearray()
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                os.remove(spool.name)
+            raise
+
+        if spool is not None:
+            spool.close()
+            return DownloadedPdf(
+                content=None, etag=response.headers.get("etag"), spool_path=spool.name
+            )
+        return DownloadedPdf(content=bytes(buffer), etag=response.headers.get("etag"))
+
+
+def _parse_content_length(value: Optional[str]) -> Optional[int]:
+    # 잘못된 헤더는 무시한다. 크기 제한은 본문을 받으면서 다시 확인한다.
+    try:
+        return int(value) if value else None
+    except ValueError:
+        logger.warning(f"잘못된 Content-Length 헤더를 무시합니다: {value!r}")
+        return None
+
+
+def _too_large() -> HTTPException:
+    logger.error(f"PDF 크기 제한 초과 (최대 {PDF_MAX_BYTES} bytes)")
+    return HTTPException(status_code=413, detail="PDF 파일이 너무 큽니다.")
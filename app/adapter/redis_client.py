@@ -0,0 +1,12 @@
+import os
+from functools import lru_cache
+
+from redis import asyncio as aioredis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+@lru_cache(maxsize=1)
+def get_redis_client() -> aioredis.Redis:
+    """Redis 비동기 클라이언트를 캐싱하여(싱글톤처럼) 제공한다."""
+    return aioredis.from_url(REDIS_URL)
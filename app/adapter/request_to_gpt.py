@@ -1,15 +1,26 @@
+import asyncio
 import os
+import time
 from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator
 
 from fastapi import HTTPException
-from openai import AsyncOpenAI, APITimeoutError
 
 from app.util.logger import logger
+from app.util.metrics import upstream_seconds
+from app.util.prompt_cache_stats import prompt_cache_stats
+from app.util.usage_accounting import record_usage
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 
 @lru_cache(maxsize=1)
-def get_gpt_client() -> AsyncOpenAI:
+def get_gpt_client() -> "AsyncOpenAI":
     """OpenAI 비동기 클라이언트를 캐싱하여(싱글톤처럼) 제공한다."""
+    # SDK 임포트가 무거워 앱 임포트 경로에서 빼고, 클라이언트를 처음 만들 때 불러온다.
+    from openai import AsyncOpenAI
+
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY 환경변수가 설정되어 있지 않습니다.")
@@ -19,14 +30,76 @@ def get_gpt_client() -> AsyncOpenAI:
 
 async def request_to_gpt_returning_text(gpt_request: dict, timeout: int) -> str:
     """Responses API로 단건 요청을 전송하고 텍스트만 추출한다."""
+    from openai import APITimeoutError
+
     try:
-        client = get_gpt_client()
-        client = client.with_options(timeout=float(timeout))
-        resp = await client.responses.create(**gpt_request)
+        return await create_response_text(gpt_request, float(timeout))
     except APITimeoutError:
         logger.error("OpenAI API Timeout")
         raise HTTPException(status_code=429, detail="OpenAI API Timeout")
 
+
+async def create_response_text(gpt_request: dict, timeout: float) -> str:
+    """Responses API 단건 요청. SDK 예외를 그대로 올려 호출 정책(재시도/헤징)이 판단하게 한다."""
+    client = get_gpt_client()
+    client = client.with_options(timeout=timeout)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        resp = await client.responses.create(**gpt_request)
+        outcome = "ok"
+    except asyncio.CancelledError:
+        # 헤지 경쟁에서 진 호출 등
+        outcome = "cancelled"
+        raise
+    finally:
+        upstream_seconds.observe(
+            time.perf_counter() - start, model=gpt_request["model"], outcome=outcome
+        )
+    prompt_cache_stats.observe(gpt_request["model"], getattr(resp, "usage", None))
+    record_usage(gpt_request["model"], getattr(resp, "usage", None))
+    return extract_text(resp)
+
+
+async def stream_response_text(gpt_request: dict, timeout: float) -> AsyncIterator[str]:
+    """Responses API 스트리밍 요청. 출력 텍스트 조각(delta)을 도착하는 대로 내보낸다."""
+    client = get_gpt_client()
+    client = client.with_options(timeout=timeout)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        stream = await client.responses.create(**gpt_request, stream=True)
+    except BaseException:
+        upstream_seconds.observe(
+            time.perf_counter() - start, model=gpt_request["model"], outcome=outcome
+        )
+        raise
+    try:
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                yield event.delta
+            elif event.type == "response.completed":
+                usage = getattr(event.response, "usage", None)
+                prompt_cache_stats.observe(gpt_request["model"], usage)
+                record_usage(gpt_request["model"], usage)
+            elif event.type in ("response.failed", "response.incomplete"):
+                logger.warning(f"Responses API 스트림 비정상 종료: {event.type}")
+                outcome = event.type.removeprefix("response.")
+                return
+        outcome = "ok"
+    except (asyncio.CancelledError, GeneratorExit):
+        outcome = "cancelled"
+        raise
+    finally:
+        # 스트림은 첫 조각이 아니라 끝날 때까지의 시간을 기록한다.
+        upstream_seconds.observe(
+            time.perf_counter() - start, model=gpt_request["model"], outcome=outcome
+        )
+        # 소비자가 중간에 떠나도 업스트림 연결을 바로 닫는다.
+        await stream.close()
+
+
+def extract_text(resp) -> str:
     text = getattr(resp, "output_text", None)
     if isinstance(text, str) and text.strip():
         return text
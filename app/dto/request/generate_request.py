@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class DOKLevel(str, Enum):
@@ -16,9 +16,21 @@ class QuizType(str, Enum):
     MULTIPLE = "MULTIPLE"
 
 
+class InputMode(str, Enum):
+    PDF = "PDF"
+    TEXT = "TEXT"
+    AUTO = "AUTO"
+
+
 class GenerateRequest(BaseModel):
     uploadedUrl: str
     quizCount: int
     difficultyType: DOKLevel
     quizType: QuizType
     pageNumbers: List[int]
+    inputMode: InputMode = InputMode.PDF
+    useCache: bool = True
+    # true면 마지막 줄에 토큰 사용량/추정 비용 요약({"usage": {...}})을 덧붙인다.
+    includeUsage: bool = False
+    # 다운로드부터 마지막 퀴즈까지의 마감 시간(초). 없으면 GENERATION_DEADLINE_SECONDS를 쓴다.
+    deadlineSeconds: Optional[float] = Field(default=None, gt=0)
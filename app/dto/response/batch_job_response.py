@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.dto.response.generate_response import ProblemResponse
+
+
+class BatchJobResponse(BaseModel):
+    jobId: str
+    # OpenAI 배치 상태: validating | in_progress | finalizing | completed | failed | expired | cancelling | cancelled
+    status: str
+    totalChunks: int
+    completedChunks: int
+    failedChunks: int
+    createdAt: int
+    completedAt: Optional[int] = None
+
+
+class BatchJobResultResponse(BaseModel):
+    jobId: str
+    status: str
+    quiz: List[ProblemResponse]
+    # 요청 실패 또는 응답 검증 실패로 퀴즈를 내지 못한 청크 수
+    failedChunks: int
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class GenerationJobResponse(BaseModel):
+    jobId: str
+    # running | completed | failed | stalled(진행 기록이 오래 없음)
+    status: str
+    quizCount: int
+    # 저장된 청크 결과 줄 수. 스트림을 이어 받을 때 offset으로 쓴다.
+    completedChunks: int
+    error: Optional[str] = None
@@ -1,15 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI, status, Request
 from starlette.responses import JSONResponse
 
 load_dotenv()
 
+from app.router.batch_router import router as batch_router
 from app.router.generate_router import router as generate_router
+from app.router.generation_job_router import router as generation_job_router
+from app.router.health_router import router as health_router
+from app.router.metrics_router import router as metrics_router
+from app.util.lifecycle import shut_down, warm_up
 from app.util.logger import logger
+from app.util.loop_monitor import event_loop_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 워밍업은 백그라운드로 돌려 포트를 바로 열고, 준비 여부는 /ready로 알린다.
+    warm_up_task = asyncio.create_task(warm_up())
+    event_loop_monitor.start()
+    yield
+    await event_loop_monitor.stop()
+    warm_up_task.cancel()
+    await asyncio.gather(warm_up_task, return_exceptions=True)
+    await shut_down()
+
 
-app = FastAPI(docs_url="/")
+app = FastAPI(docs_url="/", lifespan=lifespan)
 
 app.include_router(generate_router)
+app.include_router(batch_router)
+app.include_router(generation_job_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
 
 
 @app.exception_handler(Exception)
@@ -0,0 +1,99 @@
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from app.dto.model.problem_set import ProblemSet
+from app.dto.request.generate_request import DOKLevel, QuizType
+from app.prompt import prompt_factory
+from app.util.gpt_utils import enforce_additional_properties_false
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """
+    (퀴즈 유형, 난이도)마다 한 번만 만드는 정적 프롬프트.
+    system 메시지와 출력 스키마는 요청과 무관하게 바이트 단위로 같아서
+    업스트림 프롬프트 캐시의 공통 접두부가 된다. 청크마다 달라지는 값(문제 수)은 맨 뒤에 둔다.
+    """
+
+    system_message: str
+    text_format: dict
+
+    def build_request(
+        self, model: str, quiz_count: int, lecture_content: List[dict]
+    ) -> dict:
+        return {
+            "model": model,
+            "max_output_tokens": 10000,
+            "text": self.text_format,
+            "input": [
+                {"role": "system", "content": self.system_message},
+                {
+                    "role": "user",
+                    "content": [
+                        *lecture_content,
+                        {
+                            "type": "input_text",
+                            "text": _quiz_count_instruction(quiz_count),
+                        },
+                    ],
+                },
+            ],
+        }
+
+
+def _quiz_count_instruction(quiz_count: int) -> str:
+    return f"위 강의노트로 퀴즈를 정확히 {quiz_count}개 생성하세요."
+
+
+def _compile_system_message(dok_level: DOKLevel, quiz_type: QuizType) -> str:
+    return f"""
+        당신은 대학 강의노트로부터 평가용 퀴즈를 생성하는 AI입니다.
+        주어진 강의노트 내용을 분석하여 학생들의 이해도를 평가할 수 있는 효과적인 퀴즈를 생성하세요.
+        생성할 퀴즈 개수는 강의노트 뒤에 주어지는 지시를 따르세요.
+
+        작성 규칙:
+        - 한국어로 작성
+        - 적극적으로 개행하여 가독성에 신경 쓸 것
+        - 강의 노트를 참조하라는 문제 생성 금지 (예: "강의노트에 따르면", "본문을 참고하면" 등 금지)
+
+        문제 생성 지침(품질/난이도):
+        {prompt_factory.get_quiz_generation_guide(dok_level, quiz_type)}
+
+        문항 형식(유형별 제약):
+        {prompt_factory.get_quiz_format(quiz_type)}
+                    """.strip()
+
+
+def _compile_text_format() -> dict:
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": "problem_set",
+            "strict": True,
+            "schema": enforce_additional_properties_false(
+                deepcopy(ProblemSet.model_json_schema())
+            ),
+        }
+    }
+
+
+def compile_prompts() -> Dict[Tuple[QuizType, DOKLevel], CompiledPrompt]:
+    # 스키마 객체는 모든 프롬프트가 공유하며 요청 처리 중에는 수정하지 않는다.
+    text_format = _compile_text_format()
+    return {
+        (quiz_type, dok_level): CompiledPrompt(
+            system_message=_compile_system_message(dok_level, quiz_type),
+            text_format=text_format,
+        )
+        for quiz_type in QuizType
+        for dok_level in DOKLevel
+    }
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+compiled_prompts = compile_prompts()
+
+
+def get_compiled_prompt(quiz_type: QuizType, dok_level: DOKLevel) -> CompiledPrompt:
+    return compiled_prompts[(quiz_type, dok_level)]
@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+
+from app.dto.request.generate_request import GenerateRequest
+from app.dto.response.batch_job_response import (
+    BatchJobResponse,
+    BatchJobResultResponse,
+)
+from app.service.batch_service import BatchService
+
+router = APIRouter()
+
+
+@router.post("/generation/batch", status_code=202)
+async def create_batch_job(request: GenerateRequest) -> BatchJobResponse:
+    return await BatchService.create_job(request)
+
+
+@router.get("/generation/batch/{job_id}")
+async def get_batch_job(job_id: str) -> BatchJobResponse:
+    return await BatchService.get_job(job_id)
+
+
+@router.get("/generation/batch/{job_id}/result")
+async def get_batch_job_result(job_id: str) -> BatchJobResultResponse:
+    return await BatchService.get_result(job_id)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from starlette.requests import Request
 from starlette.responses import StreamingResponse
 
 from app.dto.request.generate_request import GenerateRequest
@@ -6,14 +7,18 @@ from app.dto.request.specific_explanation_request import SpecificExplanationRequ
 from app.dto.response.specific_explanation_response import SpecificExplanationResponse
 from app.service.explanation_service import ExplanationService
 from app.service.generate_service import GenerateService
+from app.util.client_disconnect import stop_on_disconnect
 
 router = APIRouter()
 
 
 @router.post("/generation")
-async def generate(request: GenerateRequest) -> StreamingResponse:
+async def generate(request: GenerateRequest, raw_request: Request) -> StreamingResponse:
+    stream, cache_status = await GenerateService.open_stream(request)
     return StreamingResponse(
-        GenerateService.generate(request), media_type="application/x-ndjson"
+        stop_on_disconnect(raw_request, stream),
+        media_type="application/x-ndjson",
+        headers={"X-Result-Cache": cache_status},
     )
 
 
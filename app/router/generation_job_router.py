@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Query
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from app.dto.request.generate_request import GenerateRequest
+from app.dto.response.generation_job_response import GenerationJobResponse
+from app.service.generation_job_service import GenerationJobService
+from app.util.client_disconnect import stop_on_disconnect
+
+router = APIRouter()
+
+
+@router.post("/generation/jobs", status_code=202)
+async def create_generation_job(request: GenerateRequest) -> GenerationJobResponse:
+    return await GenerationJobService.create_job(request)
+
+
+@router.get("/generation/jobs/{job_id}")
+async def get_generation_job(job_id: str) -> GenerationJobResponse:
+    return await GenerationJobService.get_job(job_id)
+
+
+@router.get("/generation/jobs/{job_id}/stream")
+async def stream_generation_job(
+    job_id: str, raw_request: Request, offset: int = Query(default=0, ge=0)
+) -> StreamingResponse:
+    # 연결이 끊겨도 작업은 계속 돌고, 이 구독만 멈춘다.
+    stream = await GenerationJobService.open_stream(job_id, offset)
+    return StreamingResponse(
+        stop_on_disconnect(raw_request, stream), media_type="application/x-ndjson"
+    )
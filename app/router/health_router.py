@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from starlette.responses import JSONResponse
+
+from app.util.lifecycle import readiness
+
+router = APIRouter()
+
+
+@router.get("/ready")
+async def ready() -> JSONResponse:
+    # 워밍업이 끝나기 전에는 503을 돌려 로드밸런서가 트래픽을 보내지 않게 한다.
+    return JSONResponse(
+        status_code=200 if readiness.ready else 503,
+        content=readiness.snapshot(),
+    )
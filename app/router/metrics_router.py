@@ -0,0 +1,188 @@
+from typing import List
+
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+
+from app.adapter.call_policy import gpt_call_policy
+from app.adapter.file_uploader import uploaded_file_registry
+from app.adapter.gpt_scheduler import gpt_scheduler
+from app.service.explanation_service import explanation_cache_stats, explanation_flight
+from app.service.inflight_generation import inflight_generations
+from app.service.model_router import model_router
+from app.util.document_cache import document_cache
+from app.util.loop_monitor import event_loop_monitor
+from app.util.metrics import Sample, metrics, stats_samples
+from app.util.prompt_cache_stats import prompt_cache_stats
+from app.util.rate_limiter import rate_limiter
+from app.util.result_cache import result_cache
+
+router = APIRouter()
+
+
+# 단조 증가하는 값(counter)과 현재 상태를 나타내는 값(gauge)은 서로 다른 계열로 내보낸다.
+_MODEL_ROUTER_COUNTERS = ("samples", "successes")
+_SCHEDULER_COUNTERS = ("granted", "queued", "blocked", "wait_seconds_total")
+_PROMPT_CACHE_COUNTERS = ("calls", "input_tokens", "cached_tokens")
+_EVENT_LOOP_COUNTERS = ("samples",)
+
+
+def _gauge_keys(stats: dict, counters: tuple) -> List[str]:
+    return [key for key in stats if key not in counters]
+
+
+def _model_router_samples(counters: bool) -> List[Sample]:
+    samples = []
+    for model, model_stats in model_router.stats["models"].items():
+        keys = (
+            _MODEL_ROUTER_COUNTERS
+            if counters
+            else _gauge_keys(model_stats, _MODEL_ROUTER_COUNTERS)
+        )
+        samples.extend(stats_samples(model_stats, keys, model=model))
+    return samples
+
+
+def _model_router_decision_samples() -> List[Sample]:
+    samples = []
+    for decision, count in model_router.stats["decisions"].items():
+        model, _, reason = decision.rpartition(":")
+        samples.append(({"model": model, "reason": reason}, count))
+    return samples
+
+
+def _prompt_cache_samples(counters: bool) -> List[Sample]:
+    samples = []
+    for model, model_stats in prompt_cache_stats.stats.items():
+        keys = (
+            _PROMPT_CACHE_COUNTERS
+            if counters
+            else _gauge_keys(model_stats, _PROMPT_CACHE_COUNTERS)
+        )
+        samples.extend(stats_samples(model_stats, keys, model=model))
+    return samples
+
+
+def _scheduler_samples() -> List[Sample]:
+    return [
+        ({"key": "depth"}, gpt_scheduler.depth),
+        ({"key": "running"}, gpt_scheduler.running),
+        *stats_samples(
+            gpt_scheduler.stats, _gauge_keys(gpt_scheduler.stats, _SCHEDULER_COUNTERS)
+        ),
+    ]
+
+
+# 기존 컴포넌트의 stats 딕셔너리는 노출 시점에 읽는다.
+# counter 계열은 레지스트리가 이름에 _total을 붙인다.
+for name, documentation, metric_type, collect in (
+    (
+        "qasker_document_cache",
+        "원본 문서 캐시 적중/미스/축출 횟수",
+        "counter",
+        lambda: stats_samples(document_cache.stats),
+    ),
+    (
+        "qasker_uploaded_files",
+        "Files API 업로드/재사용/삭제 횟수",
+        "counter",
+        lambda: stats_samples(uploaded_file_registry.stats),
+    ),
+    (
+        "qasker_result_cache",
+        "/generation 결과 캐시 적중/미스/저장 횟수",
+        "counter",
+        lambda: stats_samples(result_cache.stats),
+    ),
+    (
+        "qasker_explanation_cache",
+        "해설 캐시 적중/미스와 합친 요청 수",
+        "counter",
+        lambda: [
+            *stats_samples(explanation_cache_stats),
+            ({"key": "coalesced"}, explanation_flight.coalesced),
+        ],
+    ),
+    (
+        "qasker_inflight_generations",
+        "진행 중인 생성 작업에 합류한 요청 수",
+        "counter",
+        lambda: [({"key": "coalesced"}, inflight_generations.coalesced)],
+    ),
+    (
+        "qasker_call_policy",
+        "GPT 호출/재시도/헤지/실패 횟수",
+        "counter",
+        lambda: stats_samples(gpt_call_policy.stats),
+    ),
+    (
+        "qasker_gpt_scheduler",
+        "GPT 호출 스케줄러 대기열 길이, 실행 중인 호출 수, 최대 대기 시간",
+        "gauge",
+        _scheduler_samples,
+    ),
+    (
+        "qasker_gpt_scheduler",
+        "GPT 호출 스케줄러 허가/대기/거절 횟수와 누적 대기 시간",
+        "counter",
+        lambda: stats_samples(gpt_scheduler.stats, _SCHEDULER_COUNTERS),
+    ),
+    (
+        "qasker_model_router",
+        "모델별 지연/실패율 이동 평균",
+        "gauge",
+        lambda: _model_router_samples(counters=False),
+    ),
+    (
+        "qasker_model_router",
+        "모델별 관측/성공 횟수",
+        "counter",
+        lambda: _model_router_samples(counters=True),
+    ),
+    (
+        "qasker_model_router_decisions",
+        "모델 라우터 배정 횟수",
+        "counter",
+        _model_router_decision_samples,
+    ),
+    (
+        "qasker_prompt_cache",
+        "업스트림 프롬프트 캐시 적중 비율",
+        "gauge",
+        lambda: _prompt_cache_samples(counters=False),
+    ),
+    (
+        "qasker_prompt_cache",
+        "업스트림 호출 수와 입력/캐시 적중 토큰 수",
+        "counter",
+        lambda: _prompt_cache_samples(counters=True),
+    ),
+    (
+        "qasker_rate_limiter",
+        "레이트 리밋 허용/거절/오류 수",
+        "counter",
+        lambda: stats_samples(rate_limiter.stats),
+    ),
+    (
+        "qasker_event_loop",
+        "이벤트 루프 최대 지연",
+        "gauge",
+        lambda: stats_samples(
+            event_loop_monitor.stats,
+            _gauge_keys(event_loop_monitor.stats, _EVENT_LOOP_COUNTERS),
+        ),
+    ),
+    (
+        "qasker_event_loop",
+        "이벤트 루프 지연 측정 횟수",
+        "counter",
+        lambda: stats_samples(event_loop_monitor.stats, _EVENT_LOOP_COUNTERS),
+    ),
+):
+    metrics.register_collector(name, documentation, collect, metric_type)
+
+
+@router.get("/metrics")
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,234 @@
+import math
+import os
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.adapter.batch_client import (
+    BATCH_ENDPOINT,
+    read_batch_file,
+    retrieve_batch,
+    submit_batch,
+)
+from app.dto.request.generate_request import GenerateRequest
+from app.dto.response.batch_job_response import (
+    BatchJobResponse,
+    BatchJobResultResponse,
+)
+from app.dto.response.generate_response import ProblemResponse
+from app.service.generate_service import GenerateService, shuffle_selections
+from app.service.model_router import MODEL_ROUTER_QUALITY_MODEL
+from app.util.logger import logger
+from app.util.problem_decoder import decode_problem_responses
+from app.util.timing import log_elapsed
+from app.util.ttl_cache import TTLCache
+from app.util.usage_accounting import UsageAccumulator, extract_token_usage
+
+# 배치는 첫 결과 시간을 신경 쓰지 않으므로 품질 모델로 보낸다.
+BATCH_MODEL = os.getenv("BATCH_MODEL", MODEL_ROUTER_QUALITY_MODEL)
+# 청크 1개가 만들 퀴즈 수. 실시간 경로의 MAX_CHUNK_COUNT와 달리 퀴즈 수에 맞춰 청크를 늘린다.
+BATCH_QUIZZES_PER_CHUNK = int(os.getenv("BATCH_QUIZZES_PER_CHUNK", "3"))
+BATCH_MAX_CHUNK_COUNT = int(os.getenv("BATCH_MAX_CHUNK_COUNT", "500"))
+# Batch API 요금은 실시간 호출 정가의 절반이다. 로그의 비용 추정에만 쓴다.
+BATCH_PRICE_MULTIPLIER = float(os.getenv("BATCH_PRICE_MULTIPLIER", "0.5"))
+BATCH_RESULT_CACHE_TTL_SECONDS = float(
+    os.getenv("BATCH_RESULT_CACHE_TTL_SECONDS", "3600")
+)
+# 이 서비스가 만든 배치만 조회할 수 있게 메타데이터로 표시한다.
+BATCH_SOURCE = "qasker-generation"
+# 결과 파일을 읽을 수 있는 상태(만료/취소된 배치도 끝난 요청의 출력은 남는다)
+TERMINAL_STATUSES = ("completed", "expired", "cancelled", "failed")
+
+batch_results: TTLCache[BatchJobResultResponse] = TTLCache(
+    100, BATCH_RESULT_CACHE_TTL_SECONDS
+)
+
+
+class BatchService:
+    """
+    대량 퀴즈 생성을 OpenAI Batch API로 보내 실시간 /generation의 레이트 리밋과 지연 경로를 쓰지 않게 한다.
+    작업 ID는 배치 ID 그대로이고, 청크 정보는 custom_id와 배치 메타데이터에 담아 따로 저장하지 않는다.
+    """
+
+    @staticmethod
+    async def create_job(generate_request: GenerateRequest) -> BatchJobResponse:
+        chunk_count = min(
+            math.ceil(generate_request.quizCount / BATCH_QUIZZES_PER_CHUNK),
+            BATCH_MAX_CHUNK_COUNT,
+        )
+        with log_elapsed(logger, "build_batch_requests"):
+            chunk_requests = await GenerateService.build_chunk_requests(
+                generate_request, BATCH_MODEL, chunk_count
+            )
+        if not chunk_requests:
+            raise HTTPException(status_code=422, detail="배치로 보낼 청크가 없습니다")
+
+        lines = [
+            {
+                "custom_id": _encode_custom_id(
+                    index, chunk.quiz_count, chunk.referenced_pages
+                ),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": gpt_request,
+            }
+            for index, (chunk, gpt_request) in enumerate(chunk_requests)
+        ]
+        batch = await submit_batch(
+            lines,
+            metadata={
+                "source": BATCH_SOURCE,
+                "quizType": generate_request.quizType.value,
+                "quizCount": str(generate_request.quizCount),
+                "model": BATCH_MODEL,
+            },
+        )
+        return _to_job_response(batch)
+
+    @staticmethod
+    async def get_job(job_id: str) -> BatchJobResponse:
+        return _to_job_response(await _retrieve_own_batch(job_id))
+
+    @staticmethod
+    async def get_result(job_id: str) -> BatchJobResultResponse:
+        cached = batch_results.get(job_id)
+        if cached is not None:
+            return cached
+
+        batch = await _retrieve_own_batch(job_id)
+        if batch.status not in TERMINAL_STATUSES:
+            raise HTTPException(
+                status_code=409,
+                detail=f"배치 작업이 아직 끝나지 않았습니다 ({batch.status})",
+            )
+
+        quiz_type = batch.metadata["quizType"]
+        # 응답 본문의 모델명은 날짜가 붙은 스냅샷 이름이라 가격표 키(제출한 모델명)를 쓴다.
+        model = batch.metadata.get("model", BATCH_MODEL)
+        outputs = (
+            await read_batch_file(batch.output_file_id) if batch.output_file_id else []
+        )
+        errors = (
+            await read_batch_file(batch.error_file_id) if batch.error_file_id else []
+        )
+
+        usage = UsageAccumulator()
+        chunk_results: List[Tuple[int, List[ProblemResponse]]] = []
+        failed = len(errors)
+        for line in outputs:
+            index, pages = _decode_custom_id(line["custom_id"])
+            problems = _decode_output(line, pages, quiz_type, model, usage)
+            if problems:
+                chunk_results.append((index, problems))
+            else:
+                failed += 1
+
+        # 청크 순서(= 페이지 순서)대로 이어 붙이고 1부터 번호를 매긴다.
+        quiz: List[ProblemResponse] = []
+        for _, problems in sorted(chunk_results, key=lambda item: item[0]):
+            for problem in problems:
+                problem.number = len(quiz) + 1
+                quiz.append(problem)
+
+        total = batch.request_counts.total if batch.request_counts else 0
+        # 끝나지 못한 요청(만료/취소)도 실패로 센다.
+        failed = max(failed, total - len(chunk_results))
+        usage.log(
+            "batch",
+            jobId=job_id,
+            status=batch.status,
+            chunks=total,
+            failedChunks=failed,
+            batchCostUsd=round(usage.cost_usd * BATCH_PRICE_MULTIPLIER, 6),
+        )
+        result = BatchJobResultResponse(
+            jobId=job_id, status=batch.status, quiz=quiz, failedChunks=failed
+        )
+        batch_results.set(job_id, result)
+        return result
+
+
+async def _retrieve_own_batch(job_id: str):
+    from openai import NotFoundError
+
+    try:
+        batch = await retrieve_batch(job_id)
+    except NotFoundError:
+        batch = None
+    if batch is None or (batch.metadata or {}).get("source") != BATCH_SOURCE:
+        raise HTTPException(status_code=404, detail="배치 작업을 찾을 수 없습니다")
+    return batch
+
+
+def _to_job_response(batch) -> BatchJobResponse:
+    counts = batch.request_counts
+    return BatchJobResponse(
+        jobId=batch.id,
+        status=batch.status,
+        totalChunks=counts.total if counts else 0,
+        completedChunks=counts.completed if counts else 0,
+        failedChunks=counts.failed if counts else 0,
+        createdAt=batch.created_at,
+        completedAt=batch.completed_at,
+    )
+
+
+def _decode_output(
+    line: dict,
+    pages: List[int],
+    quiz_type: str,
+    model: str,
+    usage: UsageAccumulator,
+) -> Optional[List[ProblemResponse]]:
+    """배치 출력 한 줄을 실시간 경로(process_single_chunk)와 같은 규칙으로 검증한다."""
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code") != 200:
+        logger.warning(
+            f"배치 요청 실패: {line.get('custom_id')} "
+            f"(status={response.get('status_code')}, error={line.get('error')})"
+        )
+        return None
+
+    usage.add(model, extract_token_usage(body.get("usage") or {}))
+    try:
+        problems = decode_problem_responses(_output_text(body), pages)
+    except Exception as e:
+        logger.error(f"배치 응답 파싱 실패: {line.get('custom_id')} ({e})")
+        return None
+    if not problems or len(problems[0].selections) > 4:
+        return None
+    for problem in problems:
+        shuffle_selections(problem, quiz_type)
+    return problems
+
+
+def _output_text(body: dict) -> str:
+    return "".join(
+        content.get("text", "")
+        for item in body.get("output") or []
+        if item.get("type") == "message"
+        for content in item.get("content") or []
+        if content.get("type") == "output_text"
+    )
+
+
+def _encode_custom_id(index: int, quiz_count: int, pages: List[int]) -> str:
+    """청크 순서, 퀴즈 수, 참고 페이지를 'chunk-3:2:1-4,9' 형태로 담는다(연속 구간은 범위로 줄인다)."""
+    ranges = []
+    for page in pages:
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    encoded = ",".join(f"{a}-{b}" if a != b else str(a) for a, b in ranges)
+    return f"chunk-{index}:{quiz_count}:{encoded}"
+
+
+def _decode_custom_id(custom_id: str) -> Tuple[int, List[int]]:
+    index, _, encoded = custom_id.removeprefix("chunk-").split(":")
+    pages: List[int] = []
+    for part in encoded.split(","):
+        start, _, end = part.partition("-")
+        pages.extend(range(int(start), int(end or start) + 1))
+    return int(index), pages
@@ -1,8 +1,33 @@
+import hashlib
+import os
+from typing import Dict
+
+import orjson
+
 from app.adapter.request_to_gpt import request_to_gpt_returning_text
 from app.dto.request.specific_explanation_request import SpecificExplanationRequest
 from app.dto.response.specific_explanation_response import SpecificExplanationResponse
 from app.util.logger import logger
+from app.util.single_flight import SingleFlight
 from app.util.timing import log_elapsed
+from app.util.ttl_cache import TTLCache
+from app.util.usage_accounting import (
+    UsageAccumulator,
+    request_cost_usd,
+    usage_scope,
+)
+
+
+EXPLANATION_CACHE_TTL_SECONDS = float(
+    os.getenv("EXPLANATION_CACHE_TTL_SECONDS", "86400")
+)
+EXPLANATION_CACHE_MAX_ENTRIES = int(os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", "5000"))
+
+explanation_cache: TTLCache[str] = TTLCache(
+    EXPLANATION_CACHE_MAX_ENTRIES, EXPLANATION_CACHE_TTL_SECONDS
+)
+explanation_flight: SingleFlight[str] = SingleFlight()
+explanation_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
 
 
 class ExplanationService:
@@ -10,56 +35,104 @@ class ExplanationService:
     async def generate_specific_explanation(
         specific_explanation_request: SpecificExplanationRequest,
     ):
-
-        title = specific_explanation_request.title
-        selections = specific_explanation_request.selections
-
-        selection_text = ""
-        for idx, s in enumerate(selections, start=1):
-            answer_tag = "(정답)" if s.correct else ""
-            selection_text += f"{idx}. {s.content} {answer_tag}\n"
-
-        # 단일 Responses API 호출에서 웹 검색 + 해설 생성을 함께 수행한다.
-        messages = [
-            {
-                "role": "system",
-                "content": "\n".join(
-                    [
-                        "너는 학습을 돕는 튜터다. 주어진 문제와 선택지들을 해설해준다.",
-                        "필요하면 웹 검색 도구를 사용해 신뢰할 수 있는 참고문서를 찾고, 그 근거를 바탕으로 해설을 작성한다.",
-                        "### 제약 사항",
-                        "원한다면, 더 도와드리겠다는 말 출력 금지. 해설 작성에 집중",
-                        "### 출력 형식:",
-                        "상세 해설: 왜 정답이 맞는지, 오답이 왜 틀렸는지 논리적으로 한 글로 설명, 참고하면 좋은 URL 제시",
-                    ]
-                ),
-            },
-            {
-                "role": "user",
-                "content": "\n".join(
-                    [
-                        f"문제: {title}",
-                        "",
-                        "선택지(정답 표시 포함):",
-                        selection_text.strip(),
-                    ]
-                ),
-            },
-        ]
-
-        gpt_content = {
-            "model": "gpt-5-mini",
-            "max_output_tokens": 10000,
-            "input": messages,
-            "tools": [{"type": "web_search_preview"}],
-            "tool_choice": "auto",
-        }
-
-        with log_elapsed(logger, "request_specific_explanation_with_search"):
-            combined_text = await request_to_gpt_returning_text(gpt_content, timeout=30)
-            combined_text = (combined_text or "").strip()
+        key = _build_explanation_key(specific_explanation_request)
+        combined_text = explanation_cache.get(key)
+        if combined_text is not None:
+            explanation_cache_stats["hits"] += 1
+            logger.info("specific_explanation 캐시 적중")
+        else:
+            explanation_cache_stats["misses"] += 1
+            # 같은 문제에 대한 동시 요청은 업스트림 호출 하나를 공유한다.
+            combined_text = await explanation_flight.do(
+                key,
+                lambda: _request_specific_explanation(specific_explanation_request),
+            )
+            if combined_text:
+                explanation_cache.set(key, combined_text)
 
         references = []
         return SpecificExplanationResponse(
             specific_explanation=combined_text, references=references
         )
+
+
+async def _request_specific_explanation(
+    specific_explanation_request: SpecificExplanationRequest,
+) -> str:
+    title = specific_explanation_request.title
+    selections = specific_explanation_request.selections
+
+    selection_text = ""
+    for idx, s in enumerate(selections, start=1):
+        answer_tag = "(정답)" if s.correct else ""
+        selection_text += f"{idx}. {s.content} {answer_tag}\n"
+
+    # 단일 Responses API 호출에서 웹 검색 + 해설 생성을 함께 수행한다.
+    messages = [
+        {
+            "role": "system",
+            "content": "\n".join(
+                [
+                    "너는 학습을 돕는 튜터다. 주어진 문제와 선택지들을 해설해준다.",
+                    "필요하면 웹 검색 도구를 사용해 신뢰할 수 있는 참고문서를 찾고, 그 근거를 바탕으로 해설을 작성한다.",
+                    "### 제약 사항",
+                    "원한다면, 더 도와드리겠다는 말 출력 금지. 해설 작성에 집중",
+                    "### 출력 형식:",
+                    "상세 해설: 왜 정답이 맞는지, 오답이 왜 틀렸는지 논리적으로 한 글로 설명, 참고하면 좋은 URL 제시",
+                ]
+            ),
+        },
+        {
+            "role": "user",
+            "content": "\n".join(
+                [
+                    f"문제: {title}",
+                    "",
+                    "선택지(정답 표시 포함):",
+                    selection_text.strip(),
+                ]
+            ),
+        },
+    ]
+
+    gpt_content = {
+        "model": "gpt-5-mini",
+        "max_output_tokens": 10000,
+        "input": messages,
+        "tools": [{"type": "web_search_preview"}],
+        "tool_choice": "auto",
+    }
+
+    usage = UsageAccumulator()
+    with log_elapsed(logger, "request_specific_explanation_with_search"):
+        try:
+            with usage_scope(usage):
+                combined_text = await request_to_gpt_returning_text(
+                    gpt_content, timeout=30
+                )
+        finally:
+            usage.log("explanation")
+            request_cost_usd.observe(usage.cost_usd, endpoint="explanation")
+        combined_text = (combined_text or "").strip()
+
+    return combined_text
+
+
+def _build_explanation_key(
+    specific_explanation_request: SpecificExplanationRequest,
+) -> str:
+    """공백 차이를 무시하도록 문제와 선택지를 정규화해 캐시 키를 만든다."""
+    payload = orjson.dumps(
+        {
+            "title": _normalize(specific_explanation_request.title),
+            "selections": [
+                [_normalize(s.content), s.correct]
+                for s in specific_explanation_request.selections
+            ],
+        }
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
@@ -2,221 +2,849 @@ import asyncio
 import base64
 import os
 import random
-from copy import deepcopy
-from typing import List, Optional
+import time
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
+from uuid import uuid4
 
-import fitz
-import requests
+import orjson
 from fastapi import HTTPException
-from langchain_core.output_parsers import JsonOutputParser
 
-from app.adapter.request_to_gpt import request_to_gpt_returning_text
-from app.dto.model.problem_set import ProblemSet
-from app.dto.request.generate_request import GenerateRequest
+from app.adapter.call_policy import (
+    request_to_gpt_with_policy,
+    stream_gpt_with_policy,
+)
+from app.adapter.file_uploader import PDF_INPUT_TRANSPORT, uploaded_file_registry
+from app.adapter.gpt_scheduler import gpt_scheduler
+from app.adapter.pdf_downloader import PDF_DOWNLOAD_TIMEOUT
+from app.dto.request.generate_request import (
+    GenerateRequest,
+    InputMode,
+    QuizType,
+)
 from app.dto.response.generate_response import (
     GenerateResponse,
     ProblemResponse,
 )
-from app.prompt import prompt_factory
-from app.util.create_chunks import create_page_chunks
-from app.util.gpt_utils import enforce_additional_properties_false
+from app.prompt.prompt_compiler import CompiledPrompt, get_compiled_prompt
+from app.service.inflight_generation import inflight_generations
+from app.service.model_router import model_router
+from app.util.chunk_planner import plan_lead_chunk, plan_page_chunks
+from app.util.create_chunks import ChunkInfo, create_page_chunks
+from app.util.document_cache import CachedDocument, document_cache
+from app.util.incremental_json import ProblemStreamParser
+from app.util.deadline import DEADLINE_DOWNLOAD_SHARE, DEADLINE_SLICE_SHARE, Deadline
 from app.util.logger import logger
+from app.util.metrics import (
+    chunk_failures,
+    chunk_quizzes,
+    deadline_exceeded,
+    generation_ttfb_seconds,
+    stage_seconds,
+)
+from app.util.page_profile import (
+    PageProfile,
+    estimate_pdf_tokens,
+    estimate_text_tokens,
+    format_pages_as_text,
+    page_weight,
+    prefers_text,
+)
+from app.util.pdf_slicer import PdfSlicer
+from app.util.problem_decoder import decode_problem_response, decode_problem_responses
 from app.util.rate_limiter import rate_limiter
+from app.util.result_cache import build_result_key, build_url_key, result_cache
 from app.util.timing import log_elapsed
+from app.util.usage_accounting import (
+    UsageAccumulator,
+    request_cost_usd,
+    usage_scope,
+)
+
+
+# 청크 분배 방식: weighted(페이지 내용 가중치 기반) | even(페이지 수 균등)
+CHUNK_PLANNER = os.getenv("CHUNK_PLANNER", "weighted")
+# 청크 1개의 GPT 호출(재시도/헤지 포함)에 허용하는 전체 시간
+GPT_CALL_BUDGET_SECONDS = float(
+    os.getenv("GPT_CALL_BUDGET_SECONDS", os.environ["GPT_REQUEST_TIMEOUT"])
+)
+# 결과 전송 단위: chunk(청크 응답 완료 후 한 번에) | problem(업스트림 스트림에서 문제가 완성되는 즉시)
+GENERATION_STREAM_MODE = os.getenv("GENERATION_STREAM_MODE", "chunk")
+# 메모리 사용 방식
+# - standard: 모든 청크의 PDF 조각을 미리 만들어 두고 요청이 끝날 때까지 공유한다(첫 결과가 빠름).
+# - bounded: 청크가 GPT 호출 슬롯을 얻은 뒤에 조각과 페이로드를 만들고 호출이 끝나면 놓는다.
+#   동시에 살아 있는 페이로드 수가 스케줄러 동시성으로 묶여 큰 문서도 메모리가 청크 수에 비례하지 않는다.
+GENERATION_MEMORY_MODE = os.getenv("GENERATION_MEMORY_MODE", "standard")
+# 청크 스케줄링 방식
+# - balanced: 모든 청크를 비슷한 크기로 나눈다.
+# - fast_first: 퀴즈 1개짜리 작은 리드 청크를 가장 빠른 모델로 먼저 보내고(페이지 분석/분배 전),
+#   나머지 퀴즈를 남은 청크들에 다시 나눈다. 첫 퀴즈까지의 시간(TTFB)을 줄이기 위한 모드.
+CHUNK_SCHEDULING_MODE = os.getenv("CHUNK_SCHEDULING_MODE", "balanced")
+# 리드 청크가 참고하는 페이지 수(선택 범위 앞쪽부터)
+FAST_FIRST_LEAD_PAGES = int(os.getenv("FAST_FIRST_LEAD_PAGES", "1"))
 
 
 class GenerateService:
     @staticmethod
-    async def generate(generate_request: GenerateRequest):
-        total_quiz_count = generate_request.quizCount
-        page_numbers = generate_request.pageNumbers
-
-        chunks = create_page_chunks(
-            page_numbers, total_quiz_count, int(os.environ["MAX_CHUNK_COUNT"])
+    async def open_stream(
+        generate_request: GenerateRequest,
+    ) -> Tuple[AsyncIterator[str], str]:
+        """결과 캐시를 확인해 재생 스트림 또는 생성 스트림과 캐시 상태(HIT/MISS/BYPASS)를 돌려준다."""
+        # 마감 시간과 TTFB는 요청을 받은 시점부터 잰다.
+        started = time.perf_counter()
+        deadline = Deadline.for_request(generate_request.deadlineSeconds)
+        if not generate_request.useCache:
+            usage = UsageAccumulator()
+            stream = _observe_ttfb(
+                GenerateService.generate(generate_request, usage, deadline),
+                started,
+                "BYPASS",
+            )
+            return _with_usage_line(generate_request, stream, usage, "BYPASS"), "BYPASS"
+
+        # 같은 URL로 같은 요청이 이미 생성 중이면 문서를 내려받거나 해시하지 않고
+        # 그 작업에 구독자로 붙는다. 합류한 요청은 먼저 시작한 요청의 마감 시간을 따른다.
+        url_key = build_url_key(generate_request)
+        inflight = inflight_generations.get(url_key)
+        if inflight is None:
+            document = await document_cache.resolve(
+                generate_request.uploadedUrl,
+                timeout=deadline.budget(PDF_DOWNLOAD_TIMEOUT, DEADLINE_DOWNLOAD_SHARE),
+            )
+            key = build_result_key(document.content_hash, generate_request)
+            lines = await result_cache.get(key)
+            if lines is not None:
+                # 캐시 재생은 업스트림을 호출하지 않으므로 사용량이 0이다.
+                stream = _observe_ttfb(_replay_lines(lines), started, "HIT")
+                return (
+                    _with_usage_line(
+                        generate_request, stream, UsageAccumulator(), "HIT"
+                    ),
+                    "HIT",
+                )
+            # 다른 URL의 같은 내용이 생성 중일 수도 있으므로 내용 기반 키로 한 번 더 찾는다.
+            inflight = inflight_generations.get(key)
+        if inflight is None:
+            usage = UsageAccumulator()
+            inflight = inflight_generations.start(
+                key,
+                GenerateService.generate_results(generate_request, usage, deadline),
+                usage,
+                aliases=[url_key],
+            )
+        # 요약 줄은 결과 캐시에 저장하지 않도록 _record_lines 바깥에서 붙인다.
+        stream = _record_lines(
+            inflight.key,
+            generate_request.quizCount,
+            _observe_ttfb(number_results(inflight.subscribe()), started, "MISS"),
+        )
+        return (
+            _with_usage_line(generate_request, stream, inflight.usage, "MISS"),
+            "MISS",
         )
-        await rate_limiter.check_rate(len(chunks))
 
-        problem_set_json_schema = enforce_additional_properties_false(
-            deepcopy(ProblemSet.model_json_schema())
+    @staticmethod
+    async def build_chunk_requests(
+        generate_request: GenerateRequest, model: str, max_chunk_count: int
+    ) -> List[Tuple[ChunkInfo, dict]]:
+        """
+        /generation과 같은 방식으로 청크를 나누고 청크별 Responses API 요청 본문을 만든다.
+        호출은 하지 않으므로 배치 작업처럼 요청 본문만 필요한 곳에서 쓴다.
+        요청이 오래 보관되므로 PDF는 Files API 참조 대신 본문에 싣는다.
+        """
+        page_numbers = generate_request.pageNumbers
+        compiled_prompt = get_compiled_prompt(
+            generate_request.quizType, generate_request.difficultyType
         )
+        uploaded_url = generate_request.uploadedUrl
+        document = await document_cache.resolve(uploaded_url)
+        document_cache.pin(document)
+        slicer = PdfSlicer(document.path)
+        pdf_slices: dict[tuple[int, ...], asyncio.Task] = {}
+        # 마감 시간 없이 단계별 기본 제한만 적용한다.
+        deadline = Deadline()
+        try:
+            page_profiles: Dict[int, PageProfile] = {}
+            if (
+                generate_request.inputMode != InputMode.PDF
+                or CHUNK_PLANNER == "weighted"
+            ):
+                page_profiles = await _load_page_profiles(
+                    document, slicer, page_numbers, deadline
+                )
+            chunks = _plan_chunks(
+                page_numbers,
+                page_profiles,
+                generate_request.quizCount,
+                max_chunk_count,
+            )
+            filename = _extract_filename(uploaded_url)
+            gpt_requests = await asyncio.gather(
+                *(
+                    _build_chunk_request(
+                        chunk,
+                        _chunk_content(
+                            document,
+                            slicer,
+                            pdf_slices,
+                            chunk,
+                            _select_profiles(page_profiles, chunk.referenced_pages),
+                            generate_request.inputMode,
+                            filename,
+                            deadline,
+                            transport="inline",
+                        ),
+                        model,
+                        compiled_prompt,
+                    )
+                    for chunk in chunks
+                )
+            )
+            return [
+                (chunk, gpt_request)
+                for chunk, gpt_request in zip(chunks, gpt_requests)
+                if gpt_request is not None
+            ]
+        finally:
+            for task in pdf_slices.values():
+                task.cancel()
+            await slicer.close()
+            document_cache.unpin(document)
+
+    @staticmethod
+    async def generate(
+        generate_request: GenerateRequest,
+        usage: Optional[UsageAccumulator] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AsyncIterator[str]:
+        async for line in number_results(
+            GenerateService.generate_results(generate_request, usage, deadline)
+        ):
+            yield line
+
+    @staticmethod
+    async def generate_results(
+        generate_request: GenerateRequest,
+        usage: Optional[UsageAccumulator] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AsyncIterator[GenerateResponse]:
+        """
+        청크 결과를 완료 순서대로 내보낸다. 문제 번호는 구독자(스트림)마다 따로 매긴다.
+        마감 시간이 지나면 그때까지 나온 결과만 내보내고 남은 청크 작업을 취소한다.
+        """
+        usage = usage or UsageAccumulator()
+        deadline = deadline or Deadline.for_request(generate_request.deadlineSeconds)
+        total_quiz_count = generate_request.quizCount
+        page_numbers = generate_request.pageNumbers
+        max_chunk_count = int(os.environ["MAX_CHUNK_COUNT"])
+
+        # 빠른 첫 퀴즈 모드: 리드 청크 몫(퀴즈 1개, 청크 1개)을 떼고 나머지를 나눈다.
+        # 청크가 1개만 허용되면 리드 청크를 떼어낼 몫이 없으므로 쓰지 않는다.
+        lead_chunk: Optional[ChunkInfo] = None
+        if (
+            CHUNK_SCHEDULING_MODE == "fast_first"
+            and total_quiz_count > 1
+            and max_chunk_count > 1
+        ):
+            lead_chunk = plan_lead_chunk(page_numbers, FAST_FIRST_LEAD_PAGES)
+        rest_quiz_count = total_quiz_count - (1 if lead_chunk else 0)
+        rest_chunk_count = max(max_chunk_count - (1 if lead_chunk else 0), 1)
+
+        chunks = create_page_chunks(page_numbers, rest_quiz_count, rest_chunk_count)
+        chunk_count = len(chunks) + (1 if lead_chunk else 0)
+        await rate_limiter.check_rate(chunk_count)
 
         dok_level = generate_request.difficultyType
         quiz_type = generate_request.quizType
+        compiled_prompt = get_compiled_prompt(quiz_type, dok_level)
         uploaded_url = generate_request.uploadedUrl
-        pdf_chunk_cache: dict[tuple[int, ...], str] = {}
-        pdf_bytes = _load_pdf_content(uploaded_url)
-        for i, chunk in enumerate(chunks):
-            system_message = f"""
-                당신은 대학 강의노트로부터 평가용 퀴즈를 생성하는 AI입니다.
-                주어진 강의노트 내용을 분석하여 학생들의 이해도를 평가할 수 있는 효과적인 퀴즈를 정확히 {chunk.quiz_count}개 생성하세요.
-
-                작성 규칙:
-                - 한국어로 작성
-                - 적극적으로 개행하여 가독성에 신경 쓸 것
-                - 강의 노트를 참조하라는 문제 생성 금지 (예: "강의노트에 따르면", "본문을 참고하면" 등 금지)
-
-                문제 생성 지침(품질/난이도):
-                {prompt_factory.get_quiz_generation_guide(dok_level, quiz_type)}
-
-                문항 형식(유형별 제약):
-                {prompt_factory.get_quiz_format(quiz_type)}
-                            """.strip()
-
-            pages_key = tuple(chunk.referenced_pages)
-            if pages_key not in pdf_chunk_cache:
-                pdf_chunk_cache[pages_key] = _extract_pdf_pages_base64(
-                    pdf_bytes, chunk.referenced_pages
+        document = await document_cache.resolve(
+            uploaded_url,
+            timeout=deadline.budget(PDF_DOWNLOAD_TIMEOUT, DEADLINE_DOWNLOAD_SHARE),
+        )
+        document_cache.pin(document)
+        slicer = PdfSlicer(document.path)
+        pdf_slices: dict[tuple[int, ...], asyncio.Task] = {}
+        tasks: List[asyncio.Task] = []
+        # 청크 작업이 결과를 넣고, 끝나면 None을 넣는다.
+        results: asyncio.Queue[Optional[GenerateResponse]] = asyncio.Queue()
+        # 스케줄러에서 이 요청의 청크들을 하나의 흐름으로 묶어 다른 요청과 공정하게 나눈다.
+        flow = uuid4().hex
+
+        try:
+            filename = _extract_filename(uploaded_url)
+            if lead_chunk is not None:
+                # 페이지 분석과 나머지 청크 준비를 기다리지 않고 바로 보낸다.
+                # 프로파일이 아직 없으므로 입력은 항상 PDF 조각이다.
+                lead_content = _chunk_content(
+                    document,
+                    slicer,
+                    pdf_slices,
+                    lead_chunk,
+                    [],
+                    generate_request.inputMode,
+                    filename,
+                    deadline,
                 )
-            pdf_chunk_base64 = pdf_chunk_cache[pages_key]
-            if i < max(len(chunks) * 0.2, 3):
-                model = "gpt-4.1-mini"
-            else:
-                model = "gpt-5-mini"
-            chunk.gpt_content = {
-                "model": model,
-                "max_output_tokens": 10000,
-                "text": {
-                    "format": {
-                        "type": "json_schema",
-                        "name": "problem_set",
-                        "strict": True,
-                        "schema": problem_set_json_schema,
-                    }
-                },
-                "input": [
-                    {"role": "system", "content": system_message},
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": f"# 강의노트(PDF)",
-                            },
-                            {
-                                "type": "input_file",
-                                "filename": _extract_filename(uploaded_url),
-                                "file_data": f"data:application/pdf;base64,{pdf_chunk_base64}",
-                            },
-                        ],
-                    },
-                ],
-            }
-
-        tasks = []
-        for chunk in chunks:
-            tasks.append(
-                asyncio.create_task(
-                    process_single_chunk(
-                        chunk.gpt_content,
-                        JsonOutputParser(pydantic_object=ProblemSet),
-                        chunk.referenced_pages,
-                        quiz_type,
+                tasks.append(
+                    asyncio.create_task(
+                        _pump_results(
+                            _prepare_and_process_chunk(
+                                lead_chunk,
+                                lead_content,
+                                model_router.lead_model(),
+                                compiled_prompt,
+                                quiz_type,
+                                flow,
+                                usage,
+                                deadline,
+                                True,
+                            ),
+                            results,
+                        )
                     )
                 )
+
+            page_profiles: Dict[int, PageProfile] = {}
+            if (
+                generate_request.inputMode != InputMode.PDF
+                or CHUNK_PLANNER == "weighted"
+            ):
+                page_profiles = await _load_page_profiles(
+                    document, slicer, page_numbers, deadline
+                )
+            chunks = _plan_chunks(
+                page_numbers, page_profiles, rest_quiz_count, rest_chunk_count
             )
 
-        # 스트리밍 응답 처리
-        number = 1
-        try:
-            for completed_task in asyncio.as_completed(tasks):
-                try:
-                    result: Optional[GenerateResponse] = await completed_task
+            routing = model_router.plan(len(chunks))
+
+            # 같은 페이지 조합은 한 번만 만들고, 캐시에 있으면 PyMuPDF 작업을 건너뛴다.
+            for i, (chunk, model) in enumerate(zip(chunks, routing.models)):
+                lecture_content = _chunk_content(
+                    document,
+                    slicer,
+                    pdf_slices,
+                    chunk,
+                    _select_profiles(page_profiles, chunk.referenced_pages),
+                    generate_request.inputMode,
+                    filename,
+                    deadline,
+                )
 
-                    if result:
-                        for quiz in result.quiz:
-                            quiz.number = number
-                            number += 1
-                        yield result.model_dump_json() + "\n"
+                # 분할 작업은 모두 먼저 제출하고, 각 청크는 자기 조각이 준비되는 즉시 GPT 호출을 시작한다.
+                tasks.append(
+                    asyncio.create_task(
+                        _pump_results(
+                            _prepare_and_process_chunk(
+                                chunk,
+                                lecture_content,
+                                model,
+                                compiled_prompt,
+                                quiz_type,
+                                flow,
+                                usage,
+                                deadline,
+                                # 첫 청크는 우선 실행해 모든 사용자가 첫 퀴즈를 빨리 받게 한다.
+                                # 리드 청크가 있으면 그 청크가 이 역할을 맡는다.
+                                i == 0 and lead_chunk is None,
+                            ),
+                            results,
+                        )
+                    )
+                )
 
-                except Exception as e:
-                    logger.error(f"Task processing failed: {e}")
-                    # 하나가 실패해도 전체 스트림을 끊지 않고 다음 퀴즈 생성을 기다림
+            # 스트리밍 응답 처리: 청크(또는 문제)가 완성되는 순서대로 내보낸다.
+            remaining = len(tasks)
+            while remaining:
+                try:
+                    result = await asyncio.wait_for(results.get(), deadline.remaining())
+                except TimeoutError:
+                    deadline_exceeded.inc(stage="generation")
+                    logger.warning(
+                        f"요청 마감 시간({deadline.seconds}초) 초과, "
+                        f"남은 청크 작업 {remaining}개를 취소합니다"
+                    )
+                    break
+                if result is None:
+                    remaining -= 1
                     continue
+                yield result
 
         except Exception as e:
             logger.error(f"Critical streaming error: {e}")
             # 여기서 에러를 던지면 클라이언트(Spring)는 연결이 끊긴 것으로 인식
             raise HTTPException(status_code=500, detail="Streaming process failed")
+        finally:
+            # 구독자가 모두 끊겨 중단된 경우에도 남은 청크 작업이 새지 않게 정리한다.
+            for task in [*tasks, *pdf_slices.values()]:
+                task.cancel()
+            await slicer.close()
+            document_cache.unpin(document)
+            usage.log(
+                "generation",
+                flow=flow,
+                quizType=quiz_type.value,
+                quizCount=total_quiz_count,
+                pages=len(page_numbers),
+                chunks=len(chunks) + (1 if lead_chunk else 0),
+                scheduling=CHUNK_SCHEDULING_MODE,
+            )
+            request_cost_usd.observe(usage.cost_usd, endpoint="generation")
+
+
+async def number_results(
+    results: AsyncIterator[GenerateResponse],
+) -> AsyncIterator[str]:
+    """청크 결과에 1부터 이어지는 문제 번호를 매겨 NDJSON 줄로 만든다."""
+    number = 1
+    async for result in results:
+        result = result.model_copy(deep=True)
+        for quiz in result.quiz:
+            quiz.number = number
+            number += 1
+        yield result.model_dump_json() + "\n"
+
+
+async def _observe_ttfb(
+    stream: AsyncIterator[str], started: float, cache_status: str
+) -> AsyncIterator[str]:
+    """요청을 받은 뒤 첫 줄을 내보내기까지의 시간(TTFB)을 기록한다."""
+    first = True
+    async for line in stream:
+        if first:
+            first = False
+            ttfb = time.perf_counter() - started
+            generation_ttfb_seconds.observe(
+                ttfb, cache=cache_status, scheduling=CHUNK_SCHEDULING_MODE
+            )
+            logger.info(
+                f"첫 퀴즈까지 {ttfb:.4f}초 "
+                f"(cache={cache_status}, scheduling={CHUNK_SCHEDULING_MODE})"
+            )
+        yield line
+
+
+async def _replay_lines(lines: List[str]) -> AsyncIterator[str]:
+    for line in lines:
+        yield line
+
+
+def _with_usage_line(
+    generate_request: GenerateRequest,
+    stream: AsyncIterator[str],
+    usage: UsageAccumulator,
+    cache_status: str,
+) -> AsyncIterator[str]:
+    if not generate_request.includeUsage:
+        return stream
+    return _append_usage_line(stream, usage, cache_status)
+
+
+async def _append_usage_line(
+    stream: AsyncIterator[str], usage: UsageAccumulator, cache_status: str
+) -> AsyncIterator[str]:
+    # 스트림이 끝까지 소비된 뒤에만 붙인다. 합류한 요청(MISS)은 공유 작업의 전체 사용량을 받는다.
+    async for line in stream:
+        yield line
+    summary = {"cacheStatus": cache_status, **usage.summary()}
+    yield orjson.dumps({"usage": summary}).decode() + "\n"
+
+
+async def _record_lines(
+    key: str, quiz_count: int, stream: AsyncIterator[str]
+) -> AsyncIterator[str]:
+    # 스트림이 끝까지 소비되고 요청한 퀴즈 수를 모두 채운 결과만 저장한다.
+    lines = []
+    emitted_quiz_count = 0
+    async for line in stream:
+        lines.append(line)
+        emitted_quiz_count += len(orjson.loads(line)["quiz"])
+        yield line
+    if lines and emitted_quiz_count >= quiz_count:
+        await result_cache.set(key, lines)
+
+
+async def _load_pdf_slice(
+    document: CachedDocument, slicer: PdfSlicer, pages: tuple[int, ...]
+) -> bytes:
+    cached = await document_cache.get_slice(document, pages)
+    if cached is not None:
+        return cached
+    # 진행 중인 분할 작업은 여러 청크가 함께 기다릴 수 있으므로 취소가 전파되지 않게 한다.
+    content = await asyncio.shield(slicer.slice(pages))
+    await document_cache.put_slice(document, pages, content)
+    return content
+
+
+async def _load_page_profiles(
+    document: CachedDocument,
+    slicer: PdfSlicer,
+    page_numbers: List[int],
+    deadline: Deadline,
+) -> Dict[int, PageProfile]:
+    """요청한 페이지 중 캐시에 없는 페이지만 분석하고, 분석 결과는 문서의 프로파일 캐시에 합친다."""
+    profiles = await document_cache.get_page_profiles(document)
+    missing = sorted(set(page_numbers) - profiles.keys())
+    if not missing:
+        return profiles
+    with log_elapsed(logger, "profile_pdf_pages"):
+        try:
+            async with asyncio.timeout(deadline.budget(None, DEADLINE_SLICE_SHARE)):
+                profiled = await slicer.profile_pages(missing)
+        except TimeoutError:
+            # 프로파일 없이도 페이지 수 균등 분배와 PDF 입력으로 계속 진행할 수 있다.
+            deadline_exceeded.inc(stage="profile")
+            logger.warning("페이지 분석이 마감 시간 몫을 넘어 균등 분배로 진행합니다")
+            return {}
+    if profiled:
+        profiles.update((profile.page_number, profile) for profile in profiled)
+        await document_cache.put_page_profiles(document, profiles)
+    return profiles
+
+
+def _select_profiles(
+    page_profiles: Dict[int, PageProfile], pages: List[int]
+) -> List[PageProfile]:
+    return [page_profiles[page] for page in pages if page in page_profiles]
+
+
+def _page_weights(
+    page_profiles: Dict[int, PageProfile], pages: List[int]
+) -> List[float]:
+    return [
+        page_weight(page_profiles[page]) if page in page_profiles else 0.0
+        for page in pages
+    ]
+
+
+def _plan_chunks(
+    page_numbers: List[int],
+    page_profiles: Dict[int, PageProfile],
+    quiz_count: int,
+    max_chunk_count: int,
+) -> List[ChunkInfo]:
+    if CHUNK_PLANNER == "weighted" and page_profiles:
+        return plan_page_chunks(
+            page_numbers,
+            _page_weights(page_profiles, page_numbers),
+            quiz_count,
+            max_chunk_count,
+        )
+    return create_page_chunks(page_numbers, quiz_count, max_chunk_count)
+
+
+def _chunk_content(
+    document: CachedDocument,
+    slicer: PdfSlicer,
+    pdf_slices: dict[tuple[int, ...], asyncio.Task],
+    chunk: ChunkInfo,
+    chunk_profiles: List[PageProfile],
+    input_mode: InputMode,
+    filename: str,
+    deadline: Deadline,
+    transport: str = PDF_INPUT_TRANSPORT,
+) -> Callable[[], Awaitable[List[dict]]]:
+    """청크의 강의 입력(텍스트 또는 PDF 조각)을 만드는 함수를 돌려준다."""
+    if _use_text_input(input_mode, chunk_profiles):
+        return partial(_build_text_content, chunk_profiles)
+
+    pages_key = tuple(chunk.referenced_pages)
+    if GENERATION_MEMORY_MODE == "bounded":
+        # 요청 전체에 걸쳐 조각을 들고 있지 않도록 청크가 입력을 만들 때 불러온다.
+        load_slice = partial(_load_pdf_slice, document, slicer, pages_key)
+    else:
+        if pages_key not in pdf_slices:
+            pdf_slices[pages_key] = asyncio.create_task(
+                _load_pdf_slice(document, slicer, pages_key)
+            )
+        # 같은 페이지 조합을 공유하는 다른 청크가 있으므로 취소가 전파되지 않게 한다.
+        load_slice = partial(asyncio.shield, pdf_slices[pages_key])
+    return partial(
+        _build_pdf_content,
+        document,
+        chunk.referenced_pages,
+        load_slice,
+        filename,
+        deadline,
+        transport,
+    )
+
+
+def _use_text_input(input_mode: InputMode, chunk_profiles: List[PageProfile]) -> bool:
+    if input_mode == InputMode.TEXT:
+        return bool(chunk_profiles)
+    if input_mode == InputMode.AUTO:
+        return prefers_text(chunk_profiles)
+    return False
+
+
+async def _build_text_content(chunk_profiles: List[PageProfile]) -> List[dict]:
+    logger.info(
+        f"청크 입력 모드: TEXT (pages={[p.page_number for p in chunk_profiles]}, "
+        f"text_tokens={estimate_text_tokens(chunk_profiles)}, "
+        f"pdf_tokens_estimate={estimate_pdf_tokens(chunk_profiles)})"
+    )
+    return [
+        {"type": "input_text", "text": "# 강의노트(텍스트)"},
+        {"type": "input_text", "text": format_pages_as_text(chunk_profiles)},
+    ]
+
+
+async def _build_pdf_content(
+    document: CachedDocument,
+    pages: List[int],
+    load_slice: Callable[[], Awaitable[bytes]],
+    filename: str,
+    deadline: Deadline,
+    transport: str = PDF_INPUT_TRANSPORT,
+) -> List[dict]:
+    with log_elapsed(logger, "slice_pdf_pages"):
+        try:
+            async with asyncio.timeout(deadline.budget(None, DEADLINE_SLICE_SHARE)):
+                pdf_chunk_bytes = await load_slice()
+        except TimeoutError:
+            deadline_exceeded.inc(stage="slice")
+            raise
+    pdf_input = await _build_pdf_input(
+        document, pages, filename, pdf_chunk_bytes, transport
+    )
+    return [
+        {"type": "input_text", "text": f"# 강의노트(PDF)"},
+        pdf_input,
+    ]
+
+
+async def _pump_results(
+    chunk_results: AsyncIterator[GenerateResponse],
+    results: "asyncio.Queue[Optional[GenerateResponse]]",
+) -> None:
+    try:
+        async for result in chunk_results:
+            results.put_nowait(result)
+    except Exception as e:
+        logger.error(f"Task processing failed: {e}")
+        # 하나가 실패해도 전체 스트림을 끊지 않고 다음 퀴즈 생성을 기다림
+    finally:
+        results.put_nowait(None)
+
+
+async def _prepare_and_process_chunk(
+    chunk: ChunkInfo,
+    lecture_content: Callable[[], Awaitable[List[dict]]],
+    model: str,
+    compiled_prompt: CompiledPrompt,
+    quiz_type: QuizType,
+    flow: str,
+    request_usage: UsageAccumulator,
+    deadline: Deadline,
+    priority: bool,
+) -> AsyncIterator[GenerateResponse]:
+    # 청크 작업은 자기 태스크(_pump_results)에서 돌므로 사용량 범위가 다른 청크와 섞이지 않는다.
+    chunk_usage = UsageAccumulator(parent=request_usage)
+    build_request = partial(
+        _build_chunk_request, chunk, lecture_content, model, compiled_prompt
+    )
+    try:
+        with usage_scope(chunk_usage):
+            if GENERATION_MEMORY_MODE == "bounded":
+                async with gpt_scheduler.slot(flow, priority=priority):
+                    gpt_request = await build_request()
+                    if gpt_request is not None:
+                        async for result in _run_chunk(
+                            gpt_request, chunk, model, quiz_type, deadline
+                        ):
+                            yield result
+            else:
+                gpt_request = await build_request()
+                if gpt_request is not None:
+                    async with gpt_scheduler.slot(flow, priority=priority):
+                        async for result in _run_chunk(
+                            gpt_request, chunk, model, quiz_type, deadline
+                        ):
+                            yield result
+    finally:
+        chunk_usage.log(
+            "chunk",
+            flow=flow,
+            model=model,
+            pages=chunk.referenced_pages,
+            quizCount=chunk.quiz_count,
+        )
+
+
+async def _build_chunk_request(
+    chunk: ChunkInfo,
+    lecture_content: Callable[[], Awaitable[List[dict]]],
+    model: str,
+    compiled_prompt: CompiledPrompt,
+) -> Optional[dict]:
+    try:
+        user_content = await lecture_content()
+    except Exception as e:
+        logger.error(f"Lecture input preparation error: {e}")
+        chunk_failures.inc(reason="input")
+        chunk_quizzes.observe(0)
+        return None
+    return compiled_prompt.build_request(model, chunk.quiz_count, user_content)
+
+
+async def _run_chunk(
+    gpt_request: dict,
+    chunk: ChunkInfo,
+    model: str,
+    quiz_type: QuizType,
+    deadline: Deadline,
+) -> AsyncIterator[GenerateResponse]:
+    # 모델 라우터가 참고하도록 업스트림 호출부터 첫 결과/완료까지의 시간을 기록한다.
+    started = time.perf_counter()
+    first_result_seconds: Optional[float] = None
+    quiz_count = 0
+    # 스케줄러 대기를 마친 지금 남은 시간을 이 호출(재시도 포함)에 준다.
+    budget = deadline.budget(GPT_CALL_BUDGET_SECONDS)
+    async for result in _process_chunk(gpt_request, chunk, quiz_type, budget):
+        if first_result_seconds is None:
+            first_result_seconds = time.perf_counter() - started
+        quiz_count += len(result.quiz)
+        yield result
+    chunk_quizzes.observe(quiz_count)
+    model_router.observe(
+        model,
+        first_result_seconds,
+        time.perf_counter() - started,
+        ok=first_result_seconds is not None,
+    )
+
+
+async def _process_chunk(
+    gpt_request: dict, chunk: ChunkInfo, quiz_type: QuizType, budget: float
+) -> AsyncIterator[GenerateResponse]:
+    if GENERATION_STREAM_MODE == "problem":
+        async for result in stream_single_chunk(
+            gpt_request, chunk.referenced_pages, quiz_type, budget
+        ):
+            yield result
+        return
+
+    result = await process_single_chunk(
+        gpt_request, chunk.referenced_pages, quiz_type, budget
+    )
+    if result:
+        yield result
 
 
 async def process_single_chunk(
     gpt_request: dict,
-    parser: JsonOutputParser,
     referenced_pages: List[int],
     quiz_type: str,
+    budget: float = GPT_CALL_BUDGET_SECONDS,
 ) -> Optional[GenerateResponse]:
     with log_elapsed(logger, "request_generate_quiz"):
+        # 실패 원인을 메트릭 라벨로 남기기 위해 현재 단계를 기록한다.
+        stage = "upstream"
         try:
-            text_response = await request_to_gpt_returning_text(
-                gpt_request, os.environ["GPT_REQUEST_TIMEOUT"]
-            )
+            text_response = await request_to_gpt_with_policy(gpt_request, budget)
 
             if not text_response:
+                chunk_failures.inc(reason="empty")
                 return None
 
-            # 파싱
-            generated_data = parser.parse(text_response)
-
-            # 구조 검증 및 변환
-            quiz_list = generated_data.get("quiz", [])
-            if not quiz_list:
+            # 파싱 및 구조 검증 (응답 DTO로 바로 매핑)
+            stage = "parse"
+            with stage_seconds.time(stage="parse_problem_set"):
+                problem_responses = decode_problem_responses(
+                    text_response, referenced_pages
+                )
+            if not problem_responses:
+                chunk_failures.inc(reason="empty")
                 return None
 
-            if not isinstance(quiz_list, list) or len(quiz_list) == 0:
+            if len(problem_responses[0].selections) > 4:
+                chunk_failures.inc(reason="invalid")
                 return None
 
-            if len(quiz_list) > 0:
-                first_selections = quiz_list[0].get("selections")
-                if isinstance(first_selections, list) and len(first_selections) > 4:
-                    return None
-
-            # 문제 변환 (DTO 매핑)
-            problem_responses = []
-            for q in quiz_list:
-                # 선택지 셔플 등 로직 수행
-                selections = q.get("selections", [])
-                if quiz_type in ["MULTIPLE", "BLANK"] and selections:
-                    random.shuffle(selections)
-
-                problem_responses.append(
-                    ProblemResponse(
-                        number=0,
-                        title=q.get("title"),
-                        selections=selections,
-                        explanation=q.get("explanation"),
-                        referencedPages=referenced_pages,
-                    )
-                )
+            for problem in problem_responses:
+                shuffle_selections(problem, quiz_type)
 
             # 1~2개의 문제가 담긴 부분 응답 객체 반환
             return GenerateResponse(quiz=problem_responses)
 
         except Exception as e:
             logger.error(f"Chunk processing error: {e}")
+            chunk_failures.inc(reason=stage)
             return None
 
 
+async def stream_single_chunk(
+    gpt_request: dict,
+    referenced_pages: List[int],
+    quiz_type: str,
+    budget: float = GPT_CALL_BUDGET_SECONDS,
+) -> AsyncIterator[GenerateResponse]:
+    """업스트림 토큰 스트림을 파싱해 문제가 하나 완성될 때마다 문제 1개짜리 응답을 내보낸다."""
+    parser = ProblemStreamParser()
+    emitted = 0
+    with log_elapsed(logger, "stream_generate_quiz"):
+        try:
+            async for delta in stream_gpt_with_policy(gpt_request, budget):
+                for item in parser.feed(delta):
+                    try:
+                        problem = decode_problem_response(item, referenced_pages)
+                    except ValueError as e:
+                        logger.warning(f"형식이 맞지 않는 문제를 건너뜁니다: {e}")
+                        continue
+                    # 청크 단위 검증(첫 문제 선택지 4개 초과 시 폐기)을 문제 단위로 적용한다.
+                    if len(problem.selections) > 4:
+                        logger.warning("선택지가 4개를 넘는 문제를 건너뜁니다")
+                        continue
+                    shuffle_selections(problem, quiz_type)
+                    emitted += 1
+                    yield GenerateResponse(quiz=[problem])
+        except Exception as e:
+            logger.error(f"Chunk streaming error (emitted={emitted}): {e!r}")
+            if not emitted:
+                chunk_failures.inc(reason="upstream")
+            return
+        if not emitted:
+            chunk_failures.inc(reason="empty")
+
+
+def shuffle_selections(problem: ProblemResponse, quiz_type: str) -> None:
+    # 선택지 셔플 등 로직 수행
+    if quiz_type in ["MULTIPLE", "BLANK"] and problem.selections:
+        random.shuffle(problem.selections)
+
+
 def _extract_filename(uploaded_url: str) -> str:
     parsed = urlparse(uploaded_url)
     filename = os.path.basename(parsed.path)
     return filename or "document.pdf"
 
 
-def _load_pdf_content(uploaded_url: str) -> bytes:
-    response = requests.get(uploaded_url)
-    response.raise_for_status()
-    return response.content
+async def _build_pdf_input(
+    document: CachedDocument,
+    pages: List[int],
+    filename: str,
+    pdf_bytes: bytes,
+    transport: str = PDF_INPUT_TRANSPORT,
+) -> dict:
+    if transport == "file_id":
+        # 겹치는 페이지 조합은 한 번만 업로드하고 요청 간에도 file_id를 재사용한다.
+        file_id = await uploaded_file_registry.get_or_upload(
+            f"{document.content_hash}:{','.join(map(str, pages))}",
+            filename,
+            pdf_bytes,
+        )
+        return {"type": "input_file", "file_id": file_id}
+
+    pdf_base64 = await asyncio.to_thread(_encode_base64, pdf_bytes)
+    return {
+        "type": "input_file",
+        "filename": filename,
+        "file_data": f"data:application/pdf;base64,{pdf_base64}",
+    }
 
 
-def _extract_pdf_pages_base64(file_content: bytes, pages: List[int]) -> str:
-    source = fitz.open(stream=file_content, filetype="pdf")
-    target = fitz.open()
-    for page_number in pages:
-        page_index = page_number - 1
-        if 0 <= page_index < len(source):
-            target.insert_pdf(source, from_page=page_index, to_page=page_index)
-    pdf_bytes = target.tobytes()
-    target.close()
-    source.close()
-    return base64.b64encode(pdf_bytes).decode("ascii")
+def _encode_base64(content: bytes) -> str:
+    return base64.b64encode(content).decode("ascii")
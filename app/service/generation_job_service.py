@@ -0,0 +1,153 @@
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Dict
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+from app.dto.request.generate_request import GenerateRequest
+from app.dto.response.generation_job_response import GenerationJobResponse
+from app.service.generate_service import GenerateService, number_results
+from app.util.generation_job_store import GenerationJob, generation_job_store
+from app.util.logger import logger
+from app.util.usage_accounting import UsageAccumulator
+
+# 다른 워커/레플리카에서 돌고 있는 작업은 알림을 받을 수 없으므로 이 간격으로 저장소를 다시 읽는다.
+GENERATION_JOB_POLL_SECONDS = float(os.getenv("GENERATION_JOB_POLL_SECONDS", "0.5"))
+# running 상태인데 이 시간 동안 새 결과가 없으면 작업 프로세스가 죽은 것으로 보고 스트림을 닫는다.
+GENERATION_JOB_STALL_SECONDS = float(os.getenv("GENERATION_JOB_STALL_SECONDS", "300"))
+
+# 이 프로세스에서 돌고 있는 작업. 참조를 들고 있어야 태스크가 GC되지 않는다.
+_running_jobs: Dict[str, asyncio.Task] = {}
+# 같은 프로세스의 구독자를 새 결과가 저장되는 즉시 깨운다.
+_progress_events: Dict[str, asyncio.Event] = {}
+
+
+class GenerationJobService:
+    """
+    /generation의 작업형 변형. 생성은 클라이언트 연결과 무관한 백그라운드 작업으로 돌고,
+    청크 결과 줄(문제 번호까지 매긴 NDJSON)은 완료되는 대로 저장소에 쌓인다.
+    스트림이 끊기면 받은 줄 수를 offset으로 주고 다시 구독하면 저장된 줄은 바로 재생되고
+    남은 청크만 기다린다.
+    """
+
+    @staticmethod
+    async def create_job(generate_request: GenerateRequest) -> GenerationJobResponse:
+        now = time.time()
+        job = GenerationJob(
+            job_id=uuid4().hex,
+            status="running",
+            quiz_count=generate_request.quizCount,
+            created_at=now,
+            updated_at=now,
+        )
+        await generation_job_store.create(job)
+        task = asyncio.create_task(_run_job(job.job_id, generate_request))
+        _running_jobs[job.job_id] = task
+        task.add_done_callback(lambda _: _running_jobs.pop(job.job_id, None))
+        logger.info(f"생성 작업 시작: {job.job_id}")
+        return _to_response(job)
+
+    @staticmethod
+    async def get_job(job_id: str) -> GenerationJobResponse:
+        return _to_response(await _get_job(job_id))
+
+    @staticmethod
+    async def open_stream(job_id: str, offset: int) -> AsyncIterator[str]:
+        """없는 작업은 스트림을 열기 전에 404로 돌려준다."""
+        await _get_job(job_id)
+        return _follow(job_id, offset)
+
+
+async def _run_job(job_id: str, generate_request: GenerateRequest) -> None:
+    status, error = "completed", None
+    try:
+        async for line in number_results(
+            GenerateService.generate_results(generate_request, UsageAccumulator())
+        ):
+            await generation_job_store.append(job_id, line)
+            _notify(job_id)
+    except asyncio.CancelledError:
+        status, error = "failed", "interrupted"
+        raise
+    except HTTPException as e:
+        status, error = "failed", str(e.detail)
+    except Exception as e:
+        logger.error(f"생성 작업 실패: {job_id} ({e})")
+        status, error = "failed", str(e)
+    finally:
+        try:
+            await generation_job_store.finish(job_id, status, error)
+        finally:
+            # 기다리는 구독자를 깨우고 이벤트를 지운다(_notify가 꺼내서 set한다).
+            _notify(job_id)
+        logger.info(f"생성 작업 종료: {job_id} ({status})")
+
+
+async def _follow(job_id: str, offset: int) -> AsyncIterator[str]:
+    try:
+        while True:
+            # 읽기 전에 이벤트를 잡아 두어야 읽은 직후 들어온 알림을 놓치지 않는다.
+            event = _progress_events.setdefault(job_id, asyncio.Event())
+            lines = await generation_job_store.read_lines(job_id, offset)
+            for line in lines:
+                yield line
+            offset += len(lines)
+
+            job = await generation_job_store.get(job_id)
+            if job is None:
+                return
+            if job.status != "running":
+                # 마지막 결과를 저장한 뒤에 상태를 바꾸므로 한 번 더 읽으면 빠짐없이 받는다.
+                for line in await generation_job_store.read_lines(job_id, offset):
+                    yield line
+                _progress_events.pop(job_id, None)
+                return
+            if _stalled(job):
+                logger.warning(
+                    f"생성 작업 진행 기록이 없어 스트림을 닫습니다: {job_id}"
+                )
+                return
+            if lines:
+                continue
+            try:
+                await asyncio.wait_for(event.wait(), GENERATION_JOB_POLL_SECONDS)
+            except TimeoutError:
+                pass
+    finally:
+        # 이 프로세스에서 돌지 않는 작업(끝났거나 다른 워커의 작업)은 알림을 보낼 곳이 없으므로
+        # 구독이 끝나면 이벤트를 지운다. 도는 작업의 이벤트는 _run_job이 끝날 때 지운다.
+        if job_id not in _running_jobs:
+            _progress_events.pop(job_id, None)
+
+
+def _notify(job_id: str) -> None:
+    event = _progress_events.pop(job_id, None)
+    if event is not None:
+        event.set()
+
+
+async def _get_job(job_id: str) -> GenerationJob:
+    job = await generation_job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="생성 작업을 찾을 수 없습니다")
+    return job
+
+
+def _stalled(job: GenerationJob) -> bool:
+    return (
+        job.status == "running"
+        and job.job_id not in _running_jobs
+        and time.time() - job.updated_at > GENERATION_JOB_STALL_SECONDS
+    )
+
+
+def _to_response(job: GenerationJob) -> GenerationJobResponse:
+    return GenerationJobResponse(
+        jobId=job.job_id,
+        status="stalled" if _stalled(job) else job.status,
+        quizCount=job.quiz_count,
+        completedChunks=job.line_count,
+        error=job.error,
+    )
@@ -0,0 +1,142 @@
+import asyncio
+import weakref
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from app.dto.response.generate_response import GenerateResponse
+from app.util.logger import logger
+from app.util.usage_accounting import UsageAccumulator
+
+
+class GenerationCancelledError(Exception):
+    """구독자가 모두 떠나 공유 생성 작업이 취소된 경우. 그 뒤에 남은 구독자는 이 오류로 끝난다."""
+
+
+class InflightGeneration:
+    """
+    하나의 생성 작업(청크 팬아웃)을 여러 구독자가 공유한다.
+    늦게 붙은 구독자는 이미 나온 결과부터 받은 뒤 이어서 새 결과를 받는다.
+    구독자가 모두 떠나면 생성 작업을 취소한다.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        results: AsyncIterator[GenerateResponse],
+        usage: Optional[UsageAccumulator] = None,
+    ):
+        self.key = key
+        # 구독자 모두가 같은 생성 작업의 토큰 사용량을 공유한다.
+        self.usage = usage or UsageAccumulator()
+        self.results: List[GenerateResponse] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._changed = asyncio.Condition()
+        self.task = asyncio.create_task(self._run(results))
+
+    async def _run(self, results: AsyncIterator[GenerateResponse]) -> None:
+        try:
+            async for result in results:
+                async with self._changed:
+                    self.results.append(result)
+                    self._changed.notify_all()
+        except asyncio.CancelledError:
+            # 취소 직전에 합류한 구독자가 일부 결과만 받고 정상 종료로 오해하지 않게 한다.
+            self.error = GenerationCancelledError(self.key)
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            await asyncio.shield(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    def subscribe(self) -> AsyncIterator[GenerateResponse]:
+        """
+        구독자로 바로 센 뒤 결과 스트림을 돌려준다.
+        스트림을 처음 읽을 때 세면 그 사이에 다른 구독자가 떠나며 작업을 취소할 수 있다.
+        한 번도 읽지 않고 버린 스트림도 GC될 때 구독을 놓는다.
+        """
+        self.subscribers += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.task.done():
+                logger.info(f"구독자가 모두 끊겨 생성 작업을 취소합니다: {self.key}")
+                self.task.cancel()
+
+        stream = self._follow(release)
+        weakref.finalize(stream, release)
+        return stream
+
+    async def _follow(
+        self, release: Callable[[], None]
+    ) -> AsyncIterator[GenerateResponse]:
+        index = 0
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(
+                        lambda: index < len(self.results) or self.done
+                    )
+                    pending = self.results[index:]
+                    index += len(pending)
+                    finished = self.done and index >= len(self.results)
+
+                for result in pending:
+                    yield result
+
+                if finished:
+                    if self.error is not None:
+                        raise self.error
+                    return
+        finally:
+            release()
+
+
+class InflightGenerations:
+    """진행 중인 생성 작업을 요청 키(와 별칭 키)로 찾는 레지스트리"""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._generations: Dict[str, InflightGeneration] = {}
+
+    def get(self, key: str) -> Optional[InflightGeneration]:
+        generation = self._generations.get(key)
+        # 취소가 예약된(구독자가 모두 떠난) 작업에는 합류하지 않는다.
+        if generation is None or generation.task.done() or generation.task.cancelling():
+            return None
+        self.coalesced += 1
+        return generation
+
+    def start(
+        self,
+        key: str,
+        results: AsyncIterator[GenerateResponse],
+        usage: Optional[UsageAccumulator] = None,
+        aliases: Sequence[str] = (),
+    ) -> InflightGeneration:
+        """aliases로도 같은 작업을 찾을 수 있게 등록한다(예: 문서를 내려받기 전의 URL 기반 키)."""
+        generation = InflightGeneration(key, results, usage)
+        keys = [key, *aliases]
+        for k in keys:
+            self._generations[k] = generation
+        generation.task.add_done_callback(lambda _: self._remove(keys, generation))
+        return generation
+
+    def _remove(self, keys: List[str], generation: InflightGeneration) -> None:
+        for key in keys:
+            if self._generations.get(key) is generation:
+                del self._generations[key]
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+inflight_generations = InflightGenerations()
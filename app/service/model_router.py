@@ -0,0 +1,225 @@
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.util.logger import logger
+
+# 라우팅 정책: static(앞쪽 청크는 빠른 모델, 나머지는 품질 모델) | adaptive(모델별 지연/실패 통계 기반)
+MODEL_ROUTER_POLICY = os.getenv("MODEL_ROUTER_POLICY", "static")
+MODEL_ROUTER_FAST_MODEL = os.getenv("MODEL_ROUTER_FAST_MODEL", "gpt-4.1-mini")
+MODEL_ROUTER_QUALITY_MODEL = os.getenv("MODEL_ROUTER_QUALITY_MODEL", "gpt-5-mini")
+# adaptive 정책의 후보 모델. 앞에 있을수록 우선한다(품질 순).
+MODEL_ROUTER_CANDIDATES = [
+    model.strip()
+    for model in os.getenv(
+        "MODEL_ROUTER_CANDIDATES",
+        f"{MODEL_ROUTER_QUALITY_MODEL},{MODEL_ROUTER_FAST_MODEL}",
+    ).split(",")
+    if model.strip()
+]
+# 첫 결과까지의 시간(TTFR) 목표와 청크 1개 완료 시간 목표
+MODEL_ROUTER_TTFR_SLO_SECONDS = float(os.getenv("MODEL_ROUTER_TTFR_SLO_SECONDS", "15"))
+MODEL_ROUTER_COMPLETION_SLO_SECONDS = float(
+    os.getenv("MODEL_ROUTER_COMPLETION_SLO_SECONDS", "60")
+)
+MODEL_ROUTER_EWMA_ALPHA = float(os.getenv("MODEL_ROUTER_EWMA_ALPHA", "0.2"))
+MODEL_ROUTER_MIN_SAMPLES = int(os.getenv("MODEL_ROUTER_MIN_SAMPLES", "5"))
+# 통계가 낡지 않도록 일정 비율은 SLO와 무관하게 다른 후보로 보낸다.
+MODEL_ROUTER_EXPLORE_RATE = float(os.getenv("MODEL_ROUTER_EXPLORE_RATE", "0.05"))
+
+
+@dataclass
+class ModelStats:
+    """모델 하나의 지수 이동 평균(EWMA) 통계"""
+
+    samples: int = 0
+    successes: int = 0
+    first_result_seconds: float = 0.0
+    completion_seconds: float = 0.0
+    failure_rate: float = 0.0
+
+    def observe(
+        self,
+        alpha: float,
+        first_result_seconds: Optional[float],
+        completion_seconds: float,
+        ok: bool,
+    ) -> None:
+        failure = 0.0 if ok else 1.0
+        if self.samples == 0:
+            self.failure_rate = failure
+        else:
+            self.failure_rate += alpha * (failure - self.failure_rate)
+        # 실패한 호출의 지연 시간은 성공 시간 추정을 왜곡하므로 실패율에만 반영한다.
+        if ok:
+            first = (
+                first_result_seconds
+                if first_result_seconds is not None
+                else completion_seconds
+            )
+            if self.successes == 0:
+                self.first_result_seconds = first
+                self.completion_seconds = completion_seconds
+            else:
+                self.first_result_seconds += alpha * (first - self.first_result_seconds)
+                self.completion_seconds += alpha * (
+                    completion_seconds - self.completion_seconds
+                )
+            self.successes += 1
+        self.samples += 1
+
+    def expected_seconds(self, lead: bool) -> float:
+        """실패하면 다시 기다려야 하므로 실패율만큼 기대 시간을 늘려 잡는다."""
+        # 한 번도 성공하지 못한 모델은 지연 시간을 모르므로 가장 느린 것으로 본다.
+        if self.successes == 0:
+            return math.inf
+        base = self.first_result_seconds if lead else self.completion_seconds
+        return base / max(1.0 - self.failure_rate, 0.05)
+
+
+@dataclass
+class RoutingPlan:
+    models: List[str]
+    reasons: List[str] = field(default_factory=list)
+
+
+class ModelRouter:
+    """
+    청크마다 호출할 모델을 고른다.
+    - static: 앞쪽 max(청크 수 * 0.2, 3)개 청크는 빠른 모델, 나머지는 품질 모델 (기존 규칙)
+    - adaptive: 앞쪽 청크는 TTFR 목표, 나머지는 완료 시간 목표를 만족하는 후보 중 우선순위가 가장 높은 모델
+    통계가 부족한 후보가 있으면 그 후보들에 청크를 돌아가며 보내 통계부터 모은다.
+    """
+
+    def __init__(
+        self,
+        policy: str = MODEL_ROUTER_POLICY,
+        candidates: Optional[List[str]] = None,
+        fast_model: str = MODEL_ROUTER_FAST_MODEL,
+        quality_model: str = MODEL_ROUTER_QUALITY_MODEL,
+        ttfr_slo_seconds: float = MODEL_ROUTER_TTFR_SLO_SECONDS,
+        completion_slo_seconds: float = MODEL_ROUTER_COMPLETION_SLO_SECONDS,
+        alpha: float = MODEL_ROUTER_EWMA_ALPHA,
+        min_samples: int = MODEL_ROUTER_MIN_SAMPLES,
+        explore_rate: float = MODEL_ROUTER_EXPLORE_RATE,
+    ):
+        self.policy = policy
+        self.candidates = candidates or list(MODEL_ROUTER_CANDIDATES)
+        self.fast_model = fast_model
+        self.quality_model = quality_model
+        self.ttfr_slo_seconds = ttfr_slo_seconds
+        self.completion_slo_seconds = completion_slo_seconds
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.explore_rate = explore_rate
+        self.models: Dict[str, ModelStats] = {}
+        self.decisions: Dict[str, int] = {}
+        self._warmup_turn = 0
+
+    def plan(self, chunk_count: int) -> RoutingPlan:
+        """청크 순서대로 모델을 배정한다. 앞쪽 청크가 첫 결과 시간을 좌우한다."""
+        plan = RoutingPlan(models=[])
+        for index in range(chunk_count):
+            lead = is_lead_chunk(index, chunk_count)
+            model, reason = self._choose(index, chunk_count, lead)
+            plan.models.append(model)
+            plan.reasons.append(reason)
+            key = f"{model}:{reason}"
+            self.decisions[key] = self.decisions.get(key, 0) + 1
+        logger.info(
+            f"모델 라우팅 ({self.policy}): "
+            + ", ".join(f"{m}({r})" for m, r in zip(plan.models, plan.reasons))
+        )
+        return plan
+
+    def lead_model(self) -> str:
+        """빠른 첫 퀴즈용 리드 청크의 모델: 첫 결과까지의 기대 시간이 가장 짧은 후보"""
+        model, reason = self.fast_model, "static"
+        if self.policy == "adaptive":
+            reason = "warmup"
+            if all(
+                self.models.get(m, ModelStats()).samples >= self.min_samples
+                for m in self.candidates
+            ):
+                model = min(
+                    self.candidates,
+                    key=lambda m: self.models[m].expected_seconds(lead=True),
+                )
+                reason = "fastest"
+        key = f"{model}:lead_{reason}"
+        self.decisions[key] = self.decisions.get(key, 0) + 1
+        logger.info(f"리드 청크 모델 ({self.policy}): {model}({reason})")
+        return model
+
+    def observe(
+        self,
+        model: str,
+        first_result_seconds: Optional[float],
+        completion_seconds: float,
+        ok: bool,
+    ) -> None:
+        stats = self.models.get(model)
+        if stats is None:
+            stats = self.models[model] = ModelStats()
+        stats.observe(self.alpha, first_result_seconds, completion_seconds, ok)
+
+    @property
+    def stats(self) -> Dict[str, object]:
+        return {
+            "policy": self.policy,
+            "models": {
+                model: {
+                    "samples": s.samples,
+                    "successes": s.successes,
+                    "first_result_seconds": round(s.first_result_seconds, 4),
+                    "completion_seconds": round(s.completion_seconds, 4),
+                    "failure_rate": round(s.failure_rate, 4),
+                }
+                for model, s in self.models.items()
+            },
+            "decisions": dict(self.decisions),
+        }
+
+    def _static_model(self, index: int, chunk_count: int) -> str:
+        if is_lead_chunk(index, chunk_count):
+            return self.fast_model
+        return self.quality_model
+
+    def _choose(self, index: int, chunk_count: int, lead: bool) -> tuple[str, str]:
+        if self.policy != "adaptive":
+            return self._static_model(index, chunk_count), "static"
+
+        warm = [
+            model
+            for model in self.candidates
+            if self.models.get(model, ModelStats()).samples >= self.min_samples
+        ]
+        cold = [model for model in self.candidates if model not in warm]
+        if cold:
+            # 콜드 스타트: 표본이 모자란 후보에 돌아가며 보내 모든 후보의 통계를 모은다.
+            model = cold[self._warmup_turn % len(cold)]
+            self._warmup_turn += 1
+            return model, "warmup"
+
+        if len(self.candidates) > 1 and random.random() < self.explore_rate:
+            return random.choice(self.candidates), "explore"
+
+        slo = self.ttfr_slo_seconds if lead else self.completion_slo_seconds
+        for model in self.candidates:
+            if self.models[model].expected_seconds(lead) <= slo:
+                return model, "slo"
+        # 아무 모델도 목표를 못 맞추면 기대 시간이 가장 짧은 모델을 쓴다.
+        fastest = min(
+            self.candidates, key=lambda m: self.models[m].expected_seconds(lead)
+        )
+        return fastest, "fastest"
+
+
+def is_lead_chunk(index: int, chunk_count: int) -> bool:
+    return index < max(chunk_count * 0.2, 3)
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+model_router = ModelRouter()
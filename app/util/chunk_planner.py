@@ -0,0 +1,164 @@
+from itertools import accumulate
+from typing import List
+
+from app.util.create_chunks import ChunkInfo, create_page_chunks
+
+
+def plan_page_chunks(
+    page_numbers: List[int],
+    page_weights: List[float],
+    total_quiz_count: int,
+    max_chunk_count: int,
+) -> List[ChunkInfo]:
+    """
+    페이지별 내용 가중치(추정 입력 토큰)를 기준으로 청크 간 입력량이 고르게
+    되도록 연속 구간으로 나누고, 퀴즈 개수는 청크 가중치에 비례해 배분한다.
+    청크 수와 앞뒤 여유 페이지 규칙은 create_page_chunks와 같다.
+    """
+    chunk_count = min(total_quiz_count, max_chunk_count)
+    if chunk_count <= 0:
+        return []
+    # 페이지보다 청크가 많으면 내용과 무관하게 겹치는 구간을 써야 하므로 기존 방식을 따른다.
+    if len(page_numbers) < chunk_count:
+        return create_page_chunks(page_numbers, total_quiz_count, max_chunk_count)
+
+    # 내용이 거의 없는 페이지도 최소 비용이 있다고 보고 1을 더해 페이지 수로 동률을 가른다.
+    weights = [max(float(w), 0.0) + 1.0 for w in page_weights]
+    bounds = _balanced_partition(weights, chunk_count)
+
+    chunks: List[ChunkInfo] = []
+    chunk_weights: List[float] = []
+    for start, end in bounds:
+        chunks.append(
+            ChunkInfo(
+                referenced_pages=_pad_pages(page_numbers, start, end), quiz_count=0
+            )
+        )
+        chunk_weights.append(sum(weights[start:end]))
+
+    for chunk, quiz_count in zip(
+        chunks, _distribute_quizzes(chunk_weights, total_quiz_count)
+    ):
+        chunk.quiz_count = quiz_count
+    return chunks
+
+
+def plan_lead_chunk(page_numbers: List[int], lead_page_count: int) -> ChunkInfo:
+    """
+    첫 퀴즈를 빨리 내기 위한 리드 청크: 선택 범위 앞쪽의 최소 페이지로 퀴즈 1개만 만든다.
+    입력이 작을수록 첫 결과가 빠르므로 다른 청크와 달리 여유 페이지를 붙이지 않는다.
+    """
+    return ChunkInfo(
+        referenced_pages=page_numbers[: max(lead_page_count, 1)], quiz_count=1
+    )
+
+
+def _balanced_partition(weights: List[float], parts: int) -> List[tuple]:
+    """최대 구간 합이 최소가 되도록 weights를 parts개의 연속 구간 [start, end)로 나눈다."""
+    low = max(weights, default=0.0)
+    high = sum(weights)
+    # 구간 합 상한을 이분 탐색한다. 가중치가 실수이므로 충분히 좁혀질 때까지 반복한다.
+    for _ in range(50):
+        if high - low <= 1e-6 * max(high, 1.0):
+            break
+        mid = (low + high) / 2
+        if len(_greedy_split(weights, mid)) <= parts:
+            high = mid
+        else:
+            low = mid
+
+    bounds = _greedy_split(weights, high)
+    # 상한 안에서 구간 수가 모자라면 가장 무거운 구간을 반으로 쪼개 청크 수를 맞춘다.
+    while len(bounds) < parts:
+        splittable = [b for b in bounds if b[1] - b[0] > 1]
+        start, end = max(splittable, key=lambda b: sum(weights[b[0] : b[1]]))
+        index = bounds.index((start, end))
+        mid = _weighted_midpoint(weights, start, end)
+        bounds[index : index + 1] = [(start, mid), (mid, end)]
+    return _rebalance(weights, bounds)
+
+
+def _greedy_split(weights: List[float], cap: float) -> List[tuple]:
+    bounds = []
+    start = 0
+    running = 0.0
+    for i, w in enumerate(weights):
+        if i > start and running + w > cap:
+            bounds.append((start, i))
+            start = i
+            running = 0.0
+        running += w
+    bounds.append((start, len(weights)))
+    return bounds
+
+
+def _rebalance(weights: List[float], bounds: List[tuple]) -> List[tuple]:
+    """
+    탐욕 분할은 앞 구간부터 상한까지 채워 뒤 구간이 가벼워진다(같은 무게 10쪽을 3개로 나누면 4/4/2).
+    최대 구간 합을 넘지 않는 범위에서 이웃한 두 구간의 경계를 옮겨 두 구간의 합을 최대한 비슷하게 맞춘다.
+    """
+    prefix = list(accumulate(weights, initial=0.0))
+    cap = max(prefix[end] - prefix[start] for start, end in bounds) + 1e-9
+    bounds = list(bounds)
+    # 경계를 옮길 때마다 두 구간의 차이가 줄어(제곱합이 줄어) 반드시 멈춘다.
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(bounds) - 1):
+            start, best = bounds[i]
+            end = bounds[i + 1][1]
+            best_gap = abs(2 * prefix[best] - prefix[start] - prefix[end])
+            for mid in range(start + 1, end):
+                if max(prefix[mid] - prefix[start], prefix[end] - prefix[mid]) > cap:
+                    continue
+                gap = abs(2 * prefix[mid] - prefix[start] - prefix[end])
+                if gap < best_gap - 1e-9:
+                    best, best_gap = mid, gap
+            if best != bounds[i][1]:
+                bounds[i], bounds[i + 1] = (start, best), (best, end)
+                changed = True
+    return bounds
+
+
+def _weighted_midpoint(weights: List[float], start: int, end: int) -> int:
+    half = sum(weights[start:end]) / 2
+    running = 0.0
+    for i in range(start, end - 1):
+        running += weights[i]
+        if running >= half:
+            return i + 1
+    return end - 1
+
+
+def _pad_pages(page_numbers: List[int], start: int, end: int) -> List[int]:
+    # 앞뒤로 한 페이지씩 여유를 둔다.
+    if end - start >= 3:
+        return page_numbers[start:end]
+    if start == 0:
+        return page_numbers[0:3]
+    if end >= len(page_numbers):
+        return page_numbers[-3:]
+    return page_numbers[start - 1 : start + 2]
+
+
+def _distribute_quizzes(chunk_weights: List[float], total_quiz_count: int) -> List[int]:
+    """각 청크에 최소 1개를 주고, 나머지는 가중치 비례(최대 잉여 방식)로 나눈다."""
+    counts = [1] * len(chunk_weights)
+    remaining = total_quiz_count - len(chunk_weights)
+    total_weight = sum(chunk_weights)
+    if remaining <= 0:
+        return counts
+    if total_weight <= 0:
+        shares = [remaining / len(chunk_weights)] * len(chunk_weights)
+    else:
+        shares = [remaining * w / total_weight for w in chunk_weights]
+
+    floors = [int(share) for share in shares]
+    counts = [c + f for c, f in zip(counts, floors)]
+    leftover = remaining - sum(floors)
+    by_remainder = sorted(
+        range(len(shares)), key=lambda i: shares[i] - floors[i], reverse=True
+    )
+    for i in by_remainder[:leftover]:
+        counts[i] += 1
+    return counts
@@ -0,0 +1,65 @@
+import asyncio
+from typing import AsyncIterator
+
+from starlette.requests import Request
+
+from app.util.logger import logger
+from app.util.metrics import client_disconnects
+
+
+async def stop_on_disconnect(
+    request: Request, stream: AsyncIterator[str]
+) -> AsyncIterator[str]:
+    """
+    다음 줄을 기다리는 동안에도 클라이언트 연결 종료(http.disconnect)를 감시한다.
+    끊기면 다음 줄을 기다리던 이 태스크를 취소해 그 아래의 청크 작업과 업스트림 HTTP 호출까지 바로 취소되게 한다.
+    (ASGI 2.4 서버에서 Starlette는 다음 줄을 쓰려 할 때에야 끊김을 알아채므로
+    GPT 응답을 기다리는 동안에는 모른다. 그보다 낮은 버전에서는 Starlette가 먼저 이 제너레이터를 취소한다.)
+    """
+    consumer = asyncio.current_task()
+    disconnected = False
+    waiting = False
+
+    async def watch() -> None:
+        nonlocal disconnected
+        await _wait_for_disconnect(request)
+        disconnected = True
+        # 줄을 보내는 중에는 Starlette의 전송을 끊지 않고, 다음 줄을 요청할 때 멈춘다.
+        if waiting:
+            consumer.cancel()
+
+    # 스트림 전체에서 감시 태스크는 하나만 둔다.
+    watcher = asyncio.create_task(watch())
+    finished = False
+    try:
+        while not disconnected:
+            waiting = True
+            try:
+                line = await anext(stream)
+            except StopAsyncIteration:
+                finished = True
+                return
+            finally:
+                waiting = False
+            yield line
+    except asyncio.CancelledError:
+        # 감시 태스크가 건 취소만 삼키고, 서버나 Starlette의 취소는 그대로 올린다.
+        if not disconnected or consumer.uncancel() > 0:
+            raise
+    except Exception:
+        finished = True
+        raise
+    finally:
+        watcher.cancel()
+        if not finished:
+            # 끝나기 전에 멈췄다면 직접 감지했든 Starlette가 취소했든 클라이언트가 떠난 것이다.
+            client_disconnects.inc()
+            logger.info("클라이언트 연결이 끊겨 스트림을 닫습니다")
+        # anyio 취소 범위 안에서는 await마다 다시 취소되므로 정리 작업은 shield로 끝까지 돌린다.
+        await asyncio.shield(stream.aclose())
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # 본문은 이미 읽었으므로 이후에 오는 메시지는 연결 종료뿐이다.
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
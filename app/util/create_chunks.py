@@ -1,13 +1,12 @@
 from typing import List
 
 from pydantic.v1 import BaseModel
-from typing_extensions import Dict
 
 
 class ChunkInfo(BaseModel):
+    # 요청 페이로드는 청크에 붙여 두지 않고 호출 직전에 만들어 호출이 끝나면 버린다.
     referenced_pages: List[int]
     quiz_count: int
-    gpt_content: Dict = {}
 
 
 def create_page_chunks(
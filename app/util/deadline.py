@@ -0,0 +1,37 @@
+import os
+import time
+from typing import Optional
+
+# 요청 전체(다운로드 → PDF 분할 → GPT 호출)의 기본 마감 시간(초). 0이면 두지 않고 단계별 제한만 적용한다.
+# 요청의 deadlineSeconds가 있으면 그 값이 우선한다.
+GENERATION_DEADLINE_SECONDS = float(os.getenv("GENERATION_DEADLINE_SECONDS", "0"))
+# 단계를 시작할 때 남아 있는 시간 중 다운로드/PDF 분할이 쓸 수 있는 비율.
+# GPT 호출은 호출을 시작하는 시점에 남은 시간을 모두 쓸 수 있다.
+DEADLINE_DOWNLOAD_SHARE = float(os.getenv("DEADLINE_DOWNLOAD_SHARE", "0.2"))
+DEADLINE_SLICE_SHARE = float(os.getenv("DEADLINE_SLICE_SHARE", "0.25"))
+
+
+class Deadline:
+    """요청 하나의 종단 간 마감 시각. 마감이 없으면 각 단계의 기본 제한을 그대로 쓴다."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds or None
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    @classmethod
+    def for_request(cls, seconds: Optional[float]) -> "Deadline":
+        return cls(seconds or GENERATION_DEADLINE_SECONDS or None)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def budget(self, default: Optional[float], share: float = 1.0) -> Optional[float]:
+        """단계 기본 제한(default, None은 무제한)과 남은 시간 × share 중 작은 값"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if default is None:
+            return remaining * share
+        return min(default, remaining * share)
@@ -0,0 +1,361 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+from app.adapter.pdf_downloader import DownloadedPdf, download_pdf_if_modified
+from app.util.page_profile import PageProfile, dumps_profiles, loads_profiles
+from app.util.single_flight import SingleFlight
+
+DOCUMENT_CACHE_MEMORY_BYTES = int(
+    os.getenv("DOCUMENT_CACHE_MEMORY_BYTES", str(256 * 1024 * 1024))
+)
+DOCUMENT_CACHE_DISK_BYTES = int(
+    os.getenv("DOCUMENT_CACHE_DISK_BYTES", str(2 * 1024 * 1024 * 1024))
+)
+DOCUMENT_CACHE_DIR = os.getenv(
+    "DOCUMENT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "qasker-document-cache")
+)
+# 이 시간 동안은 같은 URL을 재검증(조건부 요청) 없이 캐시에서 바로 사용한다.
+DOCUMENT_CACHE_REVALIDATE_SECONDS = float(
+    os.getenv("DOCUMENT_CACHE_REVALIDATE_SECONDS", "600")
+)
+DOCUMENT_CACHE_MAX_URLS = int(os.getenv("DOCUMENT_CACHE_MAX_URLS", "10000"))
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    content_hash: str
+    path: str
+
+
+@dataclass
+class _UrlEntry:
+    etag: Optional[str]
+    content_hash: str
+    validated_at: float
+
+
+class _MemoryTier:
+    """바이트 총량으로 상한을 두는 메모리 LRU"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: bytes) -> int:
+        """저장하고 밀려난 항목 수를 돌려준다."""
+        if len(value) > self.max_bytes:
+            return 0
+        previous = self._items.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._items[key] = value
+        self.size += len(value)
+
+        evicted = 0
+        while self.size > self.max_bytes:
+            _, old = self._items.popitem(last=False)
+            self.size -= len(old)
+            evicted += 1
+        return evicted
+
+
+class _DiskTier:
+    """디렉터리에 파일로 저장하는 LRU. 스레드에서 호출되므로 락으로 보호한다."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._lock = threading.Lock()
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        # 재시작 후에도 기존 파일을 오래된 순서대로 이어서 사용한다.
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith((".pdf", ".json")):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self.size += size
+
+    def path_of(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+        path = self.path_of(name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.size -= self._files.pop(name, 0)
+            return None
+        return path
+
+    def read(self, name: str) -> Optional[bytes]:
+        path = self.get(name)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, name: str, value: bytes, pinned: Sequence[str] = ()) -> int:
+        """원자적으로 기록하고 밀려난 파일 수를 돌려준다. pinned 접두어 파일은 지우지 않는다."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(value)
+        return self.adopt(name, tmp_path, pinned)
+
+    def adopt(self, name: str, source_path: str, pinned: Sequence[str] = ()) -> int:
+        """같은 디렉터리의 파일을 캐시 항목으로 옮기고 밀려난 파일 수를 돌려준다."""
+        size = os.path.getsize(source_path)
+        os.replace(source_path, self.path_of(name))
+
+        evicted_names = []
+        with self._lock:
+            self.size -= self._files.pop(name, 0)
+            self._files[name] = size
+            self.size += size
+            for old_name in list(self._files):
+                if self.size <= self.max_bytes:
+                    break
+                if old_name == name or old_name.startswith(tuple(pinned)):
+                    continue
+                self.size -= self._files.pop(old_name)
+                evicted_names.append(old_name)
+
+        for old_name in evicted_names:
+            try:
+                os.remove(self.path_of(old_name))
+            except FileNotFoundError:
+                pass
+        return len(evicted_names)
+
+
+class DocumentCache:
+    """
+    업로드 URL + ETag/내용 해시 기반 문서 캐시.
+    원본 PDF는 디스크에, 페이지 조합별 부분 PDF와 페이지별 텍스트/토큰 수는
+    메모리 LRU와 디스크 두 계층에 저장한다(슬라이서 워커는 원본을 파일 경로로 읽는다).
+    """
+
+    def __init__(
+        self,
+        directory: str = DOCUMENT_CACHE_DIR,
+        memory_bytes: int = DOCUMENT_CACHE_MEMORY_BYTES,
+        disk_bytes: int = DOCUMENT_CACHE_DISK_BYTES,
+        revalidate_seconds: float = DOCUMENT_CACHE_REVALIDATE_SECONDS,
+        max_urls: int = DOCUMENT_CACHE_MAX_URLS,
+    ):
+        self.revalidate_seconds = revalidate_seconds
+        self.max_urls = max_urls
+        self._urls: "OrderedDict[str, _UrlEntry]" = OrderedDict()
+        self._memory = _MemoryTier(memory_bytes)
+        self._disk = _DiskTier(directory, disk_bytes)
+        # 사용 중인 문서는 디스크에서 밀려나지 않도록 고정한다.
+        self._pinned: Counter = Counter()
+        # 같은 URL을 동시에 찾는 요청은 다운로드와 해시 계산을 한 번만 한다.
+        self._resolving: SingleFlight[CachedDocument] = SingleFlight()
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "revalidated": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    async def resolve(
+        self, uploaded_url: str, timeout: Optional[float] = None
+    ) -> CachedDocument:
+        """URL의 문서를 캐시에서 찾고, 없거나 변경되었으면 내려받아(timeout 안에) 저장한다."""
+        # 합류한 요청은 먼저 시작한 요청의 timeout을 따른다.
+        return await self._resolving.do(
+            uploaded_url, lambda: self._resolve(uploaded_url, timeout)
+        )
+
+    async def _resolve(
+        self, uploaded_url: str, timeout: Optional[float]
+    ) -> CachedDocument:
+        entry = self._urls.get(uploaded_url)
+        if entry is not None:
+            path = await asyncio.to_thread(
+                self._disk.get, _document_name(entry.content_hash)
+            )
+            if path is not None:
+                fresh = time.monotonic() - entry.validated_at < self.revalidate_seconds
+                if fresh:
+                    self._urls.move_to_end(uploaded_url)
+                    self.stats["hits"] += 1
+                    return CachedDocument(entry.content_hash, path)
+
+                downloaded = await download_pdf_if_modified(
+                    uploaded_url,
+                    entry.etag,
+                    spool_dir=self._disk.directory,
+                    timeout=timeout,
+                )
+                if downloaded.not_modified:
+                    entry.validated_at = time.monotonic()
+                    self._urls.move_to_end(uploaded_url)
+                    self.stats["hits"] += 1
+                    self.stats["revalidated"] += 1
+                    return CachedDocument(entry.content_hash, path)
+                return await self._store(uploaded_url, downloaded)
+
+        downloaded = await download_pdf_if_modified(
+            uploaded_url, spool_dir=self._disk.directory, timeout=timeout
+        )
+        return await self._store(uploaded_url, downloaded)
+
+    async def _store(
+        self, uploaded_url: str, downloaded: DownloadedPdf
+    ) -> CachedDocument:
+        self.stats["misses"] += 1
+        if downloaded.spool_path is not None:
+            # 임시 파일로 받은 큰 문서는 메모리 맵으로 해시하고 그대로 캐시 파일로 옮긴다.
+            content_hash = await asyncio.to_thread(_sha256_file, downloaded.spool_path)
+            name = _document_name(content_hash)
+            path = await asyncio.to_thread(self._disk.get, name)
+            if path is None:
+                await self._adopt_disk(name, downloaded.spool_path)
+                path = self._disk.path_of(name)
+            else:
+                await asyncio.to_thread(os.remove, downloaded.spool_path)
+        else:
+            content = downloaded.content
+            content_hash = await asyncio.to_thread(_sha256, content)
+            name = _document_name(content_hash)
+            path = await asyncio.to_thread(self._disk.get, name)
+            if path is None:
+                await self._put_disk(name, content)
+                path = self._disk.path_of(name)
+
+        self._urls[uploaded_url] = _UrlEntry(
+            downloaded.etag, content_hash, time.monotonic()
+        )
+        self._urls.move_to_end(uploaded_url)
+        while len(self._urls) > self.max_urls:
+            self._urls.popitem(last=False)
+        return CachedDocument(content_hash, path)
+
+    async def get_slice(
+        self, document: CachedDocument, pages: Sequence[int]
+    ) -> Optional[bytes]:
+        key, name = _slice_key(document.content_hash, pages)
+        return await self._get(key, name)
+
+    async def put_slice(
+        self, document: CachedDocument, pages: Sequence[int], content: bytes
+    ) -> None:
+        key, name = _slice_key(document.content_hash, pages)
+        self._put_memory(key, content)
+        await self._put_disk(name, content)
+
+    async def get_page_profiles(
+        self, document: CachedDocument
+    ) -> Dict[int, PageProfile]:
+        """지금까지 분석해 둔 페이지의 프로파일 (페이지 번호 -> 프로파일). 일부 페이지만 있을 수 있다."""
+        content = await self._get(
+            ("profiles", document.content_hash),
+            _profiles_name(document.content_hash),
+        )
+        if content is None:
+            return {}
+        return {profile.page_number: profile for profile in loads_profiles(content)}
+
+    async def put_page_profiles(
+        self, document: CachedDocument, profiles: Dict[int, PageProfile]
+    ) -> None:
+        content = dumps_profiles([profiles[page] for page in sorted(profiles)])
+        self._put_memory(("profiles", document.content_hash), content)
+        await self._put_disk(_profiles_name(document.content_hash), content)
+
+    def pin(self, document: CachedDocument) -> None:
+        self._pinned[document.content_hash] += 1
+
+    def unpin(self, document: CachedDocument) -> None:
+        self._pinned[document.content_hash] -= 1
+        if self._pinned[document.content_hash] <= 0:
+            del self._pinned[document.content_hash]
+
+    async def _get(self, key: Tuple, name: str) -> Optional[bytes]:
+        value = self._memory.get(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+        value = await asyncio.to_thread(self._disk.read, name)
+        if value is not None:
+            self.stats["disk_hits"] += 1
+            self._put_memory(key, value)
+        return value
+
+    def _put_memory(self, key: Tuple, value: bytes) -> None:
+        self.stats["memory_evictions"] += self._memory.put(key, value)
+
+    async def _put_disk(self, name: str, value: bytes) -> None:
+        evicted = await asyncio.to_thread(
+            self._disk.put, name, value, tuple(self._pinned)
+        )
+        self.stats["disk_evictions"] += evicted
+
+    async def _adopt_disk(self, name: str, source_path: str) -> None:
+        evicted = await asyncio.to_thread(
+            self._disk.adopt, name, source_path, tuple(self._pinned)
+        )
+        self.stats["disk_evictions"] += evicted
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _sha256_file(path: str) -> str:
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def _document_name(content_hash: str) -> str:
+    return f"{content_hash}.pdf"
+
+
+def _profiles_name(content_hash: str) -> str:
+    return f"{content_hash}.pages.json"
+
+
+def _slice_key(content_hash: str, pages: Sequence[int]) -> Tuple[Tuple, str]:
+    pages_key = tuple(pages)
+    digest = hashlib.sha1(",".join(map(str, pages_key)).encode()).hexdigest()[:16]
+    return ("slice", content_hash, pages_key), f"{content_hash}-{digest}.pdf"
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+document_cache = DocumentCache()
@@ -0,0 +1,293 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Protocol
+
+from redis import asyncio as aioredis
+
+from app.adapter.redis_client import get_redis_client
+
+# 생성 작업 저장소: sqlite(로컬 파일, 단일 호스트) | redis(여러 워커/레플리카 공유)
+GENERATION_JOB_BACKEND = os.getenv("GENERATION_JOB_BACKEND", "sqlite")
+GENERATION_JOB_SQLITE_PATH = os.getenv(
+    "GENERATION_JOB_SQLITE_PATH",
+    os.path.join(tempfile.gettempdir(), "qasker-generation-jobs.sqlite3"),
+)
+# 마지막 기록 이후 이 시간이 지나면 작업과 결과를 지운다.
+GENERATION_JOB_TTL_SECONDS = float(os.getenv("GENERATION_JOB_TTL_SECONDS", "86400"))
+
+
+@dataclass
+class GenerationJob:
+    job_id: str
+    # running | completed | failed
+    status: str
+    quiz_count: int
+    created_at: float
+    updated_at: float
+    line_count: int = 0
+    error: Optional[str] = None
+
+
+class GenerationJobBackend(Protocol):
+    async def create(self, job: GenerationJob) -> None: ...
+
+    async def append(self, job_id: str, line: str) -> None: ...
+
+    async def finish(self, job_id: str, status: str, error: Optional[str]) -> None: ...
+
+    async def get(self, job_id: str) -> Optional[GenerationJob]: ...
+
+    async def read_lines(self, job_id: str, offset: int) -> List[str]: ...
+
+
+class SqliteGenerationJobBackend:
+    """
+    작업 상태와 청크 결과 줄을 SQLite 파일에 저장한다.
+    sqlite3는 블로킹 API라 연결 하나를 락으로 보호하고 스레드에서 실행한다.
+    WAL 모드라 같은 호스트의 여러 워커가 파일을 함께 읽고 쓸 수 있다.
+    """
+
+    def __init__(
+        self,
+        path: str = GENERATION_JOB_SQLITE_PATH,
+        ttl_seconds: float = GENERATION_JOB_TTL_SECONDS,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    async def create(self, job: GenerationJob) -> None:
+        await self._run(self._create, job)
+
+    async def append(self, job_id: str, line: str) -> None:
+        await self._run(self._append, job_id, line)
+
+    async def finish(self, job_id: str, status: str, error: Optional[str]) -> None:
+        await self._run(self._finish, job_id, status, error)
+
+    async def get(self, job_id: str) -> Optional[GenerationJob]:
+        return await self._run(self._get, job_id)
+
+    async def read_lines(self, job_id: str, offset: int) -> List[str]:
+        return await self._run(self._read_lines, job_id, offset)
+
+    async def _run(self, fn: Callable, *args):
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn: Callable, *args):
+        with self._lock:
+            return fn(self._connect(), *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS generation_jobs ("
+                "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "quiz_count INTEGER NOT NULL, created_at REAL NOT NULL, "
+                "updated_at REAL NOT NULL, expires_at REAL NOT NULL, error TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS generation_job_lines ("
+                "job_id TEXT NOT NULL, seq INTEGER NOT NULL, line TEXT NOT NULL, "
+                "PRIMARY KEY (job_id, seq))"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _create(self, conn: sqlite3.Connection, job: GenerationJob) -> None:
+        now = time.time()
+        with _transaction(conn):
+            # 만료된 작업은 새 작업을 만들 때 함께 지운다.
+            conn.execute(
+                "DELETE FROM generation_job_lines WHERE job_id IN "
+                "(SELECT job_id FROM generation_jobs WHERE expires_at < ?)",
+                (now,),
+            )
+            conn.execute("DELETE FROM generation_jobs WHERE expires_at < ?", (now,))
+            conn.execute(
+                "INSERT INTO generation_jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id,
+                    job.status,
+                    job.quiz_count,
+                    job.created_at,
+                    job.updated_at,
+                    job.updated_at + self.ttl_seconds,
+                    job.error,
+                ),
+            )
+
+    def _append(self, conn: sqlite3.Connection, job_id: str, line: str) -> None:
+        now = time.time()
+        with _transaction(conn):
+            conn.execute(
+                "INSERT INTO generation_job_lines VALUES (?, "
+                "(SELECT COUNT(*) FROM generation_job_lines WHERE job_id = ?), ?)",
+                (job_id, job_id, line),
+            )
+            conn.execute(
+                "UPDATE generation_jobs SET updated_at = ?, expires_at = ? "
+                "WHERE job_id = ?",
+                (now, now + self.ttl_seconds, job_id),
+            )
+
+    def _finish(
+        self,
+        conn: sqlite3.Connection,
+        job_id: str,
+        status: str,
+        error: Optional[str],
+    ) -> None:
+        now = time.time()
+        with _transaction(conn):
+            conn.execute(
+                "UPDATE generation_jobs SET status = ?, error = ?, updated_at = ?, "
+                "expires_at = ? WHERE job_id = ?",
+                (status, error, now, now + self.ttl_seconds, job_id),
+            )
+
+    def _get(self, conn: sqlite3.Connection, job_id: str) -> Optional[GenerationJob]:
+        row = conn.execute(
+            "SELECT job_id, status, quiz_count, created_at, updated_at, error, "
+            "(SELECT COUNT(*) FROM generation_job_lines l WHERE l.job_id = j.job_id) "
+            "FROM generation_jobs j WHERE j.job_id = ? AND j.expires_at >= ?",
+            (job_id, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return GenerationJob(
+            job_id=row[0],
+            status=row[1],
+            quiz_count=row[2],
+            created_at=row[3],
+            updated_at=row[4],
+            error=row[5],
+            line_count=row[6],
+        )
+
+    def _read_lines(
+        self, conn: sqlite3.Connection, job_id: str, offset: int
+    ) -> List[str]:
+        rows = conn.execute(
+            "SELECT line FROM generation_job_lines WHERE job_id = ? AND seq >= ? "
+            "ORDER BY seq",
+            (job_id, offset),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """
+    자동 커밋 연결(isolation_level=None)에서는 with conn:이 트랜잭션을 열지 않으므로 직접 연다.
+    IMMEDIATE로 시작해 쓰기 락을 먼저 잡아 두 워커가 동시에 락을 올리다 실패하지 않게 한다.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class RedisGenerationJobBackend:
+    """
+    작업 상태는 해시, 청크 결과 줄은 리스트에 저장한다.
+    기록할 때마다 두 키의 TTL을 함께 늘려 진행 중인 작업이 만료되지 않게 한다.
+    """
+
+    key_prefix = "qasker:generation-job:"
+
+    def __init__(
+        self,
+        client_factory: Callable[[], aioredis.Redis] = get_redis_client,
+        ttl_seconds: float = GENERATION_JOB_TTL_SECONDS,
+    ):
+        self.client_factory = client_factory
+        self.ttl_seconds = ttl_seconds
+
+    async def create(self, job: GenerationJob) -> None:
+        key = self.key_prefix + job.job_id
+        async with self.client_factory().pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "status": job.status,
+                    "quiz_count": job.quiz_count,
+                    "created_at": job.created_at,
+                    "updated_at": job.updated_at,
+                },
+            )
+            pipe.expire(key, self._ttl)
+            await pipe.execute()
+
+    async def append(self, job_id: str, line: str) -> None:
+        key = self.key_prefix + job_id
+        async with self.client_factory().pipeline(transaction=True) as pipe:
+            pipe.rpush(key + ":lines", line)
+            pipe.hset(key, "updated_at", time.time())
+            pipe.expire(key, self._ttl)
+            pipe.expire(key + ":lines", self._ttl)
+            await pipe.execute()
+
+    async def finish(self, job_id: str, status: str, error: Optional[str]) -> None:
+        key = self.key_prefix + job_id
+        fields = {"status": status, "updated_at": time.time()}
+        if error is not None:
+            fields["error"] = error
+        async with self.client_factory().pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self._ttl)
+            pipe.expire(key + ":lines", self._ttl)
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[GenerationJob]:
+        key = self.key_prefix + job_id
+        async with self.client_factory().pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.llen(key + ":lines")
+            fields, line_count = await pipe.execute()
+        if not fields:
+            return None
+        fields = {k.decode(): v.decode() for k, v in fields.items()}
+        return GenerationJob(
+            job_id=job_id,
+            status=fields["status"],
+            quiz_count=int(fields["quiz_count"]),
+            created_at=float(fields["created_at"]),
+            updated_at=float(fields["updated_at"]),
+            line_count=line_count,
+            error=fields.get("error"),
+        )
+
+    async def read_lines(self, job_id: str, offset: int) -> List[str]:
+        lines = await self.client_factory().lrange(
+            self.key_prefix + job_id + ":lines", offset, -1
+        )
+        return [line.decode() for line in lines]
+
+    @property
+    def _ttl(self) -> int:
+        return max(int(self.ttl_seconds), 1)
+
+
+def create_generation_job_backend() -> GenerationJobBackend:
+    if GENERATION_JOB_BACKEND == "redis":
+        return RedisGenerationJobBackend()
+    return SqliteGenerationJobBackend()
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+generation_job_store = create_generation_job_backend()
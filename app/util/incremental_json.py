@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+import orjson
+
+
+class ProblemStreamParser:
+    """
+    {"quiz": [{...}, {...}]} 형태의 JSON이 조각(delta)으로 들어올 때,
+    quiz 배열의 원소 객체가 닫히는 즉시 하나씩 파싱해 돌려준다.
+    Structured Outputs(strict) 응답을 전제로 하므로 최상위 구조는 고정이라고 본다.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        # 현재 수집 중인 문제 객체의 원문 (없으면 None)
+        self._item: Optional[List[str]] = None
+
+    def feed(self, delta: str) -> List[dict]:
+        completed = []
+        segment_start = 0
+        for i, ch in enumerate(delta):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                # 깊이 3의 객체: 최상위 객체(1) > quiz 배열(2) > 문제 객체(3)
+                if ch == "{" and self._depth == 3:
+                    self._item = []
+                    segment_start = i
+            elif ch in "}]":
+                if ch == "}" and self._depth == 3 and self._item is not None:
+                    self._item.append(delta[segment_start : i + 1])
+                    completed.append(orjson.loads("".join(self._item)))
+                    self._item = None
+                self._depth -= 1
+
+        if self._item is not None:
+            self._item.append(delta[segment_start:])
+        return completed
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.util.logger import logger
+
+# 기동 시 업스트림(OpenAI)에 가벼운 요청을 보내 커넥션/TLS를 미리 맺어 둘지 여부
+WARMUP_UPSTREAM_CONNECTIONS = (
+    os.getenv("WARMUP_UPSTREAM_CONNECTIONS", "true").lower() == "true"
+)
+WARMUP_UPSTREAM_TIMEOUT_SECONDS = float(
+    os.getenv("WARMUP_UPSTREAM_TIMEOUT_SECONDS", "5")
+)
+
+
+class Readiness:
+    """워밍업 단계별 결과와 준비 여부. 필수 단계가 모두 성공해야 ready가 된다."""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at = time.monotonic()
+        self.ready_after_seconds: Optional[float] = None
+        self.steps: Dict[str, str] = {}
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "ready": self.ready,
+            "readyAfterSeconds": self.ready_after_seconds,
+            "steps": dict(self.steps),
+        }
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+readiness = Readiness()
+
+
+async def warm_up() -> None:
+    """무거운 임포트와 클라이언트/풀 생성을 첫 요청 전에 끝내 둔다."""
+    readiness.started_at = time.monotonic()
+    required_ok = True
+    for name, step, required in (
+        ("gpt_client", _warm_gpt_client, True),
+        ("http_client", _warm_http_client, True),
+        ("slice_executor", _warm_slice_executor, True),
+        ("tokenizer", _warm_tokenizer, False),
+        ("upstream_connection", _warm_upstream_connection, False),
+        ("redis", _warm_redis, False),
+    ):
+        ok = await _run_step(name, step)
+        required_ok = required_ok and (ok or not required)
+
+    readiness.ready_after_seconds = round(time.monotonic() - readiness.started_at, 4)
+    readiness.ready = required_ok
+    if required_ok:
+        logger.info(f"워밍업 완료: {readiness.ready_after_seconds}초")
+    else:
+        logger.error(f"워밍업 실패, ready 상태가 되지 않습니다: {readiness.steps}")
+
+
+async def shut_down() -> None:
+    """종료 시 커넥션 풀과 프로세스 풀을 정리한다. 만들어진 적 없는 자원은 건드리지 않는다."""
+    readiness.ready = False
+    from app.adapter.pdf_downloader import get_http_client
+    from app.adapter.redis_client import get_redis_client
+    from app.adapter.request_to_gpt import get_gpt_client
+    from app.util.pdf_slicer import get_slice_executor
+
+    if get_gpt_client.cache_info().currsize:
+        await _quietly("gpt_client", get_gpt_client().close)
+        get_gpt_client.cache_clear()
+    if get_http_client.cache_info().currsize:
+        await _quietly("http_client", get_http_client().aclose)
+        get_http_client.cache_clear()
+    if get_redis_client.cache_info().currsize:
+        await _quietly("redis", get_redis_client().aclose)
+        get_redis_client.cache_clear()
+    if get_slice_executor.cache_info().currsize:
+        get_slice_executor().shutdown(wait=False, cancel_futures=True)
+        get_slice_executor.cache_clear()
+
+
+async def _run_step(name: str, step: Callable[[], Awaitable[None]]) -> bool:
+    start = time.perf_counter()
+    try:
+        await step()
+    except Exception as e:
+        readiness.steps[name] = f"failed: {e!r}"
+        logger.warning(f"워밍업 단계 실패 ({name}): {e!r}")
+        return False
+    readiness.steps[name] = f"ok ({time.perf_counter() - start:.3f}s)"
+    return True
+
+
+async def _quietly(name: str, close: Callable[[], Awaitable[None]]) -> None:
+    try:
+        await close()
+    except Exception as e:
+        logger.warning(f"종료 중 정리 실패 ({name}): {e!r}")
+
+
+async def _warm_gpt_client() -> None:
+    from app.adapter.request_to_gpt import get_gpt_client
+
+    await asyncio.to_thread(get_gpt_client)
+
+
+async def _warm_http_client() -> None:
+    from app.adapter.pdf_downloader import get_http_client
+
+    get_http_client()
+
+
+async def _warm_slice_executor() -> None:
+    from app.util.pdf_slicer import warm_up_slice_executor
+
+    await warm_up_slice_executor()
+
+
+async def _warm_tokenizer() -> None:
+    from app.util.page_profile import get_encoding
+
+    if await asyncio.to_thread(get_encoding) is None:
+        raise RuntimeError("tiktoken 인코딩을 불러오지 못했습니다")
+
+
+async def _warm_upstream_connection() -> None:
+    if not WARMUP_UPSTREAM_CONNECTIONS:
+        return
+    from openai import APIStatusError
+
+    from app.adapter.request_to_gpt import get_gpt_client
+
+    client = get_gpt_client().with_options(timeout=WARMUP_UPSTREAM_TIMEOUT_SECONDS)
+    try:
+        await client.models.list()
+    except APIStatusError:
+        # 상태 코드와 무관하게 응답을 받았으면 커넥션은 맺어진 것이다.
+        pass
+
+
+async def _warm_redis() -> None:
+    from app.util.rate_limiter import RATE_LIMIT_BACKEND
+    from app.util.result_cache import RESULT_CACHE_BACKEND
+
+    if "redis" not in (RATE_LIMIT_BACKEND, RESULT_CACHE_BACKEND):
+        return
+    from app.adapter.redis_client import get_redis_client
+
+    await get_redis_client().ping()
@@ -0,0 +1,63 @@
+import asyncio
+import os
+from typing import Dict, Optional
+
+from app.util.logger import logger
+from app.util.metrics import metrics
+
+# 이벤트 루프 지연 측정 주기(초). 0이면 측정하지 않는다.
+EVENT_LOOP_LAG_INTERVAL_SECONDS = float(
+    os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.25")
+)
+# 이 값보다 오래 루프가 막히면 경고 로그를 남긴다.
+EVENT_LOOP_LAG_WARN_SECONDS = float(os.getenv("EVENT_LOOP_LAG_WARN_SECONDS", "0.1"))
+
+event_loop_lag_seconds = metrics.histogram(
+    "qasker_event_loop_lag_seconds",
+    "예정된 깨어남 시각 대비 이벤트 루프 지연",
+    (),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+class EventLoopMonitor:
+    """
+    주기적으로 sleep한 뒤 예정보다 늦게 깨어난 만큼을 루프 지연으로 기록한다.
+    CPU 작업이 루프 스레드를 막으면 모든 스트림의 응답이 함께 밀리므로 따로 관측한다.
+    """
+
+    def __init__(self, interval: float, warn_threshold: float):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.stats: Dict[str, float] = {"samples": 0, "lag_seconds_max": 0.0}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            event_loop_lag_seconds.observe(lag)
+            self.stats["samples"] += 1
+            self.stats["lag_seconds_max"] = max(self.stats["lag_seconds_max"], lag)
+            if lag >= self.warn_threshold:
+                logger.warning(f"이벤트 루프 지연: {lag:.3f}초")
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+event_loop_monitor = EventLoopMonitor(
+    EVENT_LOOP_LAG_INTERVAL_SECONDS, EVENT_LOOP_LAG_WARN_SECONDS
+)
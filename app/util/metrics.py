@@ -0,0 +1,257 @@
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+# 수집기가 돌려주는 (라벨, 값) 샘플
+Sample = Tuple[Mapping[str, str], float]
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(self.labelnames, labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = _header(self.name, self.documentation, "counter")
+        for key, value in self._values.items():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    """버킷별 개수는 누적하지 않고 저장해 관측 비용을 이분 탐색 한 번과 덧셈 몇 번으로 줄인다."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...],
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합 -> [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(self.labelnames, labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = _header(self.name, self.documentation, "histogram")
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else _format_value(bound)
+                labels = _format_labels((*self.labelnames, "le"), (*key, le))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 메트릭 저장소. 관측은 이벤트 루프 스레드에서만 일어나므로 락을 쓰지 않는다.
+    기존 컴포넌트의 stats 딕셔너리는 수집기(collector)로 등록해 노출 시점에 읽는다.
+    단조 증가하는 값은 counter 수집기로 등록하면 이름에 _total을 붙여 내보낸다.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = (
+            []
+        )
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(name, Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(name, Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Sample]],
+        metric_type: str = "gauge",
+    ) -> None:
+        if metric_type not in ("gauge", "counter"):
+            raise ValueError(f"지원하지 않는 수집기 타입: {metric_type}")
+        if metric_type == "counter" and not name.endswith("_total"):
+            name = f"{name}_total"
+        self._collectors.append((name, documentation, metric_type, collect))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(0.0.4)으로 만든다."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for name, documentation, metric_type, collect in self._collectors:
+            lines.extend(_header(name, documentation, metric_type))
+            for labels, value in collect():
+                lines.append(
+                    f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} "
+                    f"{_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def _register(self, name: str, metric):
+        existing = self._metrics.get(name)
+        if existing is not None:
+            return existing
+        self._metrics[name] = metric
+        return metric
+
+
+def stats_samples(
+    stats: Mapping[str, object],
+    keys: Optional[Collection[str]] = None,
+    **labels: str,
+) -> List[Sample]:
+    """
+    {키: 숫자} 형태의 stats 딕셔너리를 {key="..."} 라벨을 단 샘플로 바꾼다.
+    keys를 주면 그 키만 내보낸다(counter와 gauge를 서로 다른 계열로 나눌 때 쓴다).
+    """
+    return [
+        ({**labels, "key": key}, float(value))
+        for key, value in stats.items()
+        if (keys is None or key in keys)
+        and isinstance(value, (int, float))
+        and not isinstance(value, bool)
+    ]
+
+
+def _label_key(labelnames: Tuple[str, ...], labels: Mapping[str, str]) -> tuple:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _header(name: str, documentation: str, metric_type: str) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+metrics = MetricsRegistry()
+
+stage_seconds = metrics.histogram(
+    "qasker_stage_duration_seconds",
+    "log_elapsed로 측정한 처리 단계별 소요 시간",
+    ("stage",),
+)
+upstream_seconds = metrics.histogram(
+    "qasker_upstream_request_duration_seconds",
+    "Responses API 호출 1회(시도 단위)의 소요 시간",
+    ("model", "outcome"),
+)
+chunk_quizzes = metrics.histogram(
+    "qasker_chunk_quizzes",
+    "청크 1개가 내보낸 퀴즈 수",
+    (),
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20),
+)
+chunk_failures = metrics.counter(
+    "qasker_chunk_failures_total",
+    "퀴즈를 하나도 내지 못한 청크 수",
+    ("reason",),
+)
+rate_limit_rejections = metrics.counter(
+    "qasker_rate_limit_rejections_total",
+    "레이트 리밋으로 거절된 /generation 요청 수",
+)
+client_disconnects = metrics.counter(
+    "qasker_client_disconnects_total",
+    "스트리밍 중 클라이언트가 연결을 끊어 닫힌 스트림 수",
+)
+generation_ttfb_seconds = metrics.histogram(
+    "qasker_generation_ttfb_seconds",
+    "/generation 요청을 받은 뒤 첫 퀴즈 줄을 내보내기까지의 시간",
+    ("cache", "scheduling"),
+)
+deadline_exceeded = metrics.counter(
+    "qasker_deadline_exceeded_total",
+    "요청 마감 시간을 넘겨 중단된 단계 수",
+    ("stage",),
+)
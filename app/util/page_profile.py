@@ -0,0 +1,87 @@
+import os
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+import orjson
+
+from app.util.logger import logger
+
+if TYPE_CHECKING:
+    import tiktoken
+
+# PDF 입력은 페이지마다 텍스트와 함께 페이지 이미지가 전달되므로 이미지 토큰을 추정해 더한다.
+PDF_PAGE_IMAGE_TOKENS = int(os.getenv("PDF_PAGE_IMAGE_TOKENS", "800"))
+# 텍스트 모드로 보내도 정보 손실이 적다고 볼 페이지당 최소 토큰 수
+TEXT_MODE_MIN_PAGE_TOKENS = int(os.getenv("TEXT_MODE_MIN_PAGE_TOKENS", "60"))
+
+
+@dataclass(frozen=True)
+class PageProfile:
+    page_number: int
+    text: str
+    tokens: int
+    image_count: int
+
+
+@lru_cache(maxsize=1)
+def get_encoding() -> Optional["tiktoken.Encoding"]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # 인코딩 파일을 받을 수 없는 환경에서는 문자 수 기반 근사치로 대신한다.
+        logger.warning(f"tiktoken 인코딩 로드 실패, 근사치 사용: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = get_encoding()
+    if encoding is None:
+        return (len(text) + 2) // 3
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def estimate_pdf_tokens(profiles: Sequence[PageProfile]) -> int:
+    return sum(p.tokens + PDF_PAGE_IMAGE_TOKENS for p in profiles)
+
+
+def estimate_text_tokens(profiles: Sequence[PageProfile]) -> int:
+    return sum(p.tokens for p in profiles)
+
+
+def estimate_page_image_tokens(profile: PageProfile) -> int:
+    """페이지에 들어 있는 이미지 내용의 추정 토큰. 텍스트 모드로 보내면 이만큼의 정보가 빠진다."""
+    return profile.image_count * PDF_PAGE_IMAGE_TOKENS
+
+
+def prefers_text(profiles: Sequence[PageProfile]) -> bool:
+    """
+    모든 페이지가 텍스트가 충분하고 텍스트 토큰이 이미지 토큰 추정치 이상이면 텍스트 모드를 고른다.
+    이미지가 내용의 대부분인 페이지가 하나라도 있으면 PDF로 보낸다.
+    """
+    if not profiles:
+        return False
+    return all(
+        p.tokens >= TEXT_MODE_MIN_PAGE_TOKENS
+        and p.tokens >= estimate_page_image_tokens(p)
+        for p in profiles
+    )
+
+
+def page_weight(profile: PageProfile) -> float:
+    """청크 분배에 쓰는 페이지 내용 가중치(추정 입력 토큰)"""
+    return profile.tokens + estimate_page_image_tokens(profile)
+
+
+def format_pages_as_text(profiles: Sequence[PageProfile]) -> str:
+    return "\n\n".join(f"## p.{p.page_number}\n{p.text.strip()}" for p in profiles)
+
+
+def dumps_profiles(profiles: Sequence[PageProfile]) -> bytes:
+    return orjson.dumps([asdict(p) for p in profiles])
+
+
+def loads_profiles(content: bytes) -> List[PageProfile]:
+    return [PageProfile(**p) for p in orjson.loads(content)]
@@ -0,0 +1,156 @@
+import asyncio
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+from app.util.page_profile import PageProfile, count_tokens, get_encoding
+
+if TYPE_CHECKING:
+    import fitz
+
+PDF_SLICE_WORKERS = int(os.getenv("PDF_SLICE_WORKERS", str(os.cpu_count() or 1)))
+# 텍스트 추출 작업 1건이 맡는 페이지 수
+PDF_PROFILE_PAGES_PER_TASK = int(os.getenv("PDF_PROFILE_PAGES_PER_TASK", "50"))
+
+# 워커 프로세스마다 열어둔 원본 문서 (경로 -> Document)
+_MAX_OPEN_DOCUMENTS = 4
+_open_documents: "OrderedDict[str, fitz.Document]" = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def get_slice_executor() -> ProcessPoolExecutor:
+    """PDF 분할용 프로세스 풀을 캐싱하여(싱글톤처럼) 제공한다."""
+    return ProcessPoolExecutor(max_workers=PDF_SLICE_WORKERS)
+
+
+class PdfSlicer:
+    """
+    문서 캐시에 내려둔 원본 PDF 파일에서 청크별 페이지 부분집합을
+    프로세스 풀에서 만들어 청크마다 개별적으로 await 할 수 있게 한다.
+    워커 프로세스는 같은 문서를 한 번만 파싱해 재사용한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._slices: Dict[Tuple[int, ...], asyncio.Future] = {}
+
+    def slice(self, pages: Sequence[int]) -> "asyncio.Future[bytes]":
+        """
+        페이지 부분집합 PDF를 만드는 작업을 제출한다. 진행 중인 같은 페이지 조합은 한 번만 만든다.
+        끝난 작업은 바로 잊어 결과 바이트를 슬라이서가 붙잡고 있지 않게 한다(재사용은 문서 캐시 몫).
+        """
+        pages_key = tuple(pages)
+        future = self._slices.get(pages_key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                get_slice_executor(), _slice_pages, self.path, pages_key
+            )
+            self._slices[pages_key] = future
+            future.add_done_callback(lambda f: self._forget(pages_key, f))
+        return future
+
+    def _forget(self, pages_key: Tuple[int, ...], future: asyncio.Future) -> None:
+        if self._slices.get(pages_key) is future:
+            del self._slices[pages_key]
+
+    async def profile_pages(self, pages: Sequence[int]) -> List[PageProfile]:
+        """
+        지정한 페이지의 텍스트/토큰 수/이미지 수를 페이지 묶음별로 나눠 병렬 추출한다.
+        문서에 없는 페이지 번호는 건너뛴다.
+        """
+        loop = asyncio.get_running_loop()
+        executor = get_slice_executor()
+        page_numbers = sorted(set(pages))
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor,
+                    _profile_pages,
+                    self.path,
+                    tuple(page_numbers[start : start + PDF_PROFILE_PAGES_PER_TASK]),
+                )
+                for start in range(0, len(page_numbers), PDF_PROFILE_PAGES_PER_TASK)
+            ]
+        )
+        return [profile for profiles in results for profile in profiles]
+
+    async def close(self) -> None:
+        # 워커가 아직 파일을 읽는 중일 수 있으므로 제출한 작업이 끝날 때까지 기다린다.
+        pending = [f for f in self._slices.values() if not f.done()]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._slices.clear()
+
+
+async def warm_up_slice_executor() -> None:
+    """워커 프로세스를 모두 띄우고 PyMuPDF와 토크나이저를 미리 불러 둔다."""
+    loop = asyncio.get_running_loop()
+    executor = get_slice_executor()
+    await asyncio.gather(
+        *[
+            loop.run_in_executor(executor, _warm_up_worker)
+            for _ in range(PDF_SLICE_WORKERS)
+        ]
+    )
+
+
+def _warm_up_worker() -> None:
+    import fitz  # noqa: F401
+
+    get_encoding()
+
+
+def _open_document(path: str) -> "fitz.Document":
+    # PyMuPDF는 무거우므로 워커 프로세스에서 처음 쓸 때 불러온다.
+    import fitz
+
+    document = _open_documents.get(path)
+    if document is not None:
+        _open_documents.move_to_end(path)
+        return document
+
+    document = fitz.open(path)
+    _open_documents[path] = document
+    while len(_open_documents) > _MAX_OPEN_DOCUMENTS:
+        _, evicted = _open_documents.popitem(last=False)
+        evicted.close()
+    return document
+
+
+def _slice_pages(path: str, pages: Tuple[int, ...]) -> bytes:
+    """(워커 프로세스) 원본 문서에서 지정한 페이지만 담은 PDF를 만든다."""
+    import fitz
+
+    source = _open_document(path)
+    target = fitz.open()
+    for page_number in pages:
+        page_index = page_number - 1
+        if 0 <= page_index < len(source):
+            target.insert_pdf(source, from_page=page_index, to_page=page_index)
+    pdf_bytes = target.tobytes()
+    target.close()
+    return pdf_bytes
+
+
+def _profile_pages(path: str, pages: Tuple[int, ...]) -> List[PageProfile]:
+    """(워커 프로세스) 지정한 페이지의 텍스트와 토큰 수, 이미지 수를 구한다."""
+    source = _open_document(path)
+    profiles = []
+    for page_number in pages:
+        page_index = page_number - 1
+        if not 0 <= page_index < len(source):
+            continue
+        page = source[page_index]
+        text = page.get_text()
+        profiles.append(
+            PageProfile(
+                page_number=page_number,
+                text=text,
+                tokens=count_tokens(text),
+                image_count=len(page.get_images()),
+            )
+        )
+    return profiles
@@ -0,0 +1,62 @@
+from typing import Any, List
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.dto.response.generate_response import ProblemResponse
+
+# 검증기는 한 번만 만들어 재사용한다.
+_problem_responses_adapter: TypeAdapter[List[ProblemResponse]] = TypeAdapter(
+    List[ProblemResponse]
+)
+_problem_response_adapter: TypeAdapter[ProblemResponse] = TypeAdapter(ProblemResponse)
+
+
+def decode_problem_responses(
+    text: str, referenced_pages: List[int]
+) -> List[ProblemResponse]:
+    """
+    problem_set 응답 문자열을 중간 모델 없이 바로 응답 DTO 목록으로 검증한다.
+    번호는 0으로 두고, 스트림에서 구독자마다 다시 매긴다.
+    """
+    data = _loads_problem_set(text)
+    quiz = data.get("quiz") if isinstance(data, dict) else None
+    if not isinstance(quiz, list):
+        raise ValueError("응답에 quiz 목록이 없습니다")
+    return _problem_responses_adapter.validate_python(
+        [_with_response_fields(q, referenced_pages) for q in quiz]
+    )
+
+
+def decode_problem_response(item: Any, referenced_pages: List[int]) -> ProblemResponse:
+    """스트리밍 파서가 꺼낸 문제 객체 하나를 검증한다."""
+    return _problem_response_adapter.validate_python(
+        _with_response_fields(item, referenced_pages)
+    )
+
+
+def _with_response_fields(item: Any, referenced_pages: List[int]) -> Any:
+    if not isinstance(item, dict):
+        return item
+    return {**item, "number": 0, "referencedPages": referenced_pages}
+
+
+def _loads_problem_set(text: str) -> Any:
+    # Structured Outputs(strict) 응답은 그대로 JSON이므로 대부분 첫 시도에서 끝난다.
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+
+    # 코드 펜스/잡문: 가장 바깥 중괄호 구간만 잘라 다시 시도한다.
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        try:
+            return orjson.loads(text[start : end + 1])
+        except orjson.JSONDecodeError:
+            pass
+
+    # 잘린 JSON 등은 LangChain의 관대한 파서에 맡긴다. 빠른 경로에서는 불러오지 않는다.
+    from langchain_core.utils.json import parse_json_markdown
+
+    return parse_json_markdown(text)
@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+from app.util.logger import logger
+from app.util.usage_accounting import extract_token_usage
+
+
+class PromptCacheStats:
+    """응답 usage의 cached_tokens로 모델별 업스트림 프롬프트 캐시 적중 비율을 집계한다."""
+
+    def __init__(self):
+        self.models: Dict[str, Dict[str, int]] = {}
+
+    def observe(self, model: str, usage: Any) -> None:
+        token_usage = extract_token_usage(usage)
+        if token_usage is None:
+            return
+        input_tokens = token_usage.input_tokens
+        cached_tokens = token_usage.cached_tokens
+
+        totals = self.models.get(model)
+        if totals is None:
+            totals = self.models[model] = {
+                "calls": 0,
+                "input_tokens": 0,
+                "cached_tokens": 0,
+            }
+        totals["calls"] += 1
+        totals["input_tokens"] += input_tokens
+        totals["cached_tokens"] += cached_tokens
+
+        if input_tokens:
+            logger.info(
+                f"프롬프트 캐시: {model} cached={cached_tokens}/{input_tokens} "
+                f"({cached_tokens / input_tokens:.1%})"
+            )
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            model: {
+                **totals,
+                "cached_ratio": (
+                    round(totals["cached_tokens"] / totals["input_tokens"], 4)
+                    if totals["input_tokens"]
+                    else 0.0
+                ),
+            }
+            for model, totals in self.models.items()
+        }
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+prompt_cache_stats = PromptCacheStats()
@@ -1,43 +1,142 @@
-import asyncio
 import os
 import time
-from collections import deque
+from typing import Callable, Dict, Optional, Protocol, Tuple
 
 from fastapi import HTTPException
+from redis import asyncio as aioredis
+from redis.commands.core import AsyncScript
 
+from app.adapter.redis_client import get_redis_client
+from app.util.logger import logger
+from app.util.metrics import rate_limit_rejections
 
-class LocalRateLimiter:
-    def __init__(self, window_seconds: int = 60, limit: int = 75):
+# 레이트 리밋 상태 저장소: memory(단일 프로세스) | redis(여러 워커/레플리카 공유)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_KEY = os.getenv("RATE_LIMIT_KEY", "generation")
+
+# GCRA: 키마다 이론적 도착 시각(TAT) 하나만 저장한다.
+# 허용되면 TAT를 cost * interval만큼 밀고, 새 TAT가 now + period를 넘으면 거절한다.
+_GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + cost * interval
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, math.ceil((allow_at - now) * 1000)}
+end
+redis.call('SET', KEYS[1], string.format('%.6f', new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, 0}
+"""
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(
+        self, key: str, cost: int, interval: float, period: float
+    ) -> Tuple[bool, float]:
+        """(허용 여부, 거절 시 다시 시도할 수 있을 때까지의 초)를 돌려준다."""
+        ...
+
+
+class InMemoryRateLimitBackend:
+    """단일 프로세스용. 이벤트 루프 안에서 await 없이 계산하므로 락이 필요 없다."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._tats: Dict[str, float] = {}
+
+    async def acquire(
+        self, key: str, cost: int, interval: float, period: float
+    ) -> Tuple[bool, float]:
+        now = self.clock()
+        tat = max(self._tats.get(key, now), now)
+        new_tat = tat + cost * interval
+        allow_at = new_tat - period
+        if allow_at > now:
+            return False, allow_at - now
+        self._tats[key] = new_tat
+        if len(self._tats) > 10000:
+            # 버킷이 다 찬(TAT가 지난) 키는 저장하지 않은 것과 같으므로 지운다.
+            self._tats = {k: v for k, v in self._tats.items() if v > now}
+        return True, 0.0
+
+
+class RedisRateLimitBackend:
+    """Lua 스크립트로 읽기-계산-쓰기를 원자적으로 처리하고, 시각은 Redis 서버 시계를 쓴다."""
+
+    key_prefix = "qasker:ratelimit:"
+
+    def __init__(self, client_factory: Callable[[], aioredis.Redis] = get_redis_client):
+        self.client_factory = client_factory
+        self._script: Optional[AsyncScript] = None
+
+    async def acquire(
+        self, key: str, cost: int, interval: float, period: float
+    ) -> Tuple[bool, float]:
+        if self._script is None:
+            self._script = self.client_factory().register_script(_GCRA_SCRIPT)
+        allowed, retry_after_ms = await self._script(
+            keys=[self.key_prefix + key], args=[interval, period, cost]
+        )
+        return bool(allowed), int(retry_after_ms) / 1000
+
+
+class RateLimiter:
+    """
+    청크(GPT 호출) 수 기준 토큰 버킷 레이트 리미터 (GCRA 구현).
+    window_seconds 동안 최대 limit개를 허용하며, 버킷이 가득 차 있으면 한 번에 limit개까지 쓸 수 있다.
+    저장소 장애 시에는 요청을 막지 않고 통과시킨다.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        window_seconds: float = 60,
+        limit: int = 75,
+    ):
+        self.backend = backend
         self.window_seconds = window_seconds
         self.limit = limit
-        # 요청 타임스탬프를 저장하는 큐
-        self.requests = deque()
-        # 동시성 제어를 위한 락
-        self.lock = asyncio.Lock()
+        self.stats: Dict[str, int] = {"allowed": 0, "rejected": 0, "errors": 0}
 
-    async def check_rate(self, generate_count: int):
-        now = time.time()
-        window_start = now - self.window_seconds
+    async def check_rate(self, generate_count: int, key: str = RATE_LIMIT_KEY):
+        interval = self.window_seconds / self.limit
+        try:
+            allowed, retry_after = await self.backend.acquire(
+                key, generate_count, interval, self.window_seconds
+            )
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"레이트 리밋 저장소 오류로 요청을 통과시킵니다: {e}")
+            return
 
-        async with self.lock:
-            # 1. 윈도우 밖의 오래된 타임스탬프 제거 (Clean up)
-            while self.requests and self.requests[0] < window_start:
-                self.requests.popleft()
+        if not allowed:
+            self.stats["rejected"] += 1
+            rate_limit_rejections.inc()
+            raise HTTPException(
+                status_code=429,
+                detail="요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(max(int(retry_after + 0.999), 1))},
+            )
+        self.stats["allowed"] += 1
 
-            # 2. 현재 윈도우 내의 요청 수 확인
-            if len(self.requests) + generate_count > self.limit:
-                raise HTTPException(
-                    status_code=429,
-                    detail="요청이 많습니다. 잠시 후 다시 시도해주세요.",
-                )
 
-            # 3. 요청 허용: 새로운 청크 개수만큼 타임스탬프 추가
-            for _ in range(generate_count):
-                self.requests.append(now)
+def create_rate_limit_backend() -> RateLimitBackend:
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend()
+    return InMemoryRateLimitBackend()
 
 
 # 인스턴스 생성 (싱글톤으로 관리 권장)
-rate_limiter = LocalRateLimiter(
+rate_limiter = RateLimiter(
+    create_rate_limit_backend(),
     window_seconds=int(os.environ["RATE_LIMIT_WINDOW_SECONDS"]),
     limit=int(os.environ["RATE_LIMIT_MAX_REQUESTS"]),
 )
@@ -0,0 +1,129 @@
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional, Protocol
+
+import orjson
+from redis import asyncio as aioredis
+
+from app.adapter.redis_client import get_redis_client
+from app.dto.request.generate_request import GenerateRequest
+from app.util.logger import logger
+from app.util.ttl_cache import TTLCache
+
+# 결과 캐시 저장소: memory(프로세스 내) | redis(여러 워커/레플리카 공유)
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+
+
+class ResultCacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[List[str]]: ...
+
+    async def set(self, key: str, lines: List[str], ttl_seconds: float) -> None: ...
+
+
+class InMemoryResultCacheBackend:
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self._cache: TTLCache[List[str]] = TTLCache(
+            max_entries, RESULT_CACHE_TTL_SECONDS
+        )
+
+    @property
+    def evictions(self) -> int:
+        return self._cache.evictions
+
+    async def get(self, key: str) -> Optional[List[str]]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, lines: List[str], ttl_seconds: float) -> None:
+        self._cache.set(key, lines, ttl_seconds)
+
+
+class RedisResultCacheBackend:
+    """
+    Redis에 NDJSON 줄 목록을 저장한다. 만료는 키 TTL로 처리하고,
+    용량 기반 LRU 제거는 Redis의 maxmemory-policy(allkeys-lru 등)에 맡긴다.
+    """
+
+    key_prefix = "qasker:result:"
+
+    def __init__(self, client_factory: Callable[[], aioredis.Redis] = get_redis_client):
+        self.client_factory = client_factory
+
+    async def get(self, key: str) -> Optional[List[str]]:
+        value = await self.client_factory().get(self.key_prefix + key)
+        return orjson.loads(value) if value is not None else None
+
+    async def set(self, key: str, lines: List[str], ttl_seconds: float) -> None:
+        await self.client_factory().set(
+            self.key_prefix + key, orjson.dumps(lines), ex=max(int(ttl_seconds), 1)
+        )
+
+
+class ResultCache:
+    """
+    /generation 결과(청크별 GenerateResponse NDJSON 줄)를 저장하고 재생한다.
+    저장소 장애는 캐시 미스로 취급해 생성 흐름을 막지 않는다.
+    """
+
+    def __init__(
+        self,
+        backend: ResultCacheBackend,
+        ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0}
+
+    async def get(self, key: str) -> Optional[List[str]]:
+        try:
+            lines = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"결과 캐시 조회 실패: {e}")
+            lines = None
+        self.stats["hits" if lines is not None else "misses"] += 1
+        return lines
+
+    async def set(self, key: str, lines: List[str]) -> None:
+        try:
+            await self.backend.set(key, lines, self.ttl_seconds)
+            self.stats["stores"] += 1
+        except Exception as e:
+            logger.warning(f"결과 캐시 저장 실패: {e}")
+
+
+def build_result_key(content_hash: str, generate_request: GenerateRequest) -> str:
+    """문서 해시와 생성 결과에 영향을 주는 요청 필드로 캐시 키를 만든다."""
+    return _request_key({"document": content_hash}, generate_request)
+
+
+def build_url_key(generate_request: GenerateRequest) -> str:
+    """
+    문서 대신 업로드 URL로 만든 키. 문서를 내려받기 전에 진행 중인 같은 생성 작업을 찾을 때 쓴다.
+    URL이 같아도 내용이 바뀔 수 있으므로 결과 캐시 키로는 쓰지 않는다.
+    """
+    return _request_key({"url": generate_request.uploadedUrl}, generate_request)
+
+
+def _request_key(source: dict, generate_request: GenerateRequest) -> str:
+    payload = orjson.dumps(
+        {
+            **source,
+            "pages": generate_request.pageNumbers,
+            "quizCount": generate_request.quizCount,
+            "quizType": generate_request.quizType.value,
+            "difficultyType": generate_request.difficultyType.value,
+            "inputMode": generate_request.inputMode.value,
+        }
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def create_result_cache_backend() -> ResultCacheBackend:
+    if RESULT_CACHE_BACKEND == "redis":
+        return RedisResultCacheBackend()
+    return InMemoryResultCacheBackend()
+
+
+# 인스턴스 생성 (싱글톤으로 관리 권장)
+result_cache = ResultCache(create_result_cache_backend())
@@ -3,6 +3,8 @@ import time
 from contextlib import contextmanager
 from typing import Iterator, Optional
 
+from app.util.metrics import stage_seconds
+
 
 @contextmanager
 def log_elapsed(
@@ -13,7 +15,8 @@ def log_elapsed(
     prefix: str = "소요 시간",
 ) -> Iterator[None]:
     """
-    코드 블록 실행 시간을 측정해 로그로 남깁니다.
+    코드 블록 실행 시간을 측정해 로그로 남기고, name이 있으면
+    qasker_stage_duration_seconds{stage=name} 히스토그램에도 기록합니다.
 
     사용 예)
         with log_elapsed(logger, "request_generate_quiz"):
@@ -24,6 +27,8 @@ def log_elapsed(
         yield
     finally:
         elapsed = time.perf_counter() - start
+        if name:
+            stage_seconds.observe(elapsed, stage=name)
         msg = (
             f"{prefix}: {elapsed:.4f}초"
             if not name
@@ -0,0 +1,166 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional
+
+import orjson
+
+from app.util.logger import logger
+from app.util.metrics import metrics
+
+# 모델별 100만 토큰당 가격(USD). OPENAI_PRICE_TABLE(JSON)로 덮어쓰거나 모델을 추가한다.
+# 예) {"gpt-5-mini": {"input": 0.25, "cached_input": 0.025, "output": 2.0}}
+DEFAULT_PRICE_TABLE: Dict[str, Dict[str, float]] = {
+    "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+    "gpt-5-mini": {"input": 0.25, "cached_input": 0.025, "output": 2.00},
+}
+PRICE_TABLE: Dict[str, Dict[str, float]] = {
+    **DEFAULT_PRICE_TABLE,
+    **orjson.loads(os.getenv("OPENAI_PRICE_TABLE", "{}")),
+}
+
+tokens_total = metrics.counter(
+    "qasker_tokens_total",
+    "Responses API 사용 토큰 수 (kind=input|cached|output, cached는 input에 포함)",
+    ("model", "kind"),
+)
+cost_usd_total = metrics.counter(
+    "qasker_cost_usd_total",
+    "가격표 기준 추정 비용(USD)",
+    ("model",),
+)
+request_cost_usd = metrics.histogram(
+    "qasker_request_cost_usd",
+    "요청(생성/해설) 1건의 추정 비용(USD)",
+    ("endpoint",),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+_unpriced_models: set = set()
+
+
+@dataclass
+class TokenUsage:
+    calls: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, other: "TokenUsage") -> None:
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.cached_tokens += other.cached_tokens
+        self.output_tokens += other.output_tokens
+
+    def cost_usd(self, model: str) -> float:
+        price = PRICE_TABLE.get(model)
+        if price is None:
+            if model not in _unpriced_models:
+                _unpriced_models.add(model)
+                logger.warning(
+                    f"가격표에 없는 모델이라 비용을 0으로 계산합니다: {model}"
+                )
+            return 0.0
+        # cached_tokens는 input_tokens에 포함되어 있으므로 나머지만 정가로 계산한다.
+        uncached = max(self.input_tokens - self.cached_tokens, 0)
+        return (
+            uncached * price.get("input", 0.0)
+            + self.cached_tokens * price.get("cached_input", price.get("input", 0.0))
+            + self.output_tokens * price.get("output", 0.0)
+        ) / 1_000_000
+
+
+class UsageAccumulator:
+    """
+    요청 또는 청크 하나의 모델별 토큰 사용량을 모은다.
+    parent가 있으면 기록이 부모(요청 단위)에도 함께 더해진다.
+    """
+
+    def __init__(self, parent: Optional["UsageAccumulator"] = None):
+        self.parent = parent
+        self.models: Dict[str, TokenUsage] = {}
+
+    def add(self, model: str, usage: TokenUsage) -> None:
+        totals = self.models.get(model)
+        if totals is None:
+            totals = self.models[model] = TokenUsage()
+        totals.add(usage)
+        if self.parent is not None:
+            self.parent.add(model, usage)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(usage.cost_usd(model) for model, usage in self.models.items())
+
+    def summary(self) -> Dict[str, Any]:
+        total = TokenUsage()
+        for usage in self.models.values():
+            total.add(usage)
+        return {
+            **asdict(total),
+            "cost_usd": round(self.cost_usd, 6),
+            "models": {
+                model: {**asdict(usage), "cost_usd": round(usage.cost_usd(model), 6)}
+                for model, usage in self.models.items()
+            },
+        }
+
+    def log(self, scope: str, **fields: Any) -> None:
+        """usage 필드를 JSON 한 줄로 남겨 로그 수집기에서 그대로 파싱할 수 있게 한다."""
+        logger.info(
+            "token_usage "
+            + orjson.dumps({"scope": scope, **fields, **self.summary()}).decode()
+        )
+
+
+_current_usage: ContextVar[Optional[UsageAccumulator]] = ContextVar(
+    "current_usage", default=None
+)
+
+
+@contextmanager
+def usage_scope(accumulator: UsageAccumulator) -> Iterator[UsageAccumulator]:
+    """블록 안(같은 태스크와 그 하위 태스크)의 업스트림 호출 사용량을 accumulator에 모은다."""
+    token = _current_usage.set(accumulator)
+    try:
+        yield accumulator
+    finally:
+        _current_usage.reset(token)
+
+
+def extract_token_usage(usage: Any) -> Optional[TokenUsage]:
+    """
+    Responses API usage(SDK 객체 또는 배치 출력 JSON의 dict)에서 호출 1회분의
+    입력/캐시 적중/출력 토큰 수를 꺼낸다. usage가 없으면 None.
+    """
+    if usage is None:
+        return None
+    details = _usage_field(usage, "input_tokens_details")
+    return TokenUsage(
+        calls=1,
+        input_tokens=_usage_field(usage, "input_tokens") or 0,
+        cached_tokens=_usage_field(details, "cached_tokens") or 0,
+        output_tokens=_usage_field(usage, "output_tokens") or 0,
+    )
+
+
+def _usage_field(usage: Any, name: str) -> Any:
+    if isinstance(usage, dict):
+        return usage.get(name)
+    return getattr(usage, name, None)
+
+
+def record_usage(model: str, usage: Any) -> None:
+    """Responses API 응답의 usage를 현재 범위의 누적기와 메트릭에 기록한다."""
+    token_usage = extract_token_usage(usage)
+    if token_usage is None:
+        return
+    tokens_total.inc(token_usage.input_tokens, model=model, kind="input")
+    tokens_total.inc(token_usage.cached_tokens, model=model, kind="cached")
+    tokens_total.inc(token_usage.output_tokens, model=model, kind="output")
+    cost_usd_total.inc(token_usage.cost_usd(model), model=model)
+
+    accumulator = _current_usage.get()
+    if accumulator is not None:
+        accumulator.add(model, token_usage)
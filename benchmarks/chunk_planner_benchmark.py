@@ -0,0 +1,97 @@
+"""
+청크 분배 벤치마크: create_page_chunks(페이지 수 균등) vs plan_page_chunks(내용 가중치 기반)
+
+합성 페이지 분포마다 청크별 추정 입력 토큰의 최댓값/최솟값/불균형 비율과
+계획 수립 시간을 비교한다.
+
+실행: python -m benchmarks.chunk_planner_benchmark
+"""
+
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from app.util.chunk_planner import plan_page_chunks
+from app.util.create_chunks import ChunkInfo, create_page_chunks
+
+PAGE_COUNT = 300
+QUIZ_COUNT = 30
+MAX_CHUNK_COUNT = 10
+REPEAT = 20
+
+
+def uniform(rng: random.Random) -> List[float]:
+    return [rng.uniform(300, 500) for _ in range(PAGE_COUNT)]
+
+
+def title_slides(rng: random.Random) -> List[float]:
+    # 대부분 제목 슬라이드(가벼움)이고 일부만 빽빽한 본문
+    return [
+        rng.uniform(1500, 2500) if rng.random() < 0.2 else rng.uniform(20, 80)
+        for _ in range(PAGE_COUNT)
+    ]
+
+
+def dense_tail(rng: random.Random) -> List[float]:
+    # 뒤로 갈수록 내용이 많아지는 강의(부록/예제 위주)
+    return [
+        rng.uniform(50, 150) + 3000 * (i / PAGE_COUNT) ** 3 for i in range(PAGE_COUNT)
+    ]
+
+
+def long_tail(rng: random.Random) -> List[float]:
+    return [min(rng.paretovariate(1.2) * 100, 8000) for _ in range(PAGE_COUNT)]
+
+
+DISTRIBUTIONS: Dict[str, Callable[[random.Random], List[float]]] = {
+    "uniform": uniform,
+    "title_slides": title_slides,
+    "dense_tail": dense_tail,
+    "long_tail": long_tail,
+}
+
+
+def chunk_loads(chunks: List[ChunkInfo], weights: List[float]) -> List[float]:
+    return [sum(weights[p - 1] for p in c.referenced_pages) for c in chunks]
+
+
+def imbalance(loads: List[float]) -> float:
+    """가장 무거운 청크 부하 / 평균 청크 부하 (1.0이면 완전 균등)"""
+    return max(loads) / max(statistics.mean(loads), 1e-9)
+
+
+def main() -> None:
+    page_numbers = list(range(1, PAGE_COUNT + 1))
+    for dist_name, make_weights in DISTRIBUTIONS.items():
+        rng = random.Random(42)
+        results = {"even": [], "weighted": []}
+        timings = {"even": 0.0, "weighted": 0.0}
+        for _ in range(REPEAT):
+            weights = make_weights(rng)
+
+            start = time.perf_counter()
+            even = create_page_chunks(page_numbers, QUIZ_COUNT, MAX_CHUNK_COUNT)
+            timings["even"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            weighted = plan_page_chunks(
+                page_numbers, weights, QUIZ_COUNT, MAX_CHUNK_COUNT
+            )
+            timings["weighted"] += time.perf_counter() - start
+
+            assert sum(c.quiz_count for c in weighted) == QUIZ_COUNT
+            results["even"].append(imbalance(chunk_loads(even, weights)))
+            results["weighted"].append(imbalance(chunk_loads(weighted, weights)))
+
+        print(f"[{dist_name}] 청크 부하 불균형(max/mean), {REPEAT}회 평균")
+        for name in ("even", "weighted"):
+            print(
+                f"  {name:<8} imbalance={statistics.mean(results[name]):>5.2f} "
+                f"worst={max(results[name]):>5.2f} "
+                f"plan={timings[name] / REPEAT * 1e3:>7.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+응답 디코딩 벤치마크: LangChain JsonOutputParser(dict) → ProblemResponse vs
+orjson + 캐시된 TypeAdapter로 ProblemResponse 직접 검증
+
+실제 응답과 비슷한 한국어 문제 묶음(청크당 문제 수별)을 만들어 청크 1개 디코딩 시간을 비교한다.
+
+실행: python -m benchmarks.decode_benchmark
+"""
+
+import json
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from langchain_core.output_parsers import JsonOutputParser
+
+from app.dto.model.problem_set import ProblemSet, Selection
+from app.dto.response.generate_response import ProblemResponse
+from app.util.problem_decoder import decode_problem_responses
+
+PROBLEMS_PER_CHUNK = [1, 3, 6]
+REPEAT = 2000
+REFERENCED_PAGES = [3, 4, 5, 6, 7, 8]
+
+
+def make_payload(rng: random.Random, problem_count: int) -> str:
+    def sentence(length: int) -> str:
+        words = ["강의", "개념", "정의", "예시", "알고리즘", "복잡도", "구조", "증명"]
+        return " ".join(rng.choice(words) for _ in range(length))
+
+    quiz = [
+        {
+            "number": i + 1,
+            "title": sentence(25) + "?",
+            "selections": [
+                {"content": sentence(8), "correct": j == 0} for j in range(4)
+            ],
+            "explanation": "\n".join(sentence(20) for _ in range(5)),
+        }
+        for i in range(problem_count)
+    ]
+    return json.dumps({"quiz": quiz}, ensure_ascii=False)
+
+
+def langchain_path(text: str) -> List[ProblemResponse]:
+    # 기존 경로: 청크마다 파서를 만들고 dict로 파싱한 뒤 응답 모델로 다시 검증한다.
+    parser = JsonOutputParser(pydantic_object=ProblemSet)
+    data = parser.parse(text)
+    return [
+        ProblemResponse(
+            number=0,
+            title=q.get("title"),
+            selections=q.get("selections", []),
+            explanation=q.get("explanation"),
+            referencedPages=REFERENCED_PAGES,
+        )
+        for q in data.get("quiz", [])
+    ]
+
+
+def direct_path(text: str) -> List[ProblemResponse]:
+    return decode_problem_responses(text, REFERENCED_PAGES)
+
+
+def fenced_path(text: str) -> List[ProblemResponse]:
+    # 비정상 출력(코드 펜스) 폴백 경로
+    return direct_path(f"```json\n{text}\n```")
+
+
+PATHS: Dict[str, Callable[[str], List[ProblemResponse]]] = {
+    "langchain": langchain_path,
+    "direct": direct_path,
+    "fallback": fenced_path,
+}
+
+
+def main() -> None:
+    rng = random.Random(42)
+    for problem_count in PROBLEMS_PER_CHUNK:
+        payload = make_payload(rng, problem_count)
+        expected = langchain_path(payload)
+        print(
+            f"[문제 {problem_count}개/청크] payload={len(payload.encode())} bytes, "
+            f"{REPEAT}회"
+        )
+        for name, decode in PATHS.items():
+            result = decode(payload)
+            assert [p.title for p in result] == [p.title for p in expected]
+            assert all(isinstance(s, Selection) for p in result for s in p.selections)
+
+            samples = []
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                decode(payload)
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            print(
+                f"  {name:<10} mean={statistics.mean(samples) * 1e6:>8.1f}us "
+                f"p50={samples[len(samples) // 2] * 1e6:>8.1f}us "
+                f"p99={samples[int(len(samples) * 0.99)] * 1e6:>8.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
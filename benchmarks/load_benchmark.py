@@ -0,0 +1,511 @@
+"""
+부하 벤치마크: 모의 OpenAI 서버에 붙인 앱에 동시 요청을 보내 지연/메모리/루프 지연을 잰다.
+
+1. 모의 서버(benchmarks.mock_openai_server)와 합성 PDF를 제공하는 정적 서버를 띄운다.
+2. 모의 서버를 바라보는 앱(uvicorn)을 띄우고 /ready가 200이 될 때까지 기다린다.
+3. --concurrency 동시성으로 --requests 건의 /generation 또는 /specific-explanation을 보낸다.
+4. 요청별 TTFB(첫 바이트 = 첫 NDJSON 줄)와 완료 시간의 p50/p95/p99,
+   앱 프로세스와 자식 워커 프로세스를 합친 RSS(기준/최대/종료), /metrics의 이벤트 루프 지연 분포를 출력한다.
+
+기준값을 넘으면 종료 코드 1로 끝나 배포 전에 회귀를 잡을 수 있다.
+
+실행: python -m benchmarks.load_benchmark --scenario generation --requests 100 --concurrency 20 \\
+        [--mock-args "--latency lognormal:1.5:0.4 --error-rate 0.02"] [--app-env GENERATION_STREAM_MODE=problem]
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import orjson
+
+from benchmarks.startup_benchmark import free_port
+
+READY_TIMEOUT_SECONDS = 60
+RSS_SAMPLE_INTERVAL_SECONDS = 0.1
+LOOP_LAG_METRIC = "qasker_event_loop_lag_seconds"
+
+# 앱 기동에 필요한 최소 환경변수. --app-env로 덮어쓸 수 있다.
+DEFAULT_APP_ENV = {
+    "OPENAI_API_KEY": "sk-load-benchmark",
+    "GPT_REQUEST_TIMEOUT": "60",
+    "MAX_CHUNK_COUNT": "10",
+    "RATE_LIMIT_WINDOW_SECONDS": "60",
+    "RATE_LIMIT_MAX_REQUESTS": "1000000",
+}
+
+
+@dataclass
+class RequestResult:
+    ok: bool
+    ttfb: Optional[float]
+    completion: float
+    quizzes: int = 0
+
+
+def build_pdf(directory: str, pages: int, image_kb: int = 0) -> str:
+    """합성 강의 PDF를 만든다. image_kb > 0이면 페이지마다 압축되지 않는 노이즈 이미지를 넣는다."""
+    import fitz
+
+    path = os.path.join(directory, "lecture.pdf")
+    document = fitz.open()
+    side = int(math.sqrt(image_kb * 1024 / 3)) if image_kb > 0 else 0
+    for page_number in range(1, pages + 1):
+        page = document.new_page()
+        body = " ".join(f"concept-{page_number}-{i}" for i in range(120))
+        page.insert_textbox(
+            fitz.Rect(40, 40, 560, 400), f"Lecture page {page_number}\n{body}"
+        )
+        if side:
+            pixmap = fitz.Pixmap(fitz.csRGB, side, side, os.urandom(side * side * 3), 0)
+            page.insert_image(fitz.Rect(40, 420, 560, 800), pixmap=pixmap)
+    document.save(path)
+    document.close()
+    return path
+
+
+def serve_directory(directory: str) -> Tuple[ThreadingHTTPServer, int]:
+    handler = partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_process(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def stop_process(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def wait_until(url: str, expected_status: int = 200) -> None:
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=1) as client:
+        while time.perf_counter() - started < READY_TIMEOUT_SECONDS:
+            try:
+                if (await client.get(url)).status_code == expected_status:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"{READY_TIMEOUT_SECONDS}초 안에 응답하지 않았습니다: {url}")
+
+
+def read_rss_bytes(pid: int, field: str = "VmRSS") -> Optional[int]:
+    """리눅스 /proc에서 VmRSS(현재) 또는 VmHWM(최고치)을 읽는다. 다른 플랫폼에서는 None."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def descendant_pids(pid: int) -> List[int]:
+    """/proc의 부모 PID를 따라 pid의 모든 자손 프로세스(PDF 처리 워커 등)를 찾는다."""
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # 두 번째 필드(comm)에 공백이 있을 수 있어 마지막 ')' 뒤에서 자른다.
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    found: List[int] = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def read_tree_rss_bytes(pid: int) -> Optional[int]:
+    """
+    pid와 모든 자손 프로세스의 메모리 합계.
+    fork된 워커는 부모와 페이지를 공유하므로 공유 페이지를 나눠 세는 PSS를 쓰고,
+    smaps_rollup을 읽을 수 없으면 RSS로 대신한다.
+    """
+    total = None
+    for member in [pid, *descendant_pids(pid)]:
+        size = _read_pss_bytes(member)
+        if size is None:
+            size = read_rss_bytes(member)
+        if size is not None:
+            total = (total or 0) + size
+    return total
+
+
+def _read_pss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as rollup:
+            for line in rollup:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+async def sample_rss(pid: int, samples: List[int], stop: asyncio.Event) -> None:
+    """앱 프로세스와 자손 프로세스의 메모리 합계를 주기적으로 잰다."""
+    while not stop.is_set():
+        rss = await asyncio.to_thread(read_tree_rss_bytes, pid)
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def parse_histogram(text: str, name: str) -> Dict[float, float]:
+    """Prometheus 텍스트에서 라벨 없는 히스토그램의 누적 버킷 {le: 개수}를 읽는다."""
+    buckets = {}
+    pattern = re.compile(rf'^{name}_bucket\{{le="([^"]+)"\}} (\S+)$')
+    for line in text.splitlines():
+        match = pattern.match(line)
+        if match:
+            le = math.inf if match.group(1) == "+Inf" else float(match.group(1))
+            buckets[le] = float(match.group(2))
+    return buckets
+
+
+def parse_gauge(text: str, name: str, key: str) -> Optional[float]:
+    match = re.search(rf'^{name}\{{key="{key}"\}} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def histogram_quantile(
+    before: Dict[float, float], after: Dict[float, float], q: float
+) -> Optional[float]:
+    """두 스크레이프 사이 관측치의 분위수를 버킷 상한으로 어림한다."""
+    bounds = sorted(after)
+    counts = [after[b] - before.get(b, 0.0) for b in bounds]
+    if not counts or counts[-1] <= 0:
+        return None
+    target = q * counts[-1]
+    for bound, count in zip(bounds, counts):
+        if count >= target:
+            return bound
+    return bounds[-1]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(max(math.ceil(q * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+def build_payload(args: argparse.Namespace, pdf_url: str, index: int) -> Tuple:
+    scenario = args.scenario
+    if scenario == "mixed":
+        scenario = "explanation" if index % 4 == 3 else "generation"
+    if scenario == "explanation":
+        return "/specific-explanation", {
+            "title": f"다음 중 올바른 설명은? ({index})",
+            "selections": [
+                {"content": f"선택지 {i + 1}", "correct": i == 0} for i in range(4)
+            ],
+        }
+    return "/generation", {
+        "uploadedUrl": pdf_url,
+        "quizCount": args.quiz_count,
+        "difficultyType": "RECALL",
+        "quizType": "MULTIPLE",
+        "pageNumbers": list(range(1, args.pages + 1)),
+        "inputMode": args.input_mode,
+        "useCache": args.use_cache,
+    }
+
+
+async def send_request(
+    client: httpx.AsyncClient, path: str, payload: dict
+) -> RequestResult:
+    started = time.perf_counter()
+    ttfb = None
+    body = bytearray()
+    try:
+        async with client.stream("POST", path, json=payload) as response:
+            async for chunk in response.aiter_bytes():
+                if ttfb is None and chunk:
+                    ttfb = time.perf_counter() - started
+                body.extend(chunk)
+            ok = response.status_code == 200
+    except httpx.HTTPError:
+        return RequestResult(False, ttfb, time.perf_counter() - started)
+    completion = time.perf_counter() - started
+
+    quizzes = 0
+    if ok and path == "/generation":
+        for line in bytes(body).splitlines():
+            quizzes += len(orjson.loads(line).get("quiz", []))
+        ok = quizzes > 0
+    return RequestResult(ok, ttfb, completion, quizzes)
+
+
+async def drive_load(
+    args: argparse.Namespace, app_url: str, pdf_url: str
+) -> Tuple[List[RequestResult], float]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=app_url, timeout=args.request_timeout, limits=limits
+    ) as client:
+
+        async def one(index: int) -> RequestResult:
+            async with semaphore:
+                path, payload = build_payload(args, pdf_url, index)
+                return await send_request(client, path, payload)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(args.requests)))
+        return list(results), time.perf_counter() - started
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None,
+    }
+
+
+def format_seconds(summary: Dict[str, Optional[float]]) -> str:
+    return " ".join(
+        f"{key}={'-' if value is None else f'{value:.3f}s'}"
+        for key, value in summary.items()
+    )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as workdir:
+        build_pdf(workdir, args.pages, args.image_kb)
+        static_server, static_port = serve_directory(workdir)
+        mock_port, app_port = free_port(), free_port()
+        mock = start_process(
+            [
+                "-m",
+                "benchmarks.mock_openai_server",
+                "--port",
+                str(mock_port),
+                *shlex.split(args.mock_args),
+            ],
+            dict(os.environ),
+        )
+        app_env = {
+            **os.environ,
+            **DEFAULT_APP_ENV,
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{mock_port}/v1",
+            "DOCUMENT_CACHE_DIR": os.path.join(workdir, "document-cache"),
+            **dict(item.split("=", 1) for item in args.app_env),
+        }
+        app = start_process(
+            ["-m", "uvicorn", "app.main:app", "--port", str(app_port)], app_env
+        )
+        app_url = f"http://127.0.0.1:{app_port}"
+        mock_url = f"http://127.0.0.1:{mock_port}"
+        try:
+            await wait_until(f"{mock_url}/mock/stats")
+            await wait_until(f"{app_url}/ready")
+            async with httpx.AsyncClient(timeout=10) as client:
+                metrics_before = (await client.get(f"{app_url}/metrics")).text
+
+            rss_samples: List[int] = []
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(sample_rss(app.pid, rss_samples, stop))
+            results, elapsed = await drive_load(
+                args, app_url, f"http://127.0.0.1:{static_port}/lecture.pdf"
+            )
+            stop.set()
+            await sampler
+            rss_high_water = read_rss_bytes(app.pid, "VmHWM")
+
+            async with httpx.AsyncClient(timeout=10) as client:
+                metrics_after = (await client.get(f"{app_url}/metrics")).text
+                mock_stats = (await client.get(f"{mock_url}/mock/stats")).json()
+        finally:
+            stop_process(app)
+            stop_process(mock)
+            static_server.shutdown()
+
+    lag_before = parse_histogram(metrics_before, LOOP_LAG_METRIC)
+    lag_after = parse_histogram(metrics_after, LOOP_LAG_METRIC)
+    succeeded = [r for r in results if r.ok]
+    return {
+        "scenario": args.scenario,
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "errors": len(results) - len(succeeded),
+        "error_rate": (len(results) - len(succeeded)) / max(len(results), 1),
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(succeeded) / elapsed if elapsed else 0.0,
+        "quizzes": sum(r.quizzes for r in succeeded),
+        "ttfb_seconds": summarize([r.ttfb for r in succeeded if r.ttfb is not None]),
+        "completion_seconds": summarize([r.completion for r in succeeded]),
+        "rss_mb": {
+            "start": rss_samples[0] / 2**20 if rss_samples else None,
+            "peak": max(rss_samples) / 2**20 if rss_samples else None,
+            "end": rss_samples[-1] / 2**20 if rss_samples else None,
+            # 앱 프로세스 단독 최고치(VmHWM, 샘플링 사이 순간값 포함)와
+            # 자손 프로세스까지 더한 샘플 최댓값 중 큰 값
+            "high_water": (
+                max(rss_high_water or 0, max(rss_samples, default=0)) / 2**20
+                if rss_high_water or rss_samples
+                else None
+            ),
+        },
+        "loop_lag_seconds": {
+            "p50": histogram_quantile(lag_before, lag_after, 0.50),
+            "p95": histogram_quantile(lag_before, lag_after, 0.95),
+            "p99": histogram_quantile(lag_before, lag_after, 0.99),
+            # 프로세스 기동 이후 최댓값이라 워밍업 중 지연이 섞일 수 있다.
+            "max": parse_gauge(metrics_after, "qasker_event_loop", "lag_seconds_max"),
+        },
+        "upstream": mock_stats,
+    }
+
+
+def report(result: Dict[str, object]) -> None:
+    rss = result["rss_mb"]
+    lag = result["loop_lag_seconds"]
+    print(
+        f"scenario={result['scenario']} requests={result['requests']} "
+        f"concurrency={result['concurrency']} errors={result['errors']} "
+        f"elapsed={result['elapsed_seconds']:.2f}s "
+        f"throughput={result['throughput_rps']:.2f}req/s quizzes={result['quizzes']}"
+    )
+    print(f"ttfb        {format_seconds(result['ttfb_seconds'])}")
+    print(f"completion  {format_seconds(result['completion_seconds'])}")
+    if rss["peak"] is not None:
+        print(
+            f"rss         start={rss['start']:.1f}MB peak={rss['peak']:.1f}MB "
+            f"end={rss['end']:.1f}MB high_water={rss['high_water'] or 0:.1f}MB"
+        )
+    print(
+        "loop_lag    "
+        + " ".join(
+            f"{key}{'<=' if key != 'max' else '='}"
+            f"{'-' if value is None else f'{value:.3f}s'}"
+            for key, value in lag.items()
+        )
+    )
+    print(f"upstream    {result['upstream']}")
+
+
+def check_thresholds(args: argparse.Namespace, result: Dict[str, object]) -> bool:
+    failed = False
+    for label, limit, value in (
+        ("p95 TTFB", args.max_p95_ttfb_seconds, result["ttfb_seconds"]["p95"]),
+        (
+            "p95 완료 시간",
+            args.max_p95_completion_seconds,
+            result["completion_seconds"]["p95"],
+        ),
+        ("최대 RSS(MB)", args.max_peak_rss_mb, result["rss_mb"]["high_water"]),
+        (
+            "p99 루프 지연",
+            args.max_p99_loop_lag_seconds,
+            result["loop_lag_seconds"]["p99"],
+        ),
+        ("오류율", args.max_error_rate, result["error_rate"]),
+    ):
+        if limit is not None and value is not None and value > limit:
+            print(f"{label} 기준 초과: {value:.3f} > {limit}")
+            failed = True
+    return failed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--scenario",
+        choices=("generation", "explanation", "mixed"),
+        default="generation",
+    )
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--quiz-count", type=int, default=10)
+    parser.add_argument(
+        "--image-kb", type=int, default=0, help="페이지마다 넣을 노이즈 이미지 크기(KB)"
+    )
+    parser.add_argument("--input-mode", choices=("PDF", "TEXT", "AUTO"), default="PDF")
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="결과 캐시를 켠다 (기본은 매 요청 새로 생성)",
+    )
+    parser.add_argument("--request-timeout", type=float, default=120)
+    parser.add_argument(
+        "--mock-args", default="", help="모의 서버에 넘길 인자 (따옴표로 묶어 전달)"
+    )
+    parser.add_argument(
+        "--app-env",
+        action="append",
+        default=[],
+        help="앱 환경변수 KEY=VALUE (반복 가능)",
+    )
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로도 저장")
+    parser.add_argument("--max-p95-ttfb-seconds", type=float, default=None)
+    parser.add_argument("--max-p95-completion-seconds", type=float, default=None)
+    parser.add_argument("--max-peak-rss-mb", type=float, default=None)
+    parser.add_argument("--max-p99-loop-lag-seconds", type=float, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=None)
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    result = asyncio.run(run(args))
+    report(result)
+    if args.json:
+        with open(args.json, "wb") as output:
+            output.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    sys.exit(1 if check_thresholds(args, result) else 0)
+
+
+if __name__ == "__main__":
+    main()
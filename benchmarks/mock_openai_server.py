@@ -0,0 +1,562 @@
+"""
+부하 벤치마크용 OpenAI 모의 서버 (Responses API / Files API / Batch API / Models API 일부)
+
+- 지연 분포: --latency(첫 응답까지), --token-interval(스트림 델타 간격)
+    fixed:0.5 | uniform:0.2:1.5 | lognormal:<중앙값>:<sigma>
+- 오류 주입: --error-rate 비율로 --error-status 중 하나를 돌려주고,
+  --stall-rate 비율로 응답 없이 멈춰 타임아웃을 재현한다.
+- 기본 응답: 요청 끝의 "정확히 N개" 지시를 읽어 N문제짜리 problem_set을 만든다.
+  --canned 로 problem_set JSON 파일을 주면 그 문제들을 반복/잘라 N개를 채운다.
+- 카세트: --record DIR --upstream URL 이면 실제 API로 중계하면서 응답을 저장하고,
+  --replay DIR 이면 저장된 응답을 (기록된 간격대로) 재생한다.
+  재생 시 없는 요청은 --replay-miss canned(기본 응답) | error(404) 로 처리한다.
+- 배치: /v1/batches 로 만든 배치는 --latency 만큼 기다린 뒤 입력 JSONL의 각 요청에 기본 응답을 만들어
+  출력/오류 파일을 남긴다(--error-rate 적용). 앱의 OPENAI_BATCH_BASE_URL을 이 서버로 두면
+  배치 작업 엔드포인트를 실제 API 없이 돌려 볼 수 있다.
+
+실행: python -m benchmarks.mock_openai_server --port 9001 [--latency lognormal:1.5:0.4]
+"""
+
+import argparse
+import asyncio
+import email.parser
+import email.policy
+import hashlib
+import math
+import os
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import orjson
+from fastapi import FastAPI, Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+QUIZ_COUNT_PATTERN = re.compile(r"정확히 (\d+)개")
+EXPLANATION_TEXT = (
+    "상세 해설: 1번이 정답입니다. 나머지 선택지는 강의노트의 정의와 맞지 않습니다."
+)
+
+
+def parse_distribution(spec: str) -> Callable[[], float]:
+    """'fixed:0.5' | 'uniform:0.2:1.5' | 'lognormal:<중앙값>:<sigma>' 를 샘플러로 바꾼다."""
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda: random.lognormvariate(mu, values[1])
+    raise ValueError(f"알 수 없는 분포 형식입니다: {spec}")
+
+
+@dataclass
+class MockConfig:
+    latency: Callable[[], float] = lambda: 0.5
+    token_interval: Callable[[], float] = lambda: 0.01
+    delta_chars: int = 20
+    error_rate: float = 0.0
+    error_statuses: List[int] = field(default_factory=lambda: [500])
+    stall_rate: float = 0.0
+    cached_ratio: float = 0.5
+    canned_problems: Optional[List[dict]] = None
+    record_dir: Optional[Path] = None
+    replay_dir: Optional[Path] = None
+    replay_miss: str = "canned"
+    upstream: Optional[str] = None
+    upstream_api_key: Optional[str] = None
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    app = FastAPI()
+    stats: Dict[str, int] = {
+        "responses": 0,
+        "streams": 0,
+        "errors": 0,
+        "stalls": 0,
+        "replayed": 0,
+        "replay_misses": 0,
+        "recorded": 0,
+        "files": 0,
+        "batches": 0,
+    }
+    files: Dict[str, int] = {}
+    # 배치 입력/출력 파일은 내용을 보관해 /v1/files/{id}/content로 돌려준다.
+    file_contents: Dict[str, bytes] = {}
+    batches: Dict[str, dict] = {}
+
+    @app.post("/v1/responses")
+    async def responses(request: Request) -> Response:
+        body = orjson.loads(await request.body())
+        stats["responses"] += 1
+        stream = bool(body.get("stream"))
+        stats["streams"] += stream
+
+        if config.record_dir is not None:
+            stats["recorded"] += 1
+            return await _record(config, body, stream)
+        if config.replay_dir is not None:
+            cassette = _load_cassette(config.replay_dir, body)
+            if cassette is not None:
+                stats["replayed"] += 1
+                return await _replay(cassette)
+            stats["replay_misses"] += 1
+            if config.replay_miss == "error":
+                return _error(404, "cassette not found")
+
+        roll = random.random()
+        if roll < config.stall_rate:
+            # 클라이언트 타임아웃이 먼저 끊는다.
+            stats["stalls"] += 1
+            await asyncio.sleep(3600)
+            return _error(504, "stalled")
+        if roll < config.stall_rate + config.error_rate:
+            stats["errors"] += 1
+            await asyncio.sleep(config.latency())
+            return _error(random.choice(config.error_statuses), "injected error")
+
+        text = _canned_text(config, body)
+        response = _response_object(config, body, text)
+        if stream:
+            return StreamingResponse(
+                _stream_events(config, response, text), media_type="text/event-stream"
+            )
+        await asyncio.sleep(config.latency())
+        return Response(orjson.dumps(response), media_type="application/json")
+
+    @app.post("/v1/files")
+    async def upload_file(request: Request) -> JSONResponse:
+        # python-multipart 없이도 돌도록 표준 라이브러리 email 파서로 multipart 본문을 읽는다.
+        fields = _parse_multipart(
+            request.headers.get("content-type", ""), await request.body()
+        )
+        filename, content = fields.get("file", (None, b""))
+        purpose = fields.get("purpose", (None, b"user_data"))[1].decode()
+        file_id = "file-" + uuid.uuid4().hex[:12]
+        files[file_id] = len(content)
+        if purpose == "batch":
+            file_contents[file_id] = content
+        stats["files"] += 1
+        return JSONResponse(
+            {
+                "id": file_id,
+                "object": "file",
+                "bytes": len(content),
+                "created_at": int(time.time()),
+                "filename": filename or "upload.pdf",
+                "purpose": purpose,
+                "status": "processed",
+            }
+        )
+
+    @app.get("/v1/files/{file_id}/content")
+    async def file_content(file_id: str) -> Response:
+        content = file_contents.get(file_id)
+        if content is None:
+            return _error(404, "file not found")
+        return Response(content, media_type="application/octet-stream")
+
+    @app.post("/v1/batches")
+    async def create_batch(request: Request) -> JSONResponse:
+        body = orjson.loads(await request.body())
+        content = file_contents.get(body["input_file_id"])
+        if content is None:
+            return _error(404, "input file not found")
+        lines = [orjson.loads(line) for line in content.splitlines() if line.strip()]
+        now = int(time.time())
+        batch = {
+            "id": "batch_" + uuid.uuid4().hex,
+            "object": "batch",
+            "endpoint": body["endpoint"],
+            "input_file_id": body["input_file_id"],
+            "completion_window": body["completion_window"],
+            "status": "validating",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": now,
+            "in_progress_at": None,
+            "completed_at": None,
+            "expires_at": now + 24 * 3600,
+            "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+            "metadata": body.get("metadata") or {},
+        }
+        batches[batch["id"]] = batch
+        stats["batches"] += 1
+        asyncio.create_task(_run_batch(config, batch, lines, file_contents))
+        return JSONResponse(batch)
+
+    @app.get("/v1/batches/{batch_id}")
+    async def get_batch(batch_id: str) -> JSONResponse:
+        batch = batches.get(batch_id)
+        if batch is None:
+            return _error(404, "batch not found")
+        return JSONResponse(batch)
+
+    @app.delete("/v1/files/{file_id}")
+    async def delete_file(file_id: str) -> JSONResponse:
+        files.pop(file_id, None)
+        return JSONResponse({"id": file_id, "object": "file", "deleted": True})
+
+    @app.get("/v1/models")
+    async def list_models() -> JSONResponse:
+        models = ["gpt-4.1-mini", "gpt-5-mini"]
+        return JSONResponse(
+            {
+                "object": "list",
+                "data": [
+                    {"id": m, "object": "model", "created": 0, "owned_by": "mock"}
+                    for m in models
+                ],
+            }
+        )
+
+    @app.get("/mock/stats")
+    async def get_stats() -> JSONResponse:
+        return JSONResponse({**stats, "stored_files": len(files)})
+
+    return app
+
+
+async def _run_batch(
+    config: MockConfig,
+    batch: dict,
+    lines: List[dict],
+    file_contents: Dict[str, bytes],
+) -> None:
+    batch["status"] = "in_progress"
+    batch["in_progress_at"] = int(time.time())
+    await asyncio.sleep(config.latency())
+
+    outputs, errors = [], []
+    for line in lines:
+        entry = {
+            "id": "batch_req_" + uuid.uuid4().hex[:12],
+            "custom_id": line["custom_id"],
+            "error": None,
+        }
+        if random.random() < config.error_rate:
+            status = random.choice(config.error_statuses)
+            entry["response"] = {
+                "status_code": status,
+                "request_id": uuid.uuid4().hex,
+                "body": orjson.loads(_error(status, "injected error").body),
+            }
+            errors.append(entry)
+            continue
+        body = line["body"]
+        response = _response_object(config, body, _canned_text(config, body))
+        entry["response"] = {
+            "status_code": 200,
+            "request_id": uuid.uuid4().hex,
+            "body": response,
+        }
+        outputs.append(entry)
+
+    for key, entries in (("output_file_id", outputs), ("error_file_id", errors)):
+        if entries:
+            file_id = "file-" + uuid.uuid4().hex[:12]
+            file_contents[file_id] = b"".join(orjson.dumps(e) + b"\n" for e in entries)
+            batch[key] = file_id
+    batch["request_counts"] = {
+        "total": len(lines),
+        "completed": len(outputs),
+        "failed": len(errors),
+    }
+    batch["status"] = "completed"
+    batch["completed_at"] = int(time.time())
+
+
+def _canned_text(config: MockConfig, body: dict) -> str:
+    # 구조화 출력(text.format)을 요청하지 않은 호출은 해설 요청이다.
+    if "text" not in body:
+        return EXPLANATION_TEXT
+    match = QUIZ_COUNT_PATTERN.search(orjson.dumps(body.get("input")).decode())
+    count = int(match.group(1)) if match else 1
+    if config.canned_problems:
+        problems = [
+            {**config.canned_problems[i % len(config.canned_problems)], "number": i + 1}
+            for i in range(count)
+        ]
+    else:
+        problems = [
+            {
+                "number": i + 1,
+                "title": f"다음 중 강의노트 {i + 1}번 개념에 대한 설명으로 옳은 것은?",
+                "selections": [
+                    {"content": f"선택지 {j + 1}", "correct": j == 0} for j in range(4)
+                ],
+                "explanation": "강의노트의 정의에 따르면 1번이 정답이다.",
+            }
+            for i in range(count)
+        ]
+    return orjson.dumps({"quiz": problems}).decode()
+
+
+def _response_object(config: MockConfig, body: dict, text: str) -> dict:
+    # 토큰 수는 대략 4바이트당 1토큰으로 어림한다.
+    input_tokens = max(len(orjson.dumps(body.get("input"))) // 4, 1)
+    output_tokens = max(len(text.encode()) // 4, 1)
+    return {
+        "id": "resp_" + uuid.uuid4().hex,
+        "object": "response",
+        "created_at": time.time(),
+        "model": body.get("model", "gpt-4.1-mini"),
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_" + uuid.uuid4().hex[:12],
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "error": None,
+        "incomplete_details": None,
+        "instructions": None,
+        "metadata": {},
+        "temperature": 1.0,
+        "top_p": 1.0,
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {
+                "cached_tokens": int(input_tokens * config.cached_ratio)
+            },
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+async def _stream_events(
+    config: MockConfig, response: dict, text: str
+) -> AsyncIterator[bytes]:
+    await asyncio.sleep(config.latency())
+    message_id = response["output"][0]["id"]
+    sequence = 0
+    yield _sse(
+        "response.created",
+        {
+            "sequence_number": sequence,
+            "response": {**response, "output": [], "status": "in_progress"},
+        },
+    )
+    for start in range(0, len(text), config.delta_chars):
+        sequence += 1
+        yield _sse(
+            "response.output_text.delta",
+            {
+                "sequence_number": sequence,
+                "item_id": message_id,
+                "output_index": 0,
+                "content_index": 0,
+                "delta": text[start : start + config.delta_chars],
+            },
+        )
+        await asyncio.sleep(config.token_interval())
+    yield _sse(
+        "response.completed", {"sequence_number": sequence + 1, "response": response}
+    )
+
+
+def _sse(event_type: str, payload: dict) -> bytes:
+    data = orjson.dumps({"type": event_type, **payload})
+    return b"event: " + event_type.encode() + b"\ndata: " + data + b"\n\n"
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={
+            "error": {
+                "message": message,
+                "type": "server_error" if status >= 500 else "invalid_request_error",
+                "param": None,
+                "code": None,
+            }
+        },
+    )
+
+
+def _parse_multipart(content_type: str, body: bytes) -> Dict[str, tuple]:
+    """multipart/form-data 본문을 {필드명: (파일명, 바이트)}로 바꾼다."""
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+    return fields
+
+
+def cassette_key(body: dict) -> str:
+    """실행마다 달라지는 값(file_id, 메타데이터)을 지우고 요청 본문을 해시한다."""
+
+    def normalize(value):
+        if isinstance(value, dict):
+            return {
+                k: ("<file_id>" if k == "file_id" else normalize(v))
+                for k, v in value.items()
+                if k != "metadata"
+            }
+        if isinstance(value, list):
+            return [normalize(v) for v in value]
+        return value
+
+    return hashlib.sha256(
+        orjson.dumps(normalize(body), option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+def _load_cassette(directory: Path, body: dict) -> Optional[dict]:
+    path = directory / f"{cassette_key(body)}.json"
+    if not path.exists():
+        return None
+    return orjson.loads(path.read_bytes())
+
+
+async def _replay(cassette: dict) -> Response:
+    if not cassette["stream"]:
+        await asyncio.sleep(cassette["elapsed"])
+        return Response(
+            cassette["body"],
+            status_code=cassette["status"],
+            media_type="application/json",
+        )
+
+    async def paced() -> AsyncIterator[bytes]:
+        # 기록된 도착 시각 간격을 그대로 재현한다.
+        started = time.perf_counter()
+        for offset, chunk in cassette["chunks"]:
+            delay = offset - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk.encode()
+
+    return StreamingResponse(
+        paced(), status_code=cassette["status"], media_type="text/event-stream"
+    )
+
+
+async def _record(config: MockConfig, body: dict, stream: bool) -> Response:
+    import httpx
+
+    path = config.record_dir / f"{cassette_key(body)}.json"
+    client = httpx.AsyncClient(
+        base_url=config.upstream,
+        headers={"Authorization": f"Bearer {config.upstream_api_key}"},
+        timeout=None,
+    )
+    started = time.perf_counter()
+    upstream = await client.send(
+        client.build_request("POST", "/responses", json=body), stream=True
+    )
+
+    if not stream:
+        content = await upstream.aread()
+        await upstream.aclose()
+        await client.aclose()
+        _save_cassette(
+            path,
+            {
+                "stream": False,
+                "status": upstream.status_code,
+                "elapsed": time.perf_counter() - started,
+                "body": content.decode(),
+            },
+        )
+        return Response(
+            content, status_code=upstream.status_code, media_type="application/json"
+        )
+
+    async def tee() -> AsyncIterator[bytes]:
+        chunks = []
+        try:
+            async for chunk in upstream.aiter_text():
+                chunks.append([time.perf_counter() - started, chunk])
+                yield chunk.encode()
+        finally:
+            await upstream.aclose()
+            await client.aclose()
+        _save_cassette(
+            path, {"stream": True, "status": upstream.status_code, "chunks": chunks}
+        )
+
+    return StreamingResponse(
+        tee(), status_code=upstream.status_code, media_type="text/event-stream"
+    )
+
+
+def _save_cassette(path: Path, cassette: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(cassette))
+
+
+def build_config(args: argparse.Namespace) -> MockConfig:
+    canned = None
+    if args.canned:
+        canned = orjson.loads(Path(args.canned).read_bytes())["quiz"]
+    return MockConfig(
+        latency=parse_distribution(args.latency),
+        token_interval=parse_distribution(args.token_interval),
+        delta_chars=args.delta_chars,
+        error_rate=args.error_rate,
+        error_statuses=[int(s) for s in args.error_status.split(",")],
+        stall_rate=args.stall_rate,
+        cached_ratio=args.cached_ratio,
+        canned_problems=canned,
+        record_dir=Path(args.record) if args.record else None,
+        replay_dir=Path(args.replay) if args.replay else None,
+        replay_miss=args.replay_miss,
+        upstream=args.upstream,
+        upstream_api_key=os.getenv("MOCK_UPSTREAM_API_KEY"),
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default="lognormal:1.0:0.3")
+    parser.add_argument("--token-interval", default="fixed:0.01")
+    parser.add_argument("--delta-chars", type=int, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", default="500,503,429")
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--cached-ratio", type=float, default=0.5)
+    parser.add_argument("--canned", default=None, help="problem_set JSON 파일 경로")
+    parser.add_argument("--record", default=None, help="카세트를 저장할 디렉터리")
+    parser.add_argument("--replay", default=None, help="재생할 카세트 디렉터리")
+    parser.add_argument("--replay-miss", choices=("canned", "error"), default="canned")
+    parser.add_argument("--upstream", default="https://api.openai.com/v1")
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.record and not os.getenv("MOCK_UPSTREAM_API_KEY"):
+        parser.error("--record 에는 MOCK_UPSTREAM_API_KEY 환경변수가 필요합니다")
+    uvicorn.run(
+        create_app(build_config(args)),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
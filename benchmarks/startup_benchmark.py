@@ -0,0 +1,125 @@
+"""
+기동 시간 벤치마크: 앱 임포트 시간, 프로세스 시작부터 첫 HTTP 응답/ready까지의 시간
+
+- import: 새 인터프리터에서 `import app.main`에 걸린 시간 (REPEAT회 중앙값)
+- first_response: uvicorn 프로세스 시작 → /ready가 처음 응답(상태 코드 무관)하기까지
+- ready: uvicorn 프로세스 시작 → /ready가 200을 돌려주기까지
+
+기준값을 넘으면 종료 코드 1로 끝나 회귀를 잡을 수 있다.
+
+실행: python -m benchmarks.startup_benchmark [--max-import-seconds 1.0] [--max-ready-seconds 10]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Optional, Tuple
+
+REPEAT = 5
+READY_TIMEOUT_SECONDS = 60
+
+# 앱 임포트에 필요한 최소 환경변수. 이미 설정돼 있으면 그대로 쓴다.
+DEFAULT_ENV = {
+    "OPENAI_API_KEY": "sk-startup-benchmark",
+    "GPT_REQUEST_TIMEOUT": "60",
+    "MAX_CHUNK_COUNT": "10",
+    "RATE_LIMIT_WINDOW_SECONDS": "60",
+    "RATE_LIMIT_MAX_REQUESTS": "75",
+    "WARMUP_UPSTREAM_CONNECTIONS": "false",
+}
+
+
+def build_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    for key, value in DEFAULT_ENV.items():
+        env.setdefault(key, value)
+    return env
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    code = (
+        "import time; start = time.perf_counter(); import app.main; "
+        "print(time.perf_counter() - start)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def probe(url: str) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def measure_server(env: Dict[str, str]) -> Tuple[float, float]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/ready"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    first_response = None
+    try:
+        while time.perf_counter() - start < READY_TIMEOUT_SECONDS:
+            status = probe(url)
+            if status is not None and first_response is None:
+                first_response = time.perf_counter() - start
+            if status == 200:
+                return first_response, time.perf_counter() - start
+            time.sleep(0.02)
+        raise TimeoutError(f"{READY_TIMEOUT_SECONDS}초 안에 ready가 되지 않았습니다")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-import-seconds", type=float, default=None)
+    parser.add_argument("--max-ready-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    env = build_env()
+    imports = [measure_import(env) for _ in range(REPEAT)]
+    servers = [measure_server(env) for _ in range(REPEAT)]
+    import_seconds = statistics.median(imports)
+    first_response_seconds = statistics.median(s[0] for s in servers)
+    ready_seconds = statistics.median(s[1] for s in servers)
+
+    print(f"import          p50={import_seconds:.3f}s max={max(imports):.3f}s")
+    print(f"first_response  p50={first_response_seconds:.3f}s")
+    print(f"ready           p50={ready_seconds:.3f}s")
+
+    failed = False
+    if args.max_import_seconds is not None and import_seconds > args.max_import_seconds:
+        print(
+            f"임포트 시간 기준 초과: {import_seconds:.3f}s > {args.max_import_seconds}s"
+        )
+        failed = True
+    if args.max_ready_seconds is not None and ready_seconds > args.max_ready_seconds:
+        print(f"ready 시간 기준 초과: {ready_seconds:.3f}s > {args.max_ready_seconds}s")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# 앱 모듈이 import 시점에 읽는 필수 환경 변수 기본값
+os.environ.setdefault("RATE_LIMIT_WINDOW_SECONDS", "60")
+os.environ.setdefault("RATE_LIMIT_MAX_REQUESTS", "10")
+os.environ.setdefault("GPT_REQUEST_TIMEOUT", "30")
+os.environ.setdefault("MAX_CHUNK_COUNT", "5")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.adapter import call_policy
+from app.adapter.call_policy import CallPolicy, LatencyTracker, ttft_key
+
+HEDGE_AFTER = 0.05
+
+
+def _warm_tracker(key: str) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for _ in range(call_policy.GPT_HEDGE_MIN_SAMPLES):
+        tracker.observe(key, HEDGE_AFTER)
+    return tracker
+
+
+def _new_samples(tracker: LatencyTracker, key: str) -> list:
+    return list(tracker._samples[key])[call_policy.GPT_HEDGE_MIN_SAMPLES :]
+
+
+def test_hedge_winner_measured_from_request_start_and_loser_censored():
+    tracker = _warm_tracker("model")
+    policy = CallPolicy(hedge_percentile=0.5, tracker=tracker)
+    delays = [10.0, 0.02]
+
+    async def call(timeout):
+        await asyncio.sleep(delays.pop(0))
+        return "ok"
+
+    assert asyncio.run(policy.run("model", call, budget=5)) == "ok"
+    assert policy.stats["hedges"] == 1 and policy.stats["hedge_wins"] == 1
+    samples = _new_samples(tracker, "model")
+    # 헤지 승자(0.02초)는 원 요청 시작부터 재므로 기준 + 0.02초 이상이고,
+    # 취소된 원 요청도 기준 이상 값으로 남는다.
+    assert len(samples) == 2
+    assert all(sample >= HEDGE_AFTER for sample in samples)
+    assert max(samples) >= HEDGE_AFTER + 0.02
+
+
+def test_failed_attempt_recorded_as_censored_sample():
+    tracker = _warm_tracker("model")
+    policy = CallPolicy(max_attempts=1, hedge_percentile=0.5, tracker=tracker)
+
+    async def call(timeout):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(policy.run("model", call, budget=5))
+    assert _new_samples(tracker, "model") == [HEDGE_AFTER]
+
+
+def test_stream_records_ttft_separately(monkeypatch):
+    tracker = LatencyTracker()
+    monkeypatch.setattr(call_policy.gpt_call_policy, "tracker", tracker)
+
+    async def stream(gpt_request, timeout):
+        yield "first"
+        await asyncio.sleep(0.05)
+        yield "second"
+
+    monkeypatch.setattr(call_policy, "stream_response_text", stream)
+
+    async def consume():
+        return [
+            delta
+            async for delta in call_policy.stream_gpt_with_policy(
+                {"model": "model"}, budget=5
+            )
+        ]
+
+    assert asyncio.run(consume()) == ["first", "second"]
+    (ttft,) = tracker._samples[ttft_key("model")]
+    (total,) = tracker._samples["model"]
+    assert ttft < 0.05 <= total
@@ -0,0 +1,44 @@
+import pytest
+
+from app.util.chunk_planner import plan_page_chunks
+
+
+def _page_counts(chunks) -> list:
+    return [len(chunk.referenced_pages) for chunk in chunks]
+
+
+def test_equal_pages_split_into_balanced_counts():
+    pages = list(range(1, 11))
+    chunks = plan_page_chunks(pages, [100.0] * 10, 3, 3)
+    assert _page_counts(chunks) == [4, 3, 3]
+    assert [p for chunk in chunks for p in chunk.referenced_pages] == pages
+
+
+def test_heavy_page_gets_its_own_chunk():
+    pages = list(range(1, 7))
+    chunks = plan_page_chunks(pages, [1000.0, 10.0, 10.0, 10.0, 10.0, 10.0], 4, 2)
+    assert chunks[0].referenced_pages[0] == 1
+    # 무거운 첫 페이지 뒤로는 가벼운 페이지만 이어 붙는다.
+    assert _page_counts(chunks)[0] < _page_counts(chunks)[1]
+    assert chunks[0].quiz_count > chunks[1].quiz_count
+
+
+@pytest.mark.parametrize(
+    "page_count, quiz_count, max_chunk_count",
+    [(10, 3, 3), (10, 7, 3), (30, 20, 5), (9, 9, 9), (5, 1, 5), (40, 13, 6)],
+)
+def test_quiz_distribution_sums_to_quiz_count(page_count, quiz_count, max_chunk_count):
+    pages = list(range(1, page_count + 1))
+    weights = [float((i * 37) % 11) * 50 for i in range(page_count)]
+    chunks = plan_page_chunks(pages, weights, quiz_count, max_chunk_count)
+    assert len(chunks) == min(quiz_count, max_chunk_count)
+    assert sum(chunk.quiz_count for chunk in chunks) == quiz_count
+    assert all(chunk.quiz_count >= 1 for chunk in chunks)
+
+
+def test_fewer_pages_than_chunks():
+    chunks = plan_page_chunks([3, 4], [100.0, 100.0], 5, 5)
+    assert len(chunks) == 5
+    assert sum(chunk.quiz_count for chunk in chunks) == 5
+    assert all(chunk.referenced_pages for chunk in chunks)
+    assert all(set(chunk.referenced_pages) <= {3, 4} for chunk in chunks)
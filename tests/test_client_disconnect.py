@@ -0,0 +1,93 @@
+import asyncio
+
+from app.util.client_disconnect import stop_on_disconnect
+from app.util.metrics import client_disconnects
+
+
+class FakeRequest:
+    def __init__(self):
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    async def receive(self):
+        return await self.messages.get()
+
+
+class Upstream:
+    """첫 줄을 낸 뒤 두 번째 줄에서 멈춰 있는 청크 스트림"""
+
+    def __init__(self):
+        self.cancelled = False
+        self.closed = False
+
+    async def lines(self):
+        try:
+            yield "first\n"
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            yield "never\n"
+        finally:
+            self.closed = True
+
+
+def _disconnects() -> float:
+    return sum(client_disconnects._values.values())
+
+
+def test_disconnect_cancels_pending_line_and_closes_stream():
+    async def scenario():
+        request = FakeRequest()
+        upstream = Upstream()
+        received = []
+
+        async def consume():
+            async for line in stop_on_disconnect(request, upstream.lines()):
+                received.append(line)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        await request.messages.put({"type": "http.disconnect"})
+        await asyncio.wait_for(consumer, 1)
+        return consumer, upstream, received
+
+    before = _disconnects()
+    consumer, upstream, received = asyncio.run(scenario())
+
+    assert received == ["first\n"]
+    assert not consumer.cancelled()
+    assert upstream.cancelled and upstream.closed
+    assert _disconnects() == before + 1
+
+
+def test_finished_stream_is_not_counted_as_disconnect():
+    async def lines():
+        yield "a\n"
+        yield "b\n"
+
+    async def scenario():
+        return [line async for line in stop_on_disconnect(FakeRequest(), lines())]
+
+    before = _disconnects()
+    assert asyncio.run(scenario()) == ["a\n", "b\n"]
+    assert _disconnects() == before
+
+
+def test_external_cancel_still_propagates():
+    async def scenario():
+        upstream = Upstream()
+
+        async def consume():
+            async for _ in stop_on_disconnect(FakeRequest(), upstream.lines()):
+                pass
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        return consumer, upstream
+
+    consumer, upstream = asyncio.run(scenario())
+    assert consumer.cancelled()
+    assert upstream.closed
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from app.dto.request.generate_request import GenerateRequest
+from app.service import generate_service
+from app.service.generate_service import GenerateService
+
+
+class _Planned(Exception):
+    pass
+
+
+@pytest.mark.parametrize("max_chunk_count, expected", [(1, 1), (2, 2), (4, 4)])
+def test_fast_first_respects_max_chunk_count(monkeypatch, max_chunk_count, expected):
+    planned = []
+
+    async def check_rate(generate_count, key=None):
+        # 청크 수가 정해지는 지점까지만 실행한다.
+        planned.append(generate_count)
+        raise _Planned()
+
+    monkeypatch.setattr(generate_service, "CHUNK_SCHEDULING_MODE", "fast_first")
+    monkeypatch.setattr(generate_service.rate_limiter, "check_rate", check_rate)
+    monkeypatch.setenv("MAX_CHUNK_COUNT", str(max_chunk_count))
+    request = GenerateRequest(
+        uploadedUrl="http://files/lecture.pdf",
+        quizCount=6,
+        difficultyType="RECALL",
+        quizType="MULTIPLE",
+        pageNumbers=list(range(1, 11)),
+    )
+
+    async def scenario():
+        async for _ in GenerateService.generate_results(request):
+            pass
+
+    with pytest.raises(_Planned):
+        asyncio.run(scenario())
+    assert planned == [expected]
@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.adapter.file_uploader import UploadedFileRegistry
+
+TTL_SECONDS = 100.0
+REUSE_MARGIN_SECONDS = 10.0
+DELETE_GRACE_SECONDS = 20.0
+
+
+class FakeFiles:
+    def __init__(self):
+        self.created = []
+        self.deleted = []
+
+    async def create(self, file, purpose):
+        file_id = f"file-{len(self.created) + 1}"
+        self.created.append(file_id)
+        return SimpleNamespace(id=file_id)
+
+    async def delete(self, file_id):
+        self.deleted.append(file_id)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _registry():
+    files = FakeFiles()
+    clock = FakeClock()
+    registry = UploadedFileRegistry(
+        ttl_seconds=TTL_SECONDS,
+        cleanup_interval_seconds=float("inf"),
+        client_factory=lambda: SimpleNamespace(files=files),
+        reuse_margin_seconds=REUSE_MARGIN_SECONDS,
+        delete_grace_seconds=DELETE_GRACE_SECONDS,
+        clock=clock,
+    )
+    return registry, files, clock
+
+
+def _get(registry):
+    return asyncio.run(registry.get_or_upload("doc:1,2", "doc.pdf", b"%PDF"))
+
+
+def test_stops_reusing_within_margin_of_ttl():
+    registry, files, clock = _registry()
+    assert _get(registry) == "file-1"
+
+    clock.now = TTL_SECONDS - REUSE_MARGIN_SECONDS - 0.001
+    assert _get(registry) == "file-1"
+
+    clock.now = TTL_SECONDS - REUSE_MARGIN_SECONDS
+    assert _get(registry) == "file-2"
+    assert registry.stats == {"uploads": 2, "reuses": 1, "deletes": 0}
+
+
+def test_deletes_only_after_grace_period():
+    registry, files, clock = _registry()
+    _get(registry)
+    clock.now = TTL_SECONDS - REUSE_MARGIN_SECONDS
+    _get(registry)
+
+    # TTL이 지나도 유예 시간 동안은 이미 내준 file_id를 지우지 않는다.
+    clock.now = TTL_SECONDS + DELETE_GRACE_SECONDS - 0.001
+    assert asyncio.run(registry.cleanup_expired()) == 0
+
+    clock.now = TTL_SECONDS + DELETE_GRACE_SECONDS
+    assert asyncio.run(registry.cleanup_expired()) == 1
+    assert files.deleted == ["file-1"]
+    # 교체된 새 파일은 그대로 재사용된다.
+    assert _get(registry) == "file-2"
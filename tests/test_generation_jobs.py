@@ -0,0 +1,200 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.service import generation_job_service
+from app.service.generation_job_service import GenerationJobService
+from app.util.generation_job_store import (
+    GenerationJob,
+    RedisGenerationJobBackend,
+    SqliteGenerationJobBackend,
+)
+
+
+def _use_store(store, monkeypatch):
+    monkeypatch.setattr(generation_job_service, "generation_job_store", store)
+    monkeypatch.setattr(generation_job_service, "GENERATION_JOB_POLL_SECONDS", 0.01)
+    return store
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    store = SqliteGenerationJobBackend(path=str(tmp_path / "jobs.sqlite3"))
+    return _use_store(store, monkeypatch)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def store(request, tmp_path, monkeypatch):
+    if request.param == "sqlite":
+        store = SqliteGenerationJobBackend(path=str(tmp_path / "jobs.sqlite3"))
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.aioredis.FakeRedis()
+        store = RedisGenerationJobBackend(client_factory=lambda: client)
+    return _use_store(store, monkeypatch)
+
+
+def _job(job_id: str, status: str = "running", age: float = 0.0) -> GenerationJob:
+    now = time.time() - age
+    return GenerationJob(
+        job_id=job_id, status=status, quiz_count=3, created_at=now, updated_at=now
+    )
+
+
+def _generate(monkeypatch, results) -> None:
+    monkeypatch.setattr(
+        generation_job_service.GenerateService, "generate_results", results
+    )
+    monkeypatch.setattr(generation_job_service, "number_results", lambda stream: stream)
+
+
+def test_follower_of_remote_job_leaves_no_progress_event(store):
+    async def scenario():
+        # 다른 워커에서 도는 작업이라 이 프로세스의 _running_jobs에 없다.
+        await store.create(_job("remote"))
+        await store.append("remote", "line-1\n")
+        stream = generation_job_service._follow("remote", 0)
+        assert await anext(stream) == "line-1\n"
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert "remote" not in generation_job_service._progress_events
+
+
+def test_finished_local_job_leaves_no_progress_event(store, monkeypatch):
+    async def results(generate_request, usage):
+        yield '{"quiz":[]}\n'
+
+    _generate(monkeypatch, results)
+
+    async def scenario():
+        await store.create(_job("local"))
+        stream = generation_job_service._follow("local", 0)
+        follower = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        await generation_job_service._run_job("local", None)
+        line = await follower
+        await stream.aclose()
+        return line, await store.get("local")
+
+    line, job = asyncio.run(scenario())
+    assert line == '{"quiz":[]}\n'
+    assert job.status == "completed"
+    assert "local" not in generation_job_service._progress_events
+
+
+def test_replay_from_offset_then_wait_for_remaining_lines(store):
+    async def scenario():
+        await store.create(_job("job"))
+        await store.append("job", "line-1\n")
+        await store.append("job", "line-2\n")
+        stream = await GenerationJobService.open_stream("job", 1)
+        # 이미 받은 줄은 건너뛰고 저장된 나머지는 바로 재생한다.
+        replayed = await anext(stream)
+
+        async def produce():
+            await asyncio.sleep(0.05)
+            await store.append("job", "line-3\n")
+            await store.finish("job", "completed", None)
+
+        producer = asyncio.ensure_future(produce())
+        remaining = await _collect(stream)
+        await producer
+        return replayed, remaining, await GenerationJobService.get_job("job")
+
+    replayed, remaining, job = asyncio.run(scenario())
+    assert replayed == "line-2\n"
+    assert remaining == ["line-3\n"]
+    assert job.status == "completed"
+    assert job.completedChunks == 3
+
+
+def test_unknown_job_is_404(store):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(GenerationJobService.get_job("missing"))
+    assert error.value.status_code == 404
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(GenerationJobService.open_stream("missing", 0))
+    assert error.value.status_code == 404
+
+
+def test_failed_job_keeps_lines_and_error(store, monkeypatch):
+    async def results(generate_request, usage):
+        yield "line-1\n"
+        raise RuntimeError("upstream down")
+
+    _generate(monkeypatch, results)
+
+    async def scenario():
+        await store.create(_job("job"))
+        await generation_job_service._run_job("job", None)
+        stream = await GenerationJobService.open_stream("job", 0)
+        return await _collect(stream), await GenerationJobService.get_job("job")
+
+    lines, job = asyncio.run(scenario())
+    assert lines == ["line-1\n"]
+    assert job.status == "failed"
+    assert job.error == "upstream down"
+    assert job.completedChunks == 1
+
+
+def test_stalled_job_is_reported_and_stream_closes(store, monkeypatch):
+    monkeypatch.setattr(generation_job_service, "GENERATION_JOB_STALL_SECONDS", 60)
+
+    async def scenario():
+        # 다른 워커에서 돌다가 진행 기록 없이 멈춘 작업
+        await store.create(_job("job", age=120))
+        stream = await GenerationJobService.open_stream("job", 0)
+        lines = await asyncio.wait_for(_collect(stream), timeout=1)
+        return lines, await GenerationJobService.get_job("job")
+
+    lines, job = asyncio.run(scenario())
+    assert lines == []
+    assert job.status == "stalled"
+
+
+async def _collect(stream) -> list:
+    return [line async for line in stream]
+
+
+def _fail_on(store, statement: str) -> None:
+    asyncio.run(
+        store._run(
+            lambda conn: conn.execute(
+                f"CREATE TRIGGER fail_write {statement} "
+                "BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+            )
+        )
+    )
+
+
+def test_append_rolls_back_line_when_job_update_fails(sqlite_store):
+    store = sqlite_store
+    asyncio.run(store.create(_job("job")))
+    _fail_on(store, "BEFORE UPDATE ON generation_jobs")
+
+    with pytest.raises(Exception, match="disk full"):
+        asyncio.run(store.append("job", "line-1\n"))
+
+    assert asyncio.run(store.read_lines("job", 0)) == []
+    assert asyncio.run(store.get("job")).line_count == 0
+
+
+def test_create_rolls_back_expired_cleanup_when_insert_fails(sqlite_store):
+    store = sqlite_store
+    store.ttl_seconds = -1
+    asyncio.run(store.create(_job("expired")))
+    asyncio.run(store.append("expired", "line-1\n"))
+    _fail_on(store, "BEFORE INSERT ON generation_jobs")
+
+    with pytest.raises(Exception, match="disk full"):
+        asyncio.run(store.create(_job("new")))
+
+    # 새 작업을 넣지 못했으면 같은 트랜잭션에서 지운 만료 작업의 줄도 되살아난다.
+    assert asyncio.run(store.read_lines("expired", 0)) == ["line-1\n"]
@@ -0,0 +1,139 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.adapter.pdf_downloader import DownloadedPdf
+from app.dto.request.generate_request import GenerateRequest
+from app.dto.response.generate_response import GenerateResponse
+from app.service import generate_service
+from app.service.generate_service import GenerateService
+from app.service.inflight_generation import (
+    GenerationCancelledError,
+    InflightGenerations,
+)
+from app.util import document_cache as document_cache_module
+from app.util.document_cache import CachedDocument, DocumentCache
+
+
+def _request(url: str) -> GenerateRequest:
+    return GenerateRequest(
+        uploadedUrl=url,
+        quizCount=2,
+        difficultyType="RECALL",
+        quizType="MULTIPLE",
+        pageNumbers=[1, 2],
+    )
+
+
+async def _collect(stream):
+    return [line async for line in stream]
+
+
+def test_document_cache_downloads_once_for_concurrent_resolves(tmp_path, monkeypatch):
+    downloads = []
+
+    async def download(uploaded_url, etag=None, spool_dir=None, timeout=None):
+        downloads.append(uploaded_url)
+        await asyncio.sleep(0.01)
+        return DownloadedPdf(content=b"%PDF-1.4 lecture", etag='"v1"')
+
+    monkeypatch.setattr(document_cache_module, "download_pdf_if_modified", download)
+    cache = DocumentCache(directory=str(tmp_path))
+
+    async def scenario():
+        return await asyncio.gather(
+            *(cache.resolve("http://files/lecture.pdf") for _ in range(3))
+        )
+
+    documents = asyncio.run(scenario())
+    assert downloads == ["http://files/lecture.pdf"]
+    assert len({d.content_hash for d in documents}) == 1
+
+
+def test_coalesced_request_skips_document_resolve(monkeypatch):
+    resolved = []
+
+    async def resolve(uploaded_url, timeout=None):
+        resolved.append(uploaded_url)
+        return CachedDocument(content_hash="hash-" + uploaded_url, path="unused")
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def results(generate_request, usage, deadline=None):
+            await release.wait()
+            yield GenerateResponse(quiz=[])
+
+        monkeypatch.setattr(generate_service.document_cache, "resolve", resolve)
+        monkeypatch.setattr(GenerateService, "generate_results", results)
+
+        request = _request("http://files/coalesce.pdf")
+        first, _ = await GenerateService.open_stream(request)
+        second, status = await GenerateService.open_stream(request)
+        release.set()
+        lines = await asyncio.gather(_collect(first), _collect(second))
+        return status, lines
+
+    status, (first_lines, second_lines) = asyncio.run(scenario())
+    assert resolved == ["http://files/coalesce.pdf"]
+    assert status == "MISS"
+    assert first_lines == second_lines == ['{"quiz":[]}\n']
+
+
+def _results(release: asyncio.Event, count: int = 3):
+    async def results():
+        for index in range(count):
+            if index:
+                await release.wait()
+            yield GenerateResponse(quiz=[])
+
+    return results()
+
+
+def test_joined_subscriber_keeps_generation_alive():
+    async def scenario():
+        release = asyncio.Event()
+        registry = InflightGenerations()
+        first = registry.start("k", _results(release)).subscribe()
+        await anext(first)
+
+        # B는 스트림을 아직 읽지 않았어도 구독자로 센다.
+        second = registry.get("k").subscribe()
+        await first.aclose()
+        release.set()
+        return await _collect(second)
+
+    assert len(asyncio.run(scenario())) == 3
+
+
+def test_late_subscriber_fails_after_cancellation():
+    async def scenario():
+        release = asyncio.Event()
+        registry = InflightGenerations()
+        generation = registry.start("k", _results(release))
+        first = generation.subscribe()
+        await anext(first)
+        await first.aclose()
+        # 취소가 예약된 작업에는 새 요청이 합류하지 않는다.
+        assert registry.get("k") is None
+
+        late = generation.subscribe()
+        with pytest.raises(GenerationCancelledError):
+            await _collect(late)
+
+    asyncio.run(scenario())
+
+
+def test_unconsumed_stream_releases_subscription():
+    async def scenario():
+        generation = InflightGenerations().start("k", _results(asyncio.Event()))
+        stream = generation.subscribe()
+        assert generation.subscribers == 1
+        del stream
+        gc.collect()
+        assert generation.subscribers == 0
+        await asyncio.gather(generation.task, return_exceptions=True)
+        return generation
+
+    assert asyncio.run(scenario()).task.cancelled()
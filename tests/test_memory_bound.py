@@ -0,0 +1,77 @@
+import asyncio
+import tracemalloc
+
+import pytest
+
+from app.adapter.gpt_scheduler import GptCallScheduler
+from app.adapter.pdf_downloader import DownloadedPdf
+from app.dto.request.generate_request import GenerateRequest
+from app.service import generate_service
+from app.service.generate_service import GenerateService
+from app.util import document_cache as document_cache_module
+from app.util.document_cache import DocumentCache
+from benchmarks.load_benchmark import build_pdf
+
+pytest.importorskip("fitz")
+
+PAGES = 24
+IMAGE_KB = 400
+CHUNK_COUNT = 8
+# bounded 모드에서 생성 중 새로 할당되는 파이썬 메모리의 상한.
+# 동시에 살아 있는 페이로드가 스케줄러 동시성(1)으로 묶이므로 청크 하나 분량(조각 + base64) 남짓이어야 한다.
+BOUNDED_PEAK_BYTES = 6 * 1024 * 1024
+
+
+def _generation_peak(tmp_path, monkeypatch, mode: str) -> int:
+    path = build_pdf(str(tmp_path), PAGES, IMAGE_KB)
+
+    async def download(uploaded_url, etag=None, spool_dir=None, timeout=None):
+        with open(path, "rb") as pdf:
+            return DownloadedPdf(content=pdf.read(), etag=None)
+
+    async def upstream(gpt_request, budget):
+        await asyncio.sleep(0.01)
+        return ""
+
+    async def allow(generate_count, key=None):
+        return None
+
+    # 조각이 메모리 캐시에 쌓이지 않게 메모리 계층은 끈다(디스크 계층만 쓴다).
+    cache = DocumentCache(directory=str(tmp_path / f"cache-{mode}"), memory_bytes=0)
+    monkeypatch.setattr(document_cache_module, "download_pdf_if_modified", download)
+    monkeypatch.setattr(generate_service, "document_cache", cache)
+    monkeypatch.setattr(generate_service, "GENERATION_MEMORY_MODE", mode)
+    monkeypatch.setattr(generate_service, "request_to_gpt_with_policy", upstream)
+    monkeypatch.setattr(generate_service, "gpt_scheduler", GptCallScheduler(1))
+    monkeypatch.setattr(generate_service.rate_limiter, "check_rate", allow)
+    monkeypatch.setenv("MAX_CHUNK_COUNT", str(CHUNK_COUNT))
+
+    request = GenerateRequest(
+        uploadedUrl=f"http://files/{mode}.pdf",
+        quizCount=CHUNK_COUNT,
+        difficultyType="RECALL",
+        quizType="MULTIPLE",
+        pageNumbers=list(range(1, PAGES + 1)),
+    )
+
+    async def scenario() -> int:
+        # 원본 문서는 두 모드가 똑같이 들고 있으므로 측정에서 뺀다.
+        await cache.resolve(request.uploadedUrl)
+        tracemalloc.start()
+        try:
+            async for _ in GenerateService.generate_results(request):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_bounded_mode_keeps_peak_memory_under_bound(tmp_path, monkeypatch):
+    bounded = _generation_peak(tmp_path, monkeypatch, "bounded")
+    standard = _generation_peak(tmp_path, monkeypatch, "standard")
+
+    print(f"peak bounded={bounded / 2**20:.1f}MB standard={standard / 2**20:.1f}MB")
+    assert bounded < BOUNDED_PEAK_BYTES
+    assert bounded < standard / 2
@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+from app.router import metrics_router  # noqa: F401  수집기 등록
+from app.util.metrics import MetricsRegistry, metrics, stats_samples
+
+
+def _families(text: str):
+    types, labelsets = {}, defaultdict(set)
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, metric_type = line.split(" ")
+            types[name] = metric_type
+        elif line and not line.startswith("#"):
+            series = line.split(" ")[0]
+            name, _, labels = series.partition("{")
+            names = tuple(pair.split("=")[0] for pair in labels.rstrip("}").split(","))
+            labelsets[name].add(names if labels else ())
+    return types, labelsets
+
+
+def test_counter_collector_exports_total_suffix():
+    registry = MetricsRegistry()
+    registry.register_collector(
+        "demo_cache", "demo", lambda: stats_samples({"hits": 3}), "counter"
+    )
+    registry.register_collector("demo_depth", "demo", lambda: [({}, 2)])
+
+    types, _ = _families(registry.render())
+    assert types == {"demo_cache_total": "counter", "demo_depth": "gauge"}
+    assert 'demo_cache_total{key="hits"} 3' in registry.render()
+
+
+def test_registered_families_have_consistent_labels(monkeypatch):
+    from app.service.model_router import model_router
+    from app.util.prompt_cache_stats import prompt_cache_stats
+
+    monkeypatch.setattr(model_router, "models", {})
+    monkeypatch.setattr(model_router, "decisions", {})
+    monkeypatch.setattr(prompt_cache_stats, "models", {})
+    model_router.observe("model-a", 1.0, 2.0, ok=True)
+    model_router.plan(1)
+    prompt_cache_stats.models["model-a"] = {
+        "calls": 1,
+        "input_tokens": 10,
+        "cached_tokens": 5,
+    }
+
+    types, labelsets = _families(metrics.render())
+    assert types["qasker_call_policy_total"] == "counter"
+    assert types["qasker_document_cache_total"] == "counter"
+    assert types["qasker_gpt_scheduler"] == "gauge"
+    assert types["qasker_gpt_scheduler_total"] == "counter"
+    for name, metric_type in types.items():
+        if metric_type == "counter":
+            assert name.endswith("_total")
+    for name, labelset in labelsets.items():
+        assert len(labelset) == 1, (name, labelset)
@@ -0,0 +1,41 @@
+from app.service.model_router import ModelRouter
+
+
+def _router(candidates, **kwargs):
+    return ModelRouter(
+        policy="adaptive",
+        candidates=candidates,
+        fast_model=candidates[-1],
+        quality_model=candidates[0],
+        min_samples=2,
+        explore_rate=0.0,
+        **kwargs,
+    )
+
+
+def test_model_without_successes_is_not_chosen():
+    router = _router(["broken", "slow"], completion_slo_seconds=10)
+    for _ in range(3):
+        router.observe("broken", None, 0.1, ok=False)
+        router.observe("slow", 30.0, 90.0, ok=True)
+
+    plan = router.plan(10)
+
+    assert "broken" not in plan.models
+    assert router.lead_model() == "slow"
+
+
+def test_warmup_reaches_every_candidate():
+    candidates = ["quality", "middle", "fast"]
+    router = _router(candidates)
+
+    routed = []
+    for _ in range(3):
+        plan = router.plan(2)
+        for model in plan.models:
+            router.observe(model, 1.0, 2.0, ok=True)
+        routed.extend(plan.models)
+
+    assert set(routed) == set(candidates)
+    assert all(router.models[m].samples >= 2 for m in candidates)
+    assert "warmup" not in router.plan(5).reasons
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.adapter.pdf_downloader import DownloadedPdf
+from app.service import generate_service
+from app.util import document_cache as document_cache_module
+from app.util.deadline import Deadline
+from app.util.document_cache import DocumentCache
+from app.util.page_profile import (
+    PDF_PAGE_IMAGE_TOKENS,
+    TEXT_MODE_MIN_PAGE_TOKENS,
+    PageProfile,
+    prefers_text,
+)
+from app.util.pdf_slicer import PdfSlicer
+
+
+def _page(tokens: int, image_count: int = 0, page_number: int = 1) -> PageProfile:
+    return PageProfile(
+        page_number=page_number, text="", tokens=tokens, image_count=image_count
+    )
+
+
+def test_text_only_pages_use_text():
+    assert prefers_text([_page(500), _page(300, page_number=2)])
+
+
+def test_image_heavy_page_with_little_text_uses_file():
+    image_heavy = _page(TEXT_MODE_MIN_PAGE_TOKENS * 2, image_count=3)
+    assert not prefers_text([image_heavy])
+    assert not prefers_text([_page(2000), image_heavy])
+
+
+def test_text_outweighing_images_uses_text():
+    assert prefers_text([_page(PDF_PAGE_IMAGE_TOKENS * 2, image_count=1)])
+    assert not prefers_text([_page(PDF_PAGE_IMAGE_TOKENS - 1, image_count=1)])
+
+
+def test_sparse_text_uses_file():
+    assert not prefers_text([_page(TEXT_MODE_MIN_PAGE_TOKENS - 1)])
+    assert not prefers_text([])
+
+
+def test_profiles_only_requested_pages_and_merges_cache(tmp_path, monkeypatch):
+    pytest.importorskip("fitz")
+    from benchmarks.load_benchmark import build_pdf
+
+    path = build_pdf(str(tmp_path), 12)
+    cache = DocumentCache(directory=str(tmp_path / "cache"))
+
+    async def download(uploaded_url, etag=None, spool_dir=None, timeout=None):
+        with open(path, "rb") as pdf:
+            return DownloadedPdf(content=pdf.read(), etag=None)
+
+    monkeypatch.setattr(document_cache_module, "download_pdf_if_modified", download)
+    monkeypatch.setattr(generate_service, "document_cache", cache)
+    profiled = []
+
+    class RecordingSlicer(PdfSlicer):
+        async def profile_pages(self, pages):
+            profiled.append(list(pages))
+            return await super().profile_pages(pages)
+
+    async def scenario():
+        document = await cache.resolve("http://files/lecture.pdf")
+        slicer = RecordingSlicer(document.path)
+        first = await generate_service._load_page_profiles(
+            document, slicer, [2, 3, 99], Deadline()
+        )
+        second = await generate_service._load_page_profiles(
+            document, slicer, [3, 4], Deadline()
+        )
+        third = await generate_service._load_page_profiles(
+            document, slicer, [2, 4], Deadline()
+        )
+        return first, second, third, await cache.get_page_profiles(document)
+
+    first, second, third, cached = asyncio.run(scenario())
+    # 문서에 없는 99쪽은 건너뛰고, 이미 분석한 3쪽은 다시 분석하지 않는다.
+    assert profiled == [[2, 3, 99], [4]]
+    assert sorted(first) == [2, 3]
+    assert sorted(second) == sorted(third) == sorted(cached) == [2, 3, 4]
+    assert "Lecture page 4" in cached[4].text
@@ -0,0 +1,31 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.adapter import pdf_downloader
+
+
+def _serve(monkeypatch, headers, content=b"%PDF-1.7 body"):
+    def handler(request):
+        return httpx.Response(200, headers=headers, content=content)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(pdf_downloader, "get_http_client", lambda: client)
+
+
+def test_malformed_content_length_is_ignored(monkeypatch):
+    _serve(monkeypatch, {"content-length": "not-a-number", "etag": '"v1"'})
+    downloaded = asyncio.run(
+        pdf_downloader.download_pdf_if_modified("http://files/lecture.pdf")
+    )
+    assert downloaded.content == b"%PDF-1.7 body"
+    assert downloaded.etag == '"v1"'
+
+
+def test_oversized_content_length_rejected(monkeypatch):
+    _serve(monkeypatch, {"content-length": str(pdf_downloader.PDF_MAX_BYTES + 1)})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(pdf_downloader.download_pdf_if_modified("http://files/big.pdf"))
+    assert error.value.status_code == 413
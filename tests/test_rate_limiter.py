@@ -0,0 +1,118 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.util.rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    RedisRateLimitBackend,
+)
+
+WINDOW_SECONDS = 10.0
+LIMIT = 5
+INTERVAL = WINDOW_SECONDS / LIMIT
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend_and_clock(request, monkeypatch):
+    clock = FakeClock()
+    if request.param == "memory":
+        return InMemoryRateLimitBackend(clock=clock), clock
+
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    from fakeredis.commands_mixins import server_mixin
+
+    # Lua 스크립트는 Redis TIME으로 현재 시각을 읽으므로 그 시계를 바꿔 끼운다.
+    monkeypatch.setattr(server_mixin, "time", SimpleNamespace(time=clock))
+    client = fakeredis.aioredis.FakeRedis()
+    return RedisRateLimitBackend(client_factory=lambda: client), clock
+
+
+def _acquire(backend, cost=1, key="test"):
+    return asyncio.run(backend.acquire(key, cost, INTERVAL, WINDOW_SECONDS))
+
+
+def test_allows_full_bucket(backend_and_clock):
+    backend, _ = backend_and_clock
+    assert [_acquire(backend)[0] for _ in range(LIMIT)] == [True] * LIMIT
+
+
+def test_denies_with_retry_after(backend_and_clock):
+    backend, _ = backend_and_clock
+    assert _acquire(backend, cost=LIMIT) == (True, 0.0)
+
+    allowed, retry_after = _acquire(backend)
+    assert not allowed
+    assert retry_after == pytest.approx(INTERVAL, abs=0.01)
+
+    allowed, retry_after = _acquire(backend, cost=3)
+    assert not allowed
+    assert retry_after == pytest.approx(3 * INTERVAL, abs=0.01)
+
+
+def test_refills_over_time(backend_and_clock):
+    backend, clock = backend_and_clock
+    assert _acquire(backend, cost=LIMIT)[0]
+
+    clock.advance(INTERVAL / 2)
+    allowed, retry_after = _acquire(backend)
+    assert not allowed
+    assert retry_after == pytest.approx(INTERVAL / 2, abs=0.01)
+
+    clock.advance(INTERVAL / 2)
+    assert _acquire(backend)[0]
+    assert not _acquire(backend)[0]
+
+    # 윈도 전체가 지나면 버킷이 가득 차지만 limit을 넘게 쌓이지는 않는다.
+    clock.advance(WINDOW_SECONDS * 3)
+    assert _acquire(backend, cost=LIMIT)[0]
+    assert not _acquire(backend)[0]
+
+
+def test_keys_are_independent(backend_and_clock):
+    backend, _ = backend_and_clock
+    assert _acquire(backend, cost=LIMIT, key="a")[0]
+    assert not _acquire(backend, key="a")[0]
+    assert _acquire(backend, key="b")[0]
+
+
+def test_check_rate_raises_429(backend_and_clock):
+    backend, clock = backend_and_clock
+    limiter = RateLimiter(backend, window_seconds=WINDOW_SECONDS, limit=LIMIT)
+
+    asyncio.run(limiter.check_rate(LIMIT, key="http"))
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(limiter.check_rate(2, key="http"))
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == str(int(2 * INTERVAL))
+    assert limiter.stats == {"allowed": 1, "rejected": 1, "errors": 0}
+
+    clock.advance(2 * INTERVAL)
+    asyncio.run(limiter.check_rate(2, key="http"))
+    assert limiter.stats["allowed"] == 2
+
+
+def test_check_rate_passes_when_backend_fails():
+    class BrokenBackend:
+        async def acquire(self, key, cost, interval, period):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter(BrokenBackend(), window_seconds=WINDOW_SECONDS, limit=LIMIT)
+    asyncio.run(limiter.check_rate(LIMIT * 2))
+    assert limiter.stats["errors"] == 1
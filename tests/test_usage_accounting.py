@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from app.util.prompt_cache_stats import PromptCacheStats
+from app.util.usage_accounting import (
+    TokenUsage,
+    UsageAccumulator,
+    extract_token_usage,
+    record_usage,
+    usage_scope,
+)
+
+EXPECTED = TokenUsage(calls=1, input_tokens=1200, cached_tokens=1024, output_tokens=300)
+
+
+def test_extracts_sdk_object_and_batch_dict_alike():
+    sdk_usage = SimpleNamespace(
+        input_tokens=1200,
+        input_tokens_details=SimpleNamespace(cached_tokens=1024),
+        output_tokens=300,
+    )
+    batch_usage = {
+        "input_tokens": 1200,
+        "input_tokens_details": {"cached_tokens": 1024},
+        "output_tokens": 300,
+    }
+
+    assert extract_token_usage(sdk_usage) == EXPECTED
+    assert extract_token_usage(batch_usage) == EXPECTED
+    assert extract_token_usage({}) == TokenUsage(calls=1)
+    assert extract_token_usage(None) is None
+
+
+def test_record_usage_and_prompt_cache_stats_agree():
+    usage = SimpleNamespace(
+        input_tokens=1200,
+        input_tokens_details=None,
+        output_tokens=300,
+    )
+    accumulator = UsageAccumulator()
+    cache_stats = PromptCacheStats()
+
+    with usage_scope(accumulator):
+        record_usage("gpt-5-mini", usage)
+    cache_stats.observe("gpt-5-mini", usage)
+
+    recorded = accumulator.models["gpt-5-mini"]
+    observed = cache_stats.models["gpt-5-mini"]
+    assert recorded.input_tokens == observed["input_tokens"] == 1200
+    assert recorded.cached_tokens == observed["cached_tokens"] == 0